@@ -0,0 +1,124 @@
+"""
+주소/시도 정규화
+
+시도 이름의 표준 표기(예: '경기도'), 축약형(예: '경기'), 그 밖의 별칭(예: '서울시', '강원특별자치도')을
+하나의 표(SIDO_TABLE)로 관리하고, 주소 맨 앞의 시도 표기를 가장 긴 접두어 기준으로 찾습니다.
+- 지역(축약형) 추출과 주소 유사도 계산의 시도 표준화가 같은 표를 사용합니다.
+- 값 하나를 처리하는 함수와 컬럼(Series) 전체를 한 번에 처리하는 함수를 함께 제공하며 결과는 같습니다.
+"""
+import re
+
+# 주소 정규화 규칙의 버전
+# 정규화 결과가 바뀌면 올립니다. 정규화된 주소를 저장해 두는 캐시(강소기업 키 인덱스)는 이 값이 다르면 다시 만듭니다.
+NORMALIZATION_VERSION = 2
+
+# (축약형, 표준 표기, 그 밖의 별칭)
+# 별칭은 모두 축약형으로 시작해야 합니다. '광주시'는 경기도 광주시와 겹치므로 별칭에 넣지 않습니다.
+SIDO_TABLE = [
+    ('경기', '경기도', ()),
+    ('서울', '서울특별시', ('서울시',)),
+    ('부산', '부산광역시', ('부산시',)),
+    ('대구', '대구광역시', ('대구시',)),
+    ('인천', '인천광역시', ('인천시',)),
+    ('광주', '광주광역시', ()),
+    ('대전', '대전광역시', ('대전시',)),
+    ('울산', '울산광역시', ('울산시',)),
+    ('세종', '세종특별자치시', ('세종시',)),
+    ('강원', '강원도', ('강원특별자치도',)),
+    ('충북', '충청북도', ()),
+    ('충남', '충청남도', ()),
+    ('전북', '전라북도', ('전북특별자치도',)),
+    ('전남', '전라남도', ()),
+    ('경북', '경상북도', ()),
+    ('경남', '경상남도', ()),
+    ('제주', '제주특별자치도', ('제주도',)),
+]
+
+# 시도 이름 표준화 (예: '경기' -> '경기도')
+SIDO_FULL_NAMES = {short: full for short, full, _ in SIDO_TABLE}
+
+# 모든 표기 → 축약형
+SIDO_ALIASES = {alias: short for short, full, aliases in SIDO_TABLE for alias in (full, short) + aliases}
+
+# 긴 표기부터 나열해 정규식이 항상 가장 긴 접두어를 고르도록 합니다. ('서울특별시' > '서울시' > '서울')
+SIDO_PREFIX_PATTERN = re.compile(
+    "^(" + "|".join(re.escape(alias) for alias in sorted(SIDO_ALIASES, key=len, reverse=True)) + ")")
+
+# 주소 유사도 계산에서 제거하는 단어/문자 (순서대로 적용)
+ADDRESS_REMOVE_PATTERNS = ['(주)', '(유)', '(합)', '주식회사', '유한회사', ',', '(', ')', '.']
+
+
+# 값 하나 처리
+def match_sido(address):
+    """
+    주소 맨 앞의 시도 표기를 찾아 (표기, 축약형)을 반환합니다. 없으면 (None, "")입니다.
+    """
+    if not isinstance(address, str):
+        return None, ""
+    match = SIDO_PREFIX_PATTERN.match(address)
+    if match is None:
+        return None, ""
+    return match.group(1), SIDO_ALIASES[match.group(1)]
+
+
+def province_abbreviation(address):
+    """
+    주소의 시도 축약형을 반환합니다. 예: '경기도 수원시' → '경기', '서울시 중구' → '서울'
+    """
+    return match_sido(address)[1]
+
+
+def canonicalize_sido(address):
+    """
+    주소 맨 앞의 시도 표기를 표준 표기로 바꿉니다. 예: '경기 광주시' → '경기도 광주시'
+    """
+    alias, short = match_sido(address)
+    if alias is None:
+        return address
+    return SIDO_FULL_NAMES[short] + address[len(alias):]
+
+
+def normalize_address(address):
+    """
+    주소 유사도 계산용 전처리: 앞뒤 공백 제거, 소문자 변환, 불필요한 단어/문자 제거, 시도 표준화
+    """
+    address = address.strip().lower()
+    for pattern in ADDRESS_REMOVE_PATTERNS:
+        address = address.replace(pattern, '')
+    return canonicalize_sido(address)
+
+
+# 컬럼(Series) 처리
+def _sido_alias_column(addresses):
+    # 문자열이 아닌 값과 시도 표기가 없는 주소는 NaN
+    return addresses.str.extract(SIDO_PREFIX_PATTERN.pattern, expand=False)
+
+
+def province_abbreviations(addresses):
+    """
+    주소 컬럼 전체의 시도 축약형('지역')을 한 번에 구합니다. 시도를 찾지 못하면 빈 문자열입니다.
+    """
+    return _sido_alias_column(addresses).map(SIDO_ALIASES).fillna("").astype(object)
+
+
+def canonicalize_sido_column(addresses):
+    """
+    canonicalize_sido를 주소 컬럼 전체에 한 번에 적용합니다.
+    """
+    aliases = _sido_alias_column(addresses)
+    has_sido = aliases.notna()
+    if not has_sido.any():
+        return addresses
+    full_names = aliases[has_sido].map(SIDO_ALIASES).map(SIDO_FULL_NAMES)
+    rest = addresses[has_sido].str.replace(SIDO_PREFIX_PATTERN.pattern, "", n=1, regex=True)
+    return addresses.where(~has_sido, full_names + rest)
+
+
+def normalize_address_column(addresses):
+    """
+    normalize_address를 문자열 주소 컬럼 전체에 한 번에 적용합니다.
+    """
+    values = addresses.str.strip().str.lower()
+    for pattern in ADDRESS_REMOVE_PATTERNS:
+        values = values.str.replace(pattern, '', regex=False)
+    return canonicalize_sido_column(values)
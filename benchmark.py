@@ -0,0 +1,343 @@
+"""
+company_filter 성능 측정 스크립트
+
+국민연금 CSV(CP949)와 강소기업 엑셀을 합성 데이터로 만들어 단계별 시간을 잽니다.
+- 국민연금 CSV는 company_filter가 위치로 읽는 컬럼 배치를 그대로 따릅니다.
+  (1: 사업장명, 2: 사업자등록번호, 3/5: 주소, 4: 우편번호, 14: 사업장업종상세정보)
+- 단계: load(CSV 디코딩), load_cached(Parquet 캐시), normalize, match, location, write
+- startup: `python -X importtime company_filter.py --help` 등의 시작 시간과, 도움말/인자 검사에서
+  pandas 같은 무거운 라이브러리를 불러오지 않는지 확인합니다.
+- 각 단계의 소요 시간, 처리량(rows/sec), 최대 RSS를 보고합니다.
+- 네트워크 없이 실행되며, 결과를 기준선(JSON)으로 저장하거나 기준선과 비교할 수 있습니다.
+
+사용 예:
+    python benchmark.py --rows 10000 100000
+    python benchmark.py --rows 1000000 --save-baseline baseline.json
+    python benchmark.py --rows 1000000 --baseline baseline.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import company_filter as cf
+import instrumentation
+
+DEFAULT_ROWS = [10_000, 100_000]
+DEFAULT_WORK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".benchmark")
+MATCH_RATE = 0.02  # 강소기업과 일치하는 국민연금 행의 비율
+COMPANY_FILTER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "company_filter.py")
+STARTUP_COMMANDS = {  # 도움말과 인자 검사(실패) 경로
+    "startup_help": ["--help"],
+    "startup_cmd_help": ["filter", "--help"],
+    "startup_bad_args": ["filter"],
+}
+STARTUP_BUDGET_SECONDS = 0.5
+STARTUP_REPEAT = 3
+HEAVY_MODULES = {"pandas", "numpy", "pyarrow", "openpyxl", "xlsxwriter"}
+
+PENSION_COLUMNS = [
+    "자료생성년월", "사업장명", "사업자등록번호", "사업장지번상세주소", "우편번호",
+    "사업장도로명상세주소", "가입상태코드", "업종코드", "업종코드명", "적용일자",
+    "재등록일자", "탈퇴일자", "가입자수", "당월고지금액", "사업장업종상세정보", "신규취득자수",
+]
+SIDO_NAMES = np.array(list(cf.SIDO_FULL_NAMES) + list(cf.SIDO_FULL_NAMES.values()), dtype=object)
+CITY_NAMES = np.array(["수원시", "성남시", "광주시", "중구", "강남구", "해운대구", "청주시", "천안시"], dtype=object)
+ROAD_NAMES = np.array(["왕림로", "중앙로", "테헤란로", "산업로", "공단로", "시청로"], dtype=object)
+COMPANY_FORMS = np.array(["(주)", "주식회사 ", "㈜", "", "(유)", "유한회사 ", " (주)"], dtype=object)
+BIZ_DETAILS = np.array(["전자부품 제조업", "소프트웨어 개발", "도매업", "기계 제조업", "연구개발업"], dtype=object)
+
+
+# 합성 데이터 생성
+def _random_addresses(rng, size):
+    return (pd.Series(rng.choice(SIDO_NAMES, size)) + " " + rng.choice(CITY_NAMES, size) + " "
+            + rng.choice(ROAD_NAMES, size) + " " + rng.integers(1, 300, size).astype(str))
+
+
+def generate_company_data(rng, company_count):
+    """
+    강소기업 명단을 만듭니다. 사업자등록번호는 중복되지 않는 10자리(하이픈 포함)입니다.
+    """
+    bizno = (rng.choice(900_000_000, company_count, replace=False) + 100_000_000).astype(str)
+    bizno = pd.Series(bizno).str.zfill(10)
+    names = pd.Series([f"강소기업{i}" for i in range(company_count)], dtype=object)
+    return pd.DataFrame({
+        "사업자명": rng.choice(COMPANY_FORMS, company_count) + names,
+        "사업자등록번호": bizno.str[:3] + "-" + bizno.str[3:5] + "-" + bizno.str[5:],
+        "소재지": _random_addresses(rng, company_count),
+    })
+
+
+def generate_pension_chunk(rng, df_company, row_count):
+    """
+    국민연금 데이터 행을 만듭니다. MATCH_RATE 비율의 행은 강소기업과 (정규화된 회사명, 앞 6자리)가 같고,
+    같은 기업이 여러 지점으로 나타나 주소 유사도 기반 중복 제거도 함께 측정됩니다.
+    """
+    is_match = rng.random(row_count) < MATCH_RATE
+    company_idx = rng.integers(0, len(df_company), row_count)
+
+    names = pd.Series([f"사업장{i}" for i in rng.integers(0, 10 * row_count + 1, row_count)], dtype=object)
+    bizno = pd.Series(rng.integers(100_000, 999_999, row_count).astype(str), dtype=object)
+    company_names = df_company["사업자명"].to_numpy()[company_idx]
+    company_bizno = df_company["사업자등록번호"].str.replace("-", "", regex=False).str[:6].to_numpy()[company_idx]
+    names[is_match] = rng.choice(COMPANY_FORMS, is_match.sum()) + pd.Series(company_names[is_match]).map(
+        cf.normalize_company_name_fast).to_numpy()
+    bizno[is_match] = company_bizno[is_match]
+
+    return pd.DataFrame({
+        "자료생성년월": "202401",
+        "사업장명": names,
+        "사업자등록번호": bizno,
+        "사업장지번상세주소": _random_addresses(rng, row_count),
+        "우편번호": rng.integers(10_000, 63_000, row_count).astype(str),
+        "사업장도로명상세주소": _random_addresses(rng, row_count),
+        "가입상태코드": "1",
+        "업종코드": rng.integers(100_000, 999_999, row_count).astype(str),
+        "업종코드명": "제조업",
+        "적용일자": "2010-01-01",
+        "재등록일자": "",
+        "탈퇴일자": "",
+        "가입자수": rng.integers(1, 500, row_count).astype(str),
+        "당월고지금액": rng.integers(10_000, 9_000_000, row_count).astype(str),
+        "사업장업종상세정보": rng.choice(BIZ_DETAILS, row_count),
+        "신규취득자수": rng.integers(0, 20, row_count).astype(str),
+    }, columns=PENSION_COLUMNS)
+
+
+def prepare_dataset(work_dir, rows, seed=0, chunk_rows=500_000):
+    """
+    rows 행짜리 국민연금 CSV와 강소기업 엑셀을 work_dir에 만들고 파일명을 반환합니다.
+    같은 (rows, seed) 데이터가 이미 있으면 다시 만들지 않습니다.
+    """
+    company_dir = os.path.join(work_dir, "company_data")
+    pension_dir = os.path.join(work_dir, "pension_data")
+    os.makedirs(company_dir, exist_ok=True)
+    os.makedirs(pension_dir, exist_ok=True)
+
+    company_file = f"companies_{rows}_{seed}.xlsx"
+    pension_file = f"pension_{rows}_{seed}.csv"
+    company_path = os.path.join(company_dir, company_file)
+    pension_path = os.path.join(pension_dir, pension_file)
+    if os.path.exists(company_path) and os.path.exists(pension_path):
+        return company_file, pension_file
+
+    print(f"🧪 합성 데이터 생성 중: 국민연금 {rows}행")
+    rng = np.random.default_rng(seed)
+    df_company = generate_company_data(rng, min(10_000, max(100, rows // 50)))
+    df_company.to_excel(company_path, index=False)
+
+    temp_path = pension_path + ".tmp"
+    written = 0
+    with open(temp_path, "w", encoding="CP949", newline="") as f:
+        while written < rows:
+            chunk = generate_pension_chunk(rng, df_company, min(chunk_rows, rows - written))
+            chunk.to_csv(f, header=written == 0, index=False)
+            written += len(chunk)
+    os.replace(temp_path, pension_path)
+    return company_file, pension_file
+
+
+# 측정 도구
+def measure(stage, rows, func, *args, **kwargs):
+    """
+    func를 실행하고 (결과, 측정값)을 반환합니다. 실행 중 출력은 버립니다.
+    """
+    instrumentation.reset_peak_rss()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        seconds = time.perf_counter() - start
+    return result, {
+        "stage": stage,
+        "rows": rows,
+        "seconds": round(seconds, 4),
+        "rows_per_sec": round(rows / seconds) if seconds > 0 else None,
+        "peak_rss_mb": round(instrumentation.peak_rss_mb(), 1),
+    }
+
+
+def _imported_modules(importtime_output):
+    # "import time: self | cumulative | name" 줄에서 모듈 이름만 모읍니다.
+    return {line.rsplit("|", 1)[1].strip() for line in importtime_output.splitlines()
+            if line.startswith("import time:") and "|" in line}
+
+
+def measure_startup(commands=STARTUP_COMMANDS, repeat=STARTUP_REPEAT):
+    """
+    company_filter.py를 -X importtime으로 실행해 명령마다 가장 짧은 소요 시간과 불러온 무거운 모듈을 측정합니다.
+    """
+    results = []
+    for stage, command in commands.items():
+        best_seconds = None
+        heavy_modules = set()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            completed = subprocess.run([sys.executable, "-X", "importtime", COMPANY_FILTER_SCRIPT, *command],
+                                       capture_output=True, text=True)
+            seconds = time.perf_counter() - start
+            best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+            heavy_modules |= {name for name in _imported_modules(completed.stderr)
+                              if name.split(".")[0] in HEAVY_MODULES}
+        results.append({
+            "stage": stage,
+            "rows": 0,
+            "seconds": round(best_seconds, 4),
+            "rows_per_sec": None,
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+            "heavy_modules": sorted({name.split(".")[0] for name in heavy_modules}),
+        })
+    return results
+
+
+def check_startup_budget(results, budget_seconds):
+    """
+    시작 시간이 예산을 넘거나 무거운 라이브러리를 불러온 명령 목록을 출력하고 반환합니다.
+    """
+    failures = []
+    print(f"\n🚀 시작 시간 점검 (예산 {budget_seconds:.2f}s)")
+    for item in results:
+        ok = item["seconds"] <= budget_seconds and not item["heavy_modules"]
+        detail = f" (불러온 무거운 모듈: {', '.join(item['heavy_modules'])})" if item["heavy_modules"] else ""
+        print(f"{'✅' if ok else '❌'} {item['stage']:<16} {item['seconds']:>7.3f}s{detail}")
+        if not ok:
+            failures.append(item)
+    return failures
+
+
+def run_benchmark(work_dir, rows, seed=0, reference=False):
+    """
+    한 규모(rows)에 대해 모든 단계를 측정하고 측정값 목록을 반환합니다.
+    reference=True이면 iterrows 기반 기준 구현(extract_excellent_companies_updated, update_company_location)도 측정합니다.
+    """
+    company_file, pension_file = prepare_dataset(work_dir, rows, seed)
+
+    cf.COMPANY_DATA_DIR = os.path.join(work_dir, "company_data")
+    cf.PENSION_DATA_DIR = os.path.join(work_dir, "pension_data")
+    cf.PENSION_CACHE_DIR = os.path.join(work_dir, "pension_cache")
+    cf.OUTPUT_DIR = os.path.join(work_dir, "output")
+    cf.ANIMATIONS_ENABLED = False
+    os.makedirs(cf.OUTPUT_DIR, exist_ok=True)
+
+    results = []
+    company_index = cf.load_company_index(company_file)
+    df_excellent = company_index["data"]
+
+    df_pension, stats = measure("load", rows, cf.load_pension_data, pension_file)
+    results.append(stats)
+
+    if cf.resolve_csv_reader() == "arrow":
+        _, stats = measure("load_pandas", rows, cf.load_pension_data, pension_file, reader="pandas")
+        results.append(stats)
+
+    if cf.PYARROW_AVAILABLE:
+        cf.load_pension_data_cached(pension_file)  # 캐시가 없으면 여기서 만듭니다.
+        _, stats = measure("load_cached", rows, cf.load_pension_data_cached, pension_file)
+        results.append(stats)
+
+    cf._normalize_company_name_cached.cache_clear()
+    _, stats = measure("normalize", rows, cf.normalize_company_names, df_pension[df_pension.columns[1]])
+    results.append(stats)
+
+    df_filtered, stats = measure("match", rows, cf.extract_excellent_companies_updated_fast,
+                                 df_excellent, df_pension, company_index["excellent_keys"])
+    results.append(stats)
+
+    if reference:
+        _, stats = measure("match_reference", rows, cf.extract_excellent_companies_updated,
+                           df_excellent, df_pension.copy())
+        results.append(stats)
+
+    _, stats = measure("location", rows, cf.update_company_location_fast, df_excellent.copy(), df_pension)
+    results.append(stats)
+
+    if reference:
+        _, stats = measure("location_reference", rows, cf.update_company_location, df_excellent.copy(), df_pension)
+        results.append(stats)
+
+    output_path = os.path.join(cf.OUTPUT_DIR, f"filtered_{rows}.xlsx")
+    _, stats = measure("write", len(df_filtered), cf.save_result, df_filtered, output_path)
+    results.append(stats)
+
+    return results
+
+
+# 기준선 비교
+def compare_with_baseline(results, baseline, max_regression):
+    """
+    같은 (rows, stage)의 기준선과 소요 시간을 비교해 출력하고, 허용치를 넘은 단계 목록을 반환합니다.
+    """
+    baseline_seconds = {(item["rows"], item["stage"]): item["seconds"] for item in baseline["results"]}
+    regressions = []
+    print("\n📈 기준선 비교 (현재 / 기준선)")
+    for item in results:
+        base = baseline_seconds.get((item["rows"], item["stage"]))
+        if not base:
+            continue
+        ratio = item["seconds"] / base
+        mark = "❌" if ratio > max_regression else "✅"
+        print(f"{mark} {item['rows']:>9} {item['stage']:<16} {item['seconds']:>9.3f}s / {base:>9.3f}s = {ratio:.2f}x")
+        if ratio > max_regression:
+            regressions.append(item)
+    return regressions
+
+
+def print_results(results):
+    print(f"\n{'rows':>9} {'stage':<16} {'seconds':>10} {'rows/sec':>12} {'peak RSS(MB)':>13}")
+    for item in results:
+        rows_per_sec = item["rows_per_sec"] if item["rows_per_sec"] is not None else "-"
+        print(f"{item['rows']:>9} {item['stage']:<16} {item['seconds']:>10.3f} {rows_per_sec:>12} "
+              f"{item['peak_rss_mb']:>13.1f}")
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="company_filter 단계별 성능 측정")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS,
+                        help="측정할 국민연금 행 수 (예: 10000 100000 1000000 5000000)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 난수 시드")
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR, help="합성 데이터와 결과를 둘 디렉토리")
+    parser.add_argument("--reference", action="store_true", help="iterrows 기준 구현도 측정합니다 (느림)")
+    parser.add_argument("--save-baseline", help="측정 결과를 기준선 JSON으로 저장")
+    parser.add_argument("--baseline", help="비교할 기준선 JSON")
+    parser.add_argument("--max-regression", type=float, default=1.2,
+                        help="기준선 대비 허용하는 소요 시간 비율 (기본값: 1.2)")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET_SECONDS,
+                        help=f"도움말/인자 검사 경로의 허용 시작 시간(초) (기본값: {STARTUP_BUDGET_SECONDS})")
+    parser.add_argument("--startup-only", action="store_true", help="시작 시간만 측정합니다")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+
+    startup_results = measure_startup()
+    startup_failures = check_startup_budget(startup_results, args.startup_budget)
+
+    results = list(startup_results)
+    if not args.startup_only:
+        for rows in args.rows:
+            results.extend(run_benchmark(args.work_dir, rows, args.seed, args.reference))
+    print_results(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"created": time.strftime("%Y-%m-%d %H:%M:%S"), "results": results},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\n💾 기준선 저장: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare_with_baseline(results, baseline, args.max_regression):
+            return 1
+    return 1 if startup_failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,42 +1,68 @@
-import pandas as pd
 import os
+import pathlib
 import sys
 import time
 import random
 import re
 import difflib
+import hashlib
+import sqlite3
+import tempfile
+import zlib
+import uuid
+import unicodedata
+import json
+import pickle
+import functools
+import itertools
+import queue
+import threading
+import argparse
+import importlib
+import importlib.util
+
+import address_normalization
+import instrumentation
+
+
+class _LazyModule:
+    """
+    처음 속성에 접근할 때 모듈을 불러오는 대리 객체입니다.
+    불러온 뒤에는 모듈 전역 이름을 실제 모듈로 바꾸므로 이후 호출에는 비용이 없습니다.
+    pandas/numpy/pyarrow 같은 무거운 라이브러리를 메뉴 표시, 도움말, 인자 검사 이후로 미룹니다.
+    """
+
+    def __init__(self, alias, module_name):
+        self._alias = alias
+        self._module_name = module_name
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self._module_name)
+        globals()[self._alias] = module
+        return getattr(module, attr)
+
+
+pd = _LazyModule("pd", "pandas")
+np = _LazyModule("np", "numpy")
+concurrent_futures = _LazyModule("concurrent_futures", "concurrent.futures")  # 일괄 처리에서만 사용
+
+# pyarrow가 없으면 국민연금 컬럼형 캐시 없이 CSV만 사용
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+pa = _LazyModule("pa", "pyarrow")
+pq = _LazyModule("pq", "pyarrow.parquet")
+pa_csv = _LazyModule("pa_csv", "pyarrow.csv")
+
+# xlsxwriter가 없으면 openpyxl의 write_only 모드로 엑셀을 저장
+XLSXWRITER_AVAILABLE = importlib.util.find_spec("xlsxwriter") is not None
+xlsxwriter = _LazyModule("xlsxwriter", "xlsxwriter")
 
 def extract_province_abbreviation(address):
     """
     전체 주소에서 도/시 이름을 축약형으로 변환합니다.
     예: '경기도' → '경기', '서울특별시' → '서울'
+    시도 표기는 address_normalization.SIDO_TABLE 하나로 관리합니다.
     """
-    province_map = {
-        '서울특별시': '서울', '서울시': '서울', '서울': '서울',
-        '경기도': '경기', '경기': '경기',
-        '인천광역시': '인천', '인천': '인천',
-        '부산광역시': '부산', '부산': '부산',
-        '대구광역시': '대구', '대구': '대구',
-        '광주광역시': '광주', '광주': '광주',
-        '대전광역시': '대전', '대전': '대전',
-        '울산광역시': '울산', '울산': '울산',
-        '세종특별자치시': '세종', '세종': '세종',
-        '강원도': '강원', '강원': '강원',
-        '충청북도': '충북', '충북': '충북',
-        '충청남도': '충남', '충남': '충남',
-        '전라북도': '전북', '전북': '전북',
-        '전라남도': '전남', '전남': '전남',
-        '경상북도': '경북', '경북': '경북',
-        '경상남도': '경남', '경남': '경남',
-        '제주특별자치도': '제주', '제주': '제주'
-    }
-
-    if not isinstance(address, str):
-        return ""
-    for full_name, short in province_map.items():
-        if address.startswith(full_name):
-            return short
-    return ""
+    return address_normalization.province_abbreviation(address)
 
 # 회사명을 정규화하는 함수
 def normalize_company_name(name):
@@ -60,6 +86,45 @@ def normalize_company_name(name):
     return name
 
 
+# 회사명 정규화 (컴파일된 패턴 + 메모이제이션)
+# normalize_company_name과 결과가 완전히 같으며, 같은 회사명은 캐시에서 바로 돌려줍니다.
+COMPANY_FORM_PATTERN = re.compile(r'[\(\［\［\「]?(주|유한|합자|합명|유)[\)\］\］\」]?')
+NORMALIZE_CACHE_SIZE = 1 << 18
+
+
+@functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_company_name_cached(name):
+    name = COMPANY_FORM_PATTERN.sub('', name.lower().replace(" ", ""))
+    # 패턴이 '주'와 '유'를 모두 지우므로 '주식회사', '유한회사'는 더 이상 남아 있을 수 없습니다.
+    # '합유자회사' → '합자회사'처럼 지운 뒤에 새로 생기는 경우만 기존 순서대로 처리합니다.
+    if '회사' in name:
+        name = name.replace('합자회사', '').replace('합명회사', '')
+    return name
+
+
+def normalize_company_name_fast(name):
+    """
+    normalize_company_name과 같은 결과를 컴파일된 패턴과 LRU 캐시로 빠르게 계산합니다.
+    """
+    if not name or not isinstance(name, str):
+        return ""
+    return _normalize_company_name_cached(name)
+
+
+def normalize_cache_stats():
+    """
+    회사명 정규화 캐시의 적중/실패 횟수와 크기를 반환합니다. (functools.lru_cache의 cache_info)
+    """
+    return _normalize_company_name_cached.cache_info()
+
+
+def find_normalizer_mismatches(names):
+    """
+    normalize_company_name_fast의 결과가 기준 구현과 다른 회사명 목록을 반환합니다. (회귀 검증용)
+    """
+    return [name for name in names if normalize_company_name_fast(name) != normalize_company_name(name)]
+
+
 # 컬럼명 자동 감지 함수
 def detect_columns(df):
     """
@@ -98,8 +163,14 @@ def extract_region(address):
         address.split()[0]
     return ""
 
+# 애니메이션과 연출용 대기(time.sleep) 실행 여부 (명령줄의 --quiet이면 끔)
+ANIMATIONS_ENABLED = True
+
+
 # 영역전개
 def gojo_domain_expansion():
+    if not ANIMATIONS_ENABLED:
+        return
 
     frames = [
 
@@ -195,41 +266,610 @@ DATA_DIR = os.path.join(ROOT_DIR, "data")
 COMPANY_DATA_DIR = os.path.join(DATA_DIR, "company_data")  # 강소기업 데이터 폴더
 PENSION_DATA_DIR = os.path.join(DATA_DIR, "pension_data")  # 국민연금 데이터 폴더
 OUTPUT_DIR = os.path.join(ROOT_DIR, "output")  # 출력 폴더
+CLI_CACHE_DIR_NAME = ".company_filter"  # 명령줄 실행에서 --cache-dir가 없을 때 국민연금 입력 옆에 만드는 캐시 폴더
+
+
+# 진행 상황 표시
+PROGRESS_INTERVAL = 0.1  # 화면 갱신 최소 간격(초), 최대 10Hz
+PROGRESS_ENABLED = None  # None이면 표준 출력이 터미널일 때만 표시
 
 
-# 진행 상황 표시 함수
-def update_progress(current, total, prefix='처리 중'):
+def _format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+
+class ProgressReporter:
     """
-    현재 진행 상황을 콘솔에 한 줄로 표시합니다.
+    진행 상황을 콘솔에 한 줄로 표시합니다. 행마다 update()를 호출해도 화면은
+    PROGRESS_INTERVAL 간격으로만 다시 그리며, 처리 속도와 남은 시간(total을 알 때)을 함께 보여줍니다.
+    표준 출력이 터미널이 아니면(로그 파일 등으로 리다이렉트) 진행 줄을 출력하지 않습니다.
+    반복문, 청크 단위 읽기, 병렬 일괄 처리에서 같은 방식으로 사용합니다.
     """
-    percent = round(current / total * 100, 1)
-    bar_length = 30
-    filled_length = int(bar_length * current // total)
-    bar = '█' * filled_length + '-' * (bar_length - filled_length)
 
-    sys.stdout.write(f'\r{prefix}: [{bar}] {current}/{total} ({percent}%)')
-    sys.stdout.flush()
+    def __init__(self, prefix='처리 중', total=None, unit='개', interval=PROGRESS_INTERVAL, enabled=None):
+        if enabled is None:
+            enabled = PROGRESS_ENABLED if PROGRESS_ENABLED is not None else sys.stdout.isatty()
+        self.prefix = prefix
+        self.total = total
+        self.unit = unit
+        self.interval = interval
+        self.enabled = enabled
+        self.current = 0
+        self._start = time.monotonic()
+        self._next_render = self._start
+        self._rendered = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def update(self, current):
+        """
+        처리한 개수를 current로 설정합니다. 마지막으로 그린 뒤 interval이 지났을 때만 화면을 갱신합니다.
+        """
+        self.current = current
+        if self.enabled:
+            now = time.monotonic()
+            if now >= self._next_render:
+                self._next_render = now + self.interval
+                self._render(now)
 
-    if current == total:
-        sys.stdout.write('\n')
+    def advance(self, amount=1):
+        self.update(self.current + amount)
+
+    def log(self, message):
+        """
+        진행 줄을 지우고 메시지를 출력한 뒤 진행 줄을 다시 그립니다.
+        """
+        if self._rendered:
+            sys.stdout.write('\r\033[K')
+        print(message)
+        if self._rendered:
+            self._render(time.monotonic())
+
+    def close(self):
+        # 마지막 상태를 한 번 더 그리고 줄을 바꿉니다.
+        if self.enabled:
+            self._render(time.monotonic())
+            sys.stdout.write('\n')
+            sys.stdout.flush()
+            self.enabled = False
+
+    def _render(self, now):
+        elapsed = now - self._start
+        rate = self.current / elapsed if elapsed > 0 else 0.0
+        if self.total:
+            percent = round(self.current / self.total * 100, 1)
+            bar_length = 30
+            filled_length = int(bar_length * min(self.current, self.total) // self.total)
+            bar = '█' * filled_length + '-' * (bar_length - filled_length)
+            line = f'{self.prefix}: [{bar}] {self.current}/{self.total} ({percent}%)'
+            if rate > 0:
+                line += f' {rate:,.0f}{self.unit}/초, 남은 시간 {_format_duration((self.total - self.current) / rate)}'
+        else:
+            line = f'{self.prefix}: {self.current}{self.unit} ({rate:,.0f}{self.unit}/초)'
+        sys.stdout.write('\r\033[K' + line)
+        sys.stdout.flush()
+        self._rendered = True
 
 
 # 강소기업 명단
 def load_company_data(file_name):
+    return load_company_index(file_name)["data"]
+
+
+# 강소기업 키 인덱스 캐시
+# 엑셀 파일 옆에 <파일명>.index.pkl 로 저장하고, 원본 파일의 수정 시각과 해시로 유효성을 확인합니다.
+COMPANY_INDEX_SUFFIX = ".index.pkl"
+# (인덱스 형식 버전, 주소 정규화 버전) - 키 테이블에 정규화된 주소 토큰이 들어 있으므로 정규화 규칙이 바뀌어도 다시 만듭니다.
+COMPANY_INDEX_VERSION = (3, address_normalization.NORMALIZATION_VERSION)
+
+
+def _file_sha256(file_path):
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+
+def _unique_temp_path(target_path):
+    """
+    target_path와 같은 폴더에 다른 작업과 겹치지 않는 빈 임시 파일을 만들고 경로를 반환합니다.
+    다 쓴 뒤 os.replace로 target_path와 바꿔 넣으므로, 같은 파일을 여러 작업이 동시에 만들어도 서로 덮어쓰지 않습니다.
+    """
+    target_dir = os.path.dirname(target_path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=target_dir, prefix=os.path.basename(target_path) + ".", suffix=".tmp")
+    os.close(fd)
+    # mkstemp는 소유자만 읽을 수 있는 파일을 만들므로, 공유 디렉토리의 다른 작업도 읽을 수 있게 일반 파일 권한으로 바꿉니다.
+    os.chmod(temp_path, 0o644)
+    return temp_path
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _write_pickle_atomic(path, obj):
+    # 다른 작업이 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 바꿔 넣습니다.
+    temp_path = _unique_temp_path(path)
+    try:
+        with open(temp_path, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except BaseException:
+        _remove_quietly(temp_path)
+        raise
+
+
+def _read_company_index(index_path):
+    try:
+        with open(index_path, "rb") as f:
+            company_index = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(company_index, dict) or company_index.get("version") != COMPANY_INDEX_VERSION:
+        return None
+    return company_index
+
+
+def _write_company_index(index_path, company_index):
+    try:
+        _write_pickle_atomic(index_path, company_index)
+    except OSError as e:
+        print(f"⚠️ 강소기업 인덱스 캐시를 저장하지 못했습니다: {str(e)}")
+
+
+@instrumentation.instrumented("key_build", rows=lambda company_index, df_excellent: len(df_excellent))
+def build_company_index(df_excellent):
+    """
+    강소기업 데이터와 매칭에 쓰는 키 테이블, 키 테이블의 정수 코드표를 한 번에 만듭니다.
+    """
+    excellent_keys = build_excellent_key_table(df_excellent, with_address=True)
+    return {
+        "version": COMPANY_INDEX_VERSION,
+        "data": df_excellent,
+        "excellent_keys": excellent_keys,
+        "key_store": CompanyKeyStore.from_key_table(excellent_keys),
+        "candidate_keys": build_candidate_key_table(df_excellent),
+    }
+
+
+@instrumentation.instrumented("company_index", rows=lambda company_index, *args: len(company_index["data"]))
+def load_company_index(file_name):
+    """
+    강소기업 엑셀 파일의 인덱스를 캐시에서 불러옵니다.
+    - 수정 시각과 크기가 같으면 캐시를 바로 사용합니다.
+    - 수정 시각이 달라도 파일 해시가 같으면 캐시를 사용하고 수정 시각만 갱신합니다.
+    - 그 외에는 엑셀을 다시 읽어 인덱스를 새로 만들고 저장합니다.
+    """
     company_file_path = os.path.join(COMPANY_DATA_DIR, file_name)
-    df = pd.read_excel(company_file_path, dtype=str)
-    return df
+    index_path = company_file_path + COMPANY_INDEX_SUFFIX
+    file_stat = os.stat(company_file_path)
+
+    company_index = _read_company_index(index_path)
+    if company_index is not None:
+        source = company_index["source"]
+        if source["mtime_ns"] == file_stat.st_mtime_ns and source["size"] == file_stat.st_size:
+            return company_index
+
+    file_hash = _file_sha256(company_file_path)
+    if company_index is not None and company_index["source"]["sha256"] == file_hash:
+        company_index["source"]["mtime_ns"] = file_stat.st_mtime_ns
+        _write_company_index(index_path, company_index)
+        return company_index
+
+    df_excellent = pd.read_excel(company_file_path, dtype=str)
+    company_index = build_company_index(df_excellent)
+    company_index["source"] = {
+        "mtime_ns": file_stat.st_mtime_ns,
+        "size": file_stat.st_size,
+        "sha256": file_hash,
+    }
+    _write_company_index(index_path, company_index)
+    return company_index
 
 
 # 국민연금 데이터 불러오기
-def load_pension_data(file_name):
+@instrumentation.instrumented("load_csv", rows=lambda df, *args, **kwargs: len(df))
+def load_pension_data(file_name, project=False, reader=None):
     pension_file_path = os.path.join(PENSION_DATA_DIR, file_name)
     # 엑셀 파일 읽기
     # df = pd.read_excel(pension_file_path, dtype=str)
     # CSV 파일 읽기
-    df = pd.read_csv(pension_file_path, dtype=str, encoding="CP949")
+    df = read_pension_csv(pension_file_path, project, reader)
     return df
 
+
+# 국민연금 CSV 읽기 방식
+# "arrow"는 pyarrow CSV 리더로 CP949를 변환하면서 여러 스레드로 파싱하고, 필요한 컬럼만 파싱합니다.
+# 문자열은 파이썬 객체 대신 Arrow 기반 문자열 컬럼으로 남습니다. "pandas"는 기존 pandas 파서입니다.
+# arrow 리더가 읽지 못하는 행(컬럼 수가 모자란 행 등)이 나오면 그 뒤로는 pandas 파서로 이어서 읽습니다.
+PENSION_CSV_READERS = ("auto", "arrow", "pandas")
+PENSION_CSV_READER = "pandas"  # auto이면 pyarrow가 있을 때 arrow, 없으면 pandas
+PENSION_CSV_ENCODING = "CP949"
+PENSION_CSV_BLOCK_SIZE = 8 << 20  # arrow 리더가 한 번에 파싱하는 바이트 수
+# pandas read_csv가 결측값으로 보는 문자열 (arrow 리더도 같은 값을 NaN으로 읽도록 맞춤)
+PENSION_NA_VALUES = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+                     "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"]
+
+# 국민연금 데이터 스트리밍(청크) 읽기
+PENSION_CHUNK_SIZE = 100_000  # 한 번에 읽는 행 수
+PENSION_USED_COLUMN_COUNT = 15  # 위치 기반으로 사용하는 컬럼(1~5, 14번)까지의 개수
+
+
+def resolve_csv_reader(reader=None):
+    """
+    사용할 CSV 읽기 방식("arrow" 또는 "pandas")을 정합니다. reader가 None이면 PENSION_CSV_READER를 따릅니다.
+    """
+    reader = reader or PENSION_CSV_READER
+    if reader not in PENSION_CSV_READERS:
+        raise ValueError(f"지원하지 않는 CSV 읽기 방식입니다: {reader} (지원: {', '.join(PENSION_CSV_READERS)})")
+    if reader == "auto":
+        return "arrow" if PYARROW_AVAILABLE else "pandas"
+    if reader == "arrow" and not PYARROW_AVAILABLE:
+        raise ImportError("arrow CSV 리더를 사용하려면 pyarrow를 설치하세요.")
+    return reader
+
+
+def read_pension_csv_header(pension_file_path, project=False):
+    """
+    국민연금 CSV의 컬럼명 목록을 pandas read_csv와 같은 규칙(중복 이름은 '.1' 접미사 등)으로 반환합니다.
+    """
+    usecols = range(PENSION_USED_COLUMN_COUNT) if project else None
+    header = pd.read_csv(pension_file_path, dtype=str, encoding=PENSION_CSV_ENCODING, nrows=0, usecols=usecols)
+    return list(header.columns)
+
+
+def _arrow_csv_options(pension_file_path, project=False):
+    # 헤더는 pandas 규칙으로 정한 이름을 쓰고, 모든 컬럼을 결측값 규칙까지 read_csv(dtype=str)와 같게 읽습니다.
+    column_names = read_pension_csv_header(pension_file_path)
+    read_options = pa_csv.ReadOptions(encoding=PENSION_CSV_ENCODING.lower(), use_threads=True,
+                                      block_size=PENSION_CSV_BLOCK_SIZE,
+                                      column_names=column_names, skip_rows=1)
+    # 따옴표 안의 줄바꿈은 pandas와 같이 값의 일부로 읽습니다.
+    parse_options = pa_csv.ParseOptions(newlines_in_values=True)
+    convert_options = pa_csv.ConvertOptions(
+        column_types={name: pa.string() for name in column_names},
+        null_values=PENSION_NA_VALUES, strings_can_be_null=True, quoted_strings_can_be_null=True,
+        include_columns=column_names[:PENSION_USED_COLUMN_COUNT] if project else None)
+    return read_options, parse_options, convert_options
+
+
+@functools.lru_cache(maxsize=None)
+def _arrow_string_dtype():
+    # 결측값을 NaN으로 돌려주는 Arrow 기반 문자열 dtype (pandas 버전에 따라 이름이 다름, 없으면 object)
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except TypeError:
+        pass
+    try:
+        return pd.StringDtype("pyarrow_numpy")
+    except (TypeError, ValueError):
+        return None
+
+
+def arrow_table_to_pandas(table):
+    """
+    Arrow 테이블을 데이터프레임으로 바꿉니다. 문자열 컬럼은 복사 없이 Arrow 기반 문자열 컬럼으로 유지합니다.
+    """
+    string_dtype = _arrow_string_dtype()
+    if string_dtype is None:
+        return table.to_pandas()
+    return table.to_pandas(types_mapper={pa.string(): string_dtype, pa.large_string(): string_dtype}.get)
+
+
+def read_pension_csv(pension_file_path, project=False, reader=None):
+    """
+    국민연금 CSV 전체를 read_csv(dtype=str, encoding="CP949")와 같은 값으로 읽습니다.
+    project=True이면 위치 0~14번 컬럼만 파싱합니다.
+    """
+    if resolve_csv_reader(reader) == "pandas":
+        usecols = range(PENSION_USED_COLUMN_COUNT) if project else None
+        return pd.read_csv(pension_file_path, dtype=str, encoding=PENSION_CSV_ENCODING, usecols=usecols)
+
+    read_options, parse_options, convert_options = _arrow_csv_options(pension_file_path, project)
+    try:
+        table = pa_csv.read_csv(pension_file_path, read_options=read_options, parse_options=parse_options,
+                                convert_options=convert_options)
+    except pa.ArrowInvalid as e:
+        print(f"⚠️ arrow CSV 리더로 읽지 못한 행이 있어 pandas로 읽습니다: {str(e)}")
+        return read_pension_csv(pension_file_path, project, "pandas")
+    return arrow_table_to_pandas(table)
+
+
+def _iter_pandas_csv_tables(pension_file_path, chunksize=PENSION_CHUNK_SIZE, project=False, skip_rows=0):
+    # pandas 파서로 읽은 청크를 arrow 리더와 같은 문자열 스키마의 Arrow 테이블로 돌려줍니다.
+    # skip_rows는 이미 돌려준 행 수이며 chunksize의 배수입니다.
+    schema = pa.schema([(name, pa.string()) for name in read_pension_csv_header(pension_file_path, project)])
+    usecols = range(PENSION_USED_COLUMN_COUNT) if project else None
+    with pd.read_csv(pension_file_path, dtype=str, encoding=PENSION_CSV_ENCODING,
+                     chunksize=chunksize, usecols=usecols) as csv_reader:
+        for chunk in csv_reader:
+            if skip_rows:
+                skip_rows -= len(chunk)
+                continue
+            yield pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+
+
+def _iter_arrow_csv_tables(pension_file_path, chunksize=PENSION_CHUNK_SIZE, project=False):
+    # arrow 스트리밍 리더는 블록 크기 단위로 읽으므로, chunksize 행씩 다시 묶어 돌려줍니다.
+    # 헤더만 있는 파일은 pandas 청크와 같이 빈 테이블 하나를 돌려줍니다.
+    read_options, parse_options, convert_options = _arrow_csv_options(pension_file_path, project)
+    pending = None
+    emitted_rows = 0
+    try:
+        with pa_csv.open_csv(pension_file_path, read_options=read_options, parse_options=parse_options,
+                             convert_options=convert_options) as csv_reader:
+            schema = csv_reader.schema
+            for batch in csv_reader:
+                table = pa.Table.from_batches([batch])
+                pending = table if pending is None else pa.concat_tables([pending, table])
+                while pending.num_rows >= chunksize:
+                    yield pending.slice(0, chunksize)
+                    emitted_rows += chunksize
+                    pending = pending.slice(chunksize)
+    except pa.ArrowInvalid as e:
+        # pyarrow의 invalid_row_handler는 행을 건너뛰기만 할 수 있어 pandas처럼 빈 값을 NaN으로 채울 수 없으므로,
+        # 아직 돌려주지 않은 행부터는 pandas로 읽습니다.
+        print(f"⚠️ arrow CSV 리더로 읽지 못한 행이 있어 pandas로 이어서 읽습니다: {str(e)}")
+        yield from _iter_pandas_csv_tables(pension_file_path, chunksize, project, skip_rows=emitted_rows)
+        return
+    if pending is not None and pending.num_rows:
+        yield pending
+    elif not emitted_rows:
+        yield schema.empty_table()
+
+
+def _iter_csv_chunks(file_name, chunksize=PENSION_CHUNK_SIZE, project=False, reader=None):
+    pension_file_path = os.path.join(PENSION_DATA_DIR, file_name)
+    if resolve_csv_reader(reader) == "pandas":
+        usecols = range(PENSION_USED_COLUMN_COUNT) if project else None
+        with pd.read_csv(pension_file_path, dtype=str, encoding=PENSION_CSV_ENCODING,
+                         chunksize=chunksize, usecols=usecols) as csv_reader:
+            for chunk in csv_reader:
+                yield chunk
+        return
+
+    offset = 0
+    for table in _iter_arrow_csv_tables(pension_file_path, chunksize, project):
+        chunk = arrow_table_to_pandas(table)
+        # pandas 청크와 같이 파일 전체 기준의 연속된 인덱스를 붙입니다.
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk
+
+
+def iter_pension_chunks(file_name, chunksize=PENSION_CHUNK_SIZE, project=False, use_cache=True):
+    """
+    국민연금 CSV를 chunksize 행씩 나누어 읽습니다.
+    project=True이면 위치 0~14번 컬럼만 읽어 columns[1]~columns[14] 위치가 그대로 유지됩니다.
+    use_cache=True이면 컬럼형 캐시(Parquet)를 사용하고, 캐시가 없거나 오래되었으면 먼저 만듭니다.
+    """
+    cache_path = None
+    if use_cache and PENSION_CACHE_ENABLED and PYARROW_AVAILABLE:
+        cache_path = find_pension_cache(file_name) or ingest_pension_csv(file_name)
+
+    if cache_path is None:
+        yield from _iter_csv_chunks(file_name, chunksize, project)
+    else:
+        yield from _iter_cached_chunks(cache_path, chunksize, project)
+
+
+# 국민연금 CSV 컬럼형(Parquet) 캐시
+# CP949 디코딩과 CSV 파싱은 파일마다 한 번만 하고, 이후에는 Parquet에서 필요한 컬럼만 읽습니다.
+PENSION_CACHE_DIR = os.path.join(DATA_DIR, "pension_cache")
+PENSION_CACHE_ENABLED = True
+PENSION_CACHE_VERSION = 1
+PENSION_CACHE_META_KEY = b"pension_cache_source"
+
+
+def _pension_cache_path(file_name):
+    # 절대 경로로 넘어온 파일도 캐시는 PENSION_CACHE_DIR 안에 둡니다.
+    return os.path.join(PENSION_CACHE_DIR, os.path.splitext(os.path.basename(file_name))[0] + ".parquet")
+
+
+def _read_pension_cache_source(cache_path):
+    try:
+        metadata = pq.read_schema(cache_path).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if PENSION_CACHE_META_KEY not in metadata:
+        return None
+    source = json.loads(metadata[PENSION_CACHE_META_KEY])
+    if source.get("version") != PENSION_CACHE_VERSION:
+        return None
+    return source
+
+
+def find_pension_cache(file_name):
+    """
+    원본 CSV와 일치하는 캐시가 있으면 경로를, 없으면 None을 반환합니다.
+    수정 시각과 크기가 같으면 바로 사용하고, 수정 시각만 다르면 파일 해시로 확인합니다.
+    """
+    if not PYARROW_AVAILABLE:
+        return None
+
+    cache_path = _pension_cache_path(file_name)
+    source = _read_pension_cache_source(cache_path)
+    if source is None:
+        return None
+    return cache_path if _pension_source_matches(source, file_name) else None
+
+
+def _pension_source_matches(source, file_name):
+    # 저장해 둔 원본 정보(수정 시각, 크기, 해시)가 지금의 국민연금 파일과 같은지 확인합니다.
+    file_stat = os.stat(os.path.join(PENSION_DATA_DIR, file_name))
+    if source["size"] != file_stat.st_size:
+        return False
+    if source["mtime_ns"] == file_stat.st_mtime_ns:
+        return True
+    return source["sha256"] == _file_sha256(os.path.join(PENSION_DATA_DIR, file_name))
+
+
+@instrumentation.instrumented("ingest_cache")
+def ingest_pension_csv(file_name, chunksize=PENSION_CHUNK_SIZE):
+    """
+    국민연금 CSV를 한 번 읽어 zstd 압축 Parquet 캐시로 변환합니다.
+    모든 컬럼은 load_pension_data와 같이 문자열로 저장되며, 청크 단위로 기록하므로
+    변환 중에도 메모리는 청크 하나 크기로 유지됩니다.
+    변환에 실패하면 None을 반환하고, 호출한 쪽은 CSV를 그대로 읽습니다.
+    """
+    if not PYARROW_AVAILABLE:
+        print("⚠️ pyarrow가 설치되어 있지 않아 국민연금 캐시를 만들 수 없습니다.")
+        return None
+
+    pension_file_path = os.path.join(PENSION_DATA_DIR, file_name)
+    file_stat = os.stat(pension_file_path)
+    source = {
+        "version": PENSION_CACHE_VERSION,
+        "mtime_ns": file_stat.st_mtime_ns,
+        "size": file_stat.st_size,
+        "sha256": _file_sha256(pension_file_path),
+    }
+
+    cache_path = _pension_cache_path(file_name)
+    temp_path = None
+    writer = None
+    try:
+        os.makedirs(PENSION_CACHE_DIR, exist_ok=True)
+        temp_path = _unique_temp_path(cache_path)
+        schema = pa.schema([(col, pa.string()) for col in read_pension_csv_header(pension_file_path)],
+                           metadata={PENSION_CACHE_META_KEY: json.dumps(source)})
+
+        writer = pq.ParquetWriter(temp_path, schema, compression="zstd")
+        if resolve_csv_reader() == "arrow":
+            # arrow 리더가 만든 테이블은 pandas를 거치지 않고 그대로 기록합니다.
+            for table in _iter_arrow_csv_tables(pension_file_path, chunksize):
+                writer.write_table(table)
+        else:
+            for chunk in _iter_csv_chunks(file_name, chunksize):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        writer.close()
+        writer = None
+        os.replace(temp_path, cache_path)
+    except BaseException as e:
+        # 어떤 예외든 쓰던 파일을 닫고 임시 파일을 지웁니다. 읽기/쓰기 오류가 아니면 그대로 다시 냅니다.
+        try:
+            if writer is not None:
+                writer.close()
+        finally:
+            if temp_path is not None:
+                _remove_quietly(temp_path)
+        if not isinstance(e, (OSError, pa.ArrowException)):
+            raise
+        print(f"⚠️ 국민연금 캐시를 만들지 못했습니다: {str(e)}")
+        return None
+
+    return cache_path
+
+
+def _iter_cached_chunks(cache_path, chunksize=PENSION_CHUNK_SIZE, project=False):
+    parquet_file = pq.ParquetFile(cache_path, memory_map=True)
+    columns = parquet_file.schema_arrow.names
+    if project:
+        columns = columns[:PENSION_USED_COLUMN_COUNT]
+
+    if not parquet_file.metadata.num_rows:
+        # 헤더만 있는 CSV의 캐시도 CSV 청크와 같이 빈 청크 하나를 돌려줍니다.
+        yield _restore_missing_values(parquet_file.schema_arrow.empty_table().select(columns).to_pandas())
+        return
+
+    offset = 0
+    for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+        chunk = _restore_missing_values(batch.to_pandas())
+        # CSV 청크와 같이 파일 전체 기준의 연속된 인덱스를 붙입니다.
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk
+
+
+def _restore_missing_values(df):
+    # Parquet의 null은 object 컬럼에서 None이 되므로, read_csv와 같이 NaN으로 맞춥니다.
+    return df.where(df.notna(), np.nan)
+
+
+@instrumentation.instrumented("load_cached", rows=lambda df, *args, **kwargs: len(df))
+def load_pension_data_cached(file_name, project=False):
+    """
+    load_pension_data와 같은 데이터프레임을 컬럼형 캐시에서 읽습니다.
+    캐시가 없거나 오래되었으면 먼저 만들고, pyarrow가 없으면 CSV를 그대로 읽습니다.
+    """
+    cache_path = None
+    if PENSION_CACHE_ENABLED and PYARROW_AVAILABLE:
+        cache_path = find_pension_cache(file_name) or ingest_pension_csv(file_name)
+    if cache_path is None:
+        return pd.concat(_iter_csv_chunks(file_name, PENSION_CHUNK_SIZE, project))
+
+    parquet_file = pq.ParquetFile(cache_path, memory_map=True)
+    columns = parquet_file.schema_arrow.names
+    if project:
+        columns = columns[:PENSION_USED_COLUMN_COUNT]
+    table = pq.read_table(cache_path, columns=columns, memory_map=True)
+    return _restore_missing_values(table.to_pandas())
+
+
+def build_candidate_key_table(df_excellent):
+    """
+    강소기업 명단에서 필터링(앞 6자리, zfill 적용)과 소재지 업데이트(zfill 미적용)에
+    쓰이는 키를 모두 모은 테이블을 만듭니다.
+    """
+    names = normalize_company_names(df_excellent["사업자명"])
+    bizno = to_str_column(df_excellent["사업자등록번호"]).str.replace("-", "", regex=False)
+    key_tables = [
+        pd.DataFrame({NAME_KEY_COL: names, BIZNO_PREFIX_COL: bizno.str.zfill(10).str[:6]}),
+        pd.DataFrame({NAME_KEY_COL: names, BIZNO_PREFIX_COL: bizno.str[:6]}),
+    ]
+    return pd.concat(key_tables, ignore_index=True).drop_duplicates()
+
+
+def load_pension_candidates(file_name, df_excellent, chunksize=PENSION_CHUNK_SIZE, project=False,
+                            candidate_keys=None, prefix_only=False, use_cache=True):
+    """
+    국민연금 CSV를 청크 단위로 읽으면서 강소기업 키와 일치할 수 있는 행만 남깁니다.
+    나머지 행은 청크마다 버려지므로 메모리 사용량은 청크 하나와 결과 크기 정도로 유지됩니다.
+    반환되는 데이터프레임은 load_pension_data와 같은 컬럼/인덱스를 가지므로
+    extract_excellent_companies* / update_company_location에 그대로 넘길 수 있습니다.
+    candidate_keys를 넘기면 df_excellent 대신 미리 만든 키 테이블을 사용합니다.
+    prefix_only=True이면 회사명은 보지 않고 사업자등록번호 앞 6자리만 비교합니다. (유사 회사명 매칭용)
+    use_cache=False이면 컬럼형 캐시를 만들거나 읽지 않습니다. (한 번만 읽는 임시 파일용)
+    """
+    if candidate_keys is None:
+        candidate_keys = build_candidate_key_table(df_excellent)
+    candidate_prefixes = candidate_keys[BIZNO_PREFIX_COL].unique()
+    candidate_key_store = None if prefix_only else CompanyKeyStore.from_key_table(candidate_keys)
+
+    kept_chunks = []
+    total_rows = 0
+    with instrumentation.stage("load_candidates") as record, \
+            ProgressReporter('📥 국민연금 데이터 읽는 중', unit='행') as progress:
+        for chunk in iter_pension_chunks(file_name, chunksize, project, use_cache):
+            total_rows += len(chunk)
+            if prefix_only:
+                bizno = to_str_column(chunk[chunk.columns[2]]).str.replace("-", "", regex=False)
+                kept_chunks.append(chunk[bizno.str[:6].isin(candidate_prefixes).to_numpy()])
+            else:
+                matched = match_pension_keys(candidate_keys, chunk, key_store=candidate_key_store)
+                kept_chunks.append(chunk.iloc[matched[ROW_POS_COL].to_numpy()])
+            progress.update(total_rows)
+        record["rows"] = total_rows
+
+    if not kept_chunks:
+        pension_file_path = os.path.join(PENSION_DATA_DIR, file_name)
+        return pd.DataFrame(columns=read_pension_csv_header(pension_file_path, project), dtype=str)
+
+    df_candidates = pd.concat(kept_chunks)
+    print(f"✅ 전체 {total_rows}개 항목 중 강소기업 후보 {len(df_candidates)}개를 남겼습니다.")
+    return df_candidates
+
 # 강소기업만 추출하는 함수
 def extract_excellent_companies(df_excellent, df_pension):
     print(f"🔍 총 {len(df_pension)}개의 국민연금 데이터 중에서 강소기업 {len(df_excellent)}개를 검색합니다...")
@@ -261,9 +901,9 @@ def extract_excellent_companies(df_excellent, df_pension):
     filtered_rows = []
     total_rows = len(df_pension)
 
+    progress = ProgressReporter('필터링 중', total_rows)
     for i, (idx, row) in enumerate(df_pension.iterrows()):
-        if i % 100 == 0 or i == total_rows - 1:  # 100개 단위로 업데이트
-            update_progress(i + 1, total_rows, '필터링 중')
+        progress.update(i + 1)
 
         pension_company = normalize_company_name(row[company_name_col])
         pension_bizno = str(row[pension_bizno_col]).replace("-", "")
@@ -277,7 +917,7 @@ def extract_excellent_companies(df_excellent, df_pension):
             df_pension.at[idx, pension_bizno_col] = matched_info["full_bizno"]
 
             filtered_rows.append(row)
-
+    progress.close()
 
     df_filtered = pd.DataFrame(filtered_rows)
     print(f"✅ 필터링 완료: 총 {len(df_filtered)}개의 강소기업이 발견되었습니다.")
@@ -327,9 +967,9 @@ def extract_excellent_companies_updated(df_excellent, df_pension):
     # 추가된 부분: 중복된 key 처리를 위한 딕셔너리
     best_matches = {}
 
+    progress = ProgressReporter('필터링 중', total_rows)
     for i, (idx, row) in enumerate(df_pension.iterrows()):
-        if i % 100 == 0 or i == total_rows - 1:  # 100개 단위로 업데이트
-            update_progress(i + 1, total_rows, '필터링 중')
+        progress.update(i + 1)
 
         pension_company = normalize_company_name(row[company_name_col])
         pension_bizno = str(row[pension_bizno_col]).replace("-", "")
@@ -355,6 +995,7 @@ def extract_excellent_companies_updated(df_excellent, df_pension):
             else:
                 # 첫 등록
                 best_matches[key] = (row, similarity_score)
+    progress.close()
 
     # 추가된 부분: 중복 제거된 최종 필터링 결과 생성
     filtered_rows = [match[0] for match in best_matches.values()]
@@ -365,6 +1006,10 @@ def extract_excellent_companies_updated(df_excellent, df_pension):
     return df_filtered
 
 
+# 시도 이름 표준화 (예: '경기' -> '경기도')
+SIDO_FULL_NAMES = address_normalization.SIDO_FULL_NAMES
+
+
 # 추가된 부분: 주소 유사도 계산 함수
 def calculate_address_similarity(address1, address2):
     """
@@ -380,31 +1025,9 @@ def calculate_address_similarity(address1, address2):
     Returns:
     float: 두 주소 간의 유사도 점수 (0.0 ~ 1.0)
     """
-    # 주소 전처리: 공백 제거, 소문자 변환
-    address1 = address1.strip().lower()
-    address2 = address2.strip().lower()
-
-    # 주소에서 불필요한 단어/문자 제거
-    patterns_to_remove = ['(주)', '(유)', '(합)', '주식회사', '유한회사', ',', '(', ')', '.']
-    for pattern in patterns_to_remove:
-        address1 = address1.replace(pattern, '')
-        address2 = address2.replace(pattern, '')
-
-    # 시도 이름 표준화 (예: '경기' -> '경기도')
-    sido_mapping = {
-        '경기': '경기도', '서울': '서울특별시', '부산': '부산광역시',
-        '대구': '대구광역시', '인천': '인천광역시', '광주': '광주광역시',
-        '대전': '대전광역시', '울산': '울산광역시', '세종': '세종특별자치시',
-        '강원': '강원도', '충북': '충청북도', '충남': '충청남도',
-        '전북': '전라북도', '전남': '전라남도', '경북': '경상북도',
-        '경남': '경상남도', '제주': '제주특별자치도'
-    }
-
-    for short, full in sido_mapping.items():
-        if address1.startswith(short) and not address1.startswith(full):
-            address1 = address1.replace(short, full, 1)
-        if address2.startswith(short) and not address2.startswith(full):
-            address2 = address2.replace(short, full, 1)
+    # 주소 전처리: 공백 제거, 소문자 변환, 불필요한 단어/문자 제거, 시도 이름 표준화 (예: '경기' -> '경기도')
+    address1 = address_normalization.normalize_address(address1)
+    address2 = address_normalization.normalize_address(address2)
 
     # 토큰화 (공백 기준)
     tokens1 = set(address1.split())
@@ -420,13 +1043,437 @@ def calculate_address_similarity(address1, address2):
     similarity = intersection / union
     return similarity
 
+
+# 컬럼 단위(벡터화) 매칭 엔진
+# extract_excellent_companies / extract_excellent_companies_updated 는 결과 검증을 위한 기준 구현으로 유지합니다.
+NAME_KEY_COL = "_name_key"
+BIZNO_PREFIX_COL = "_bizno_prefix"
+ROW_POS_COL = "_row_pos"
+MATCH_KEY_COLS = [NAME_KEY_COL, BIZNO_PREFIX_COL]
+
+
+def to_str_column(series):
+    """
+    컬럼 전체에 str(value)를 적용한 것과 같은 결과를 돌려줍니다. (결측값 → 'nan')
+    """
+    values = series.astype(object)
+    return values.where(values.notna(), "nan")
+
+
+def normalize_company_names(names):
+    """
+    normalize_company_name을 컬럼 전체에 한 번에 적용합니다.
+    같은 회사명은 한 번만 정규화하고, 문자열이 아니거나 비어 있는 값은 빈 문자열이 됩니다.
+    """
+    codes, uniques = pd.factorize(names.astype(object))
+    with instrumentation.stage("normalize", rows=len(names)):
+        normalized = np.array([normalize_company_name_fast(name) for name in uniques] + [""], dtype=object)
+    instrumentation.count("normalize_calls", len(uniques))
+    # factorize는 결측값을 -1로 표시하므로, 마지막에 붙인 빈 문자열을 가리키게 됩니다.
+    return pd.Series(normalized[codes], index=names.index, dtype=object)
+
+
+def build_excellent_key_table(df_excellent, with_address=False):
+    """
+    강소기업 명단으로 (정규화된 회사명, 사업자등록번호 앞 6자리) 키 테이블을 만듭니다.
+    키가 중복되면 기준 구현의 딕셔너리와 같이 마지막 행이 남습니다.
+    """
+    excellent_company_col = "사업자명"
+    excellent_bizno_col = "사업자등록번호"
+    excellent_address_col = "소재지"
+
+    bizno = to_str_column(df_excellent[excellent_bizno_col]).str.replace("-", "", regex=False).str.zfill(10)
+    key_table = pd.DataFrame({
+        NAME_KEY_COL: normalize_company_names(df_excellent[excellent_company_col]),
+        BIZNO_PREFIX_COL: bizno.str[:6],
+        "full_bizno": bizno,
+    })
+    if with_address:
+        key_table["address"] = to_str_column(df_excellent[excellent_address_col])
+
+    key_table = key_table.drop_duplicates(MATCH_KEY_COLS, keep="last")
+    if with_address:
+        # 강소기업 주소는 후보마다 같으므로 정규화와 토큰화를 한 번만 해 둡니다.
+        key_table["address_tokens"] = tokenize_addresses(key_table["address"])
+    return key_table
+
+
+def build_pension_key_table(df_pension, bizno_prefixes=None):
+    """
+    국민연금 데이터의 매칭 키를 컬럼 단위로 계산합니다.
+    ROW_POS_COL에는 df_pension 안에서의 행 위치가 들어갑니다.
+    bizno_prefixes를 넘기면 먼저 사업자등록번호 앞 6자리가 그 안에 있는 행만 남기고(1단계),
+    남은 행의 회사명만 정규화합니다(2단계). 키가 일치할 수 없는 행만 빠지므로 매칭 결과는 같습니다.
+    """
+    company_name_col = df_pension.columns[1]
+    pension_bizno_col = df_pension.columns[2]
+
+    pension_bizno = to_str_column(df_pension[pension_bizno_col]).str.replace("-", "", regex=False)
+    pension_prefixes = pension_bizno.str[:6]
+    company_names = df_pension[company_name_col]
+    positions = np.arange(len(df_pension))
+    if bizno_prefixes is not None:
+        keep = pension_prefixes.isin(bizno_prefixes).to_numpy()
+        instrumentation.count("prefilter_dropped_rows", len(keep) - int(keep.sum()))
+        pension_prefixes = pension_prefixes[keep]
+        company_names = company_names[keep]
+        positions = positions[keep]
+
+    return pd.DataFrame({
+        NAME_KEY_COL: normalize_company_names(company_names).to_numpy(),
+        BIZNO_PREFIX_COL: pension_prefixes.to_numpy(),
+        ROW_POS_COL: positions,
+    })
+
+
+# 정수로 인코딩한 매칭 키
+NAME_CODE_COL = "_name_code"
+PREFIX_CODE_COL = "_prefix_code"
+MATCH_CODE_COLS = [NAME_CODE_COL, PREFIX_CODE_COL]
+
+
+class CompanyKeyStore:
+    """
+    강소기업 매칭 키(정규화된 회사명, 사업자등록번호 앞자리)를 정수 코드로 바꾸는 코드표입니다.
+    회사명과 앞자리는 서로 다른 값마다 한 번씩만 저장하고, 국민연금 쪽 값도 같은 코드표로 바꿉니다.
+    강소기업에 없는 값은 -1이 되므로 조인 전에 버릴 수 있고, 키 테이블에는 행마다 문자열 대신
+    int32 코드 두 개만 남습니다. 코드가 같으면 원래 문자열도 같으므로 매칭 결과는 문자열 조인과 같습니다.
+    from_key_table로 만들면 코드 컬럼을 붙인 키 테이블(encoded_keys)도 함께 만들어 두므로,
+    한 번 만든 코드표를 청크/파일마다 match_pension_keys에 넘기면 코드표와 키 테이블을 다시 만들지 않습니다.
+    """
+    __slots__ = ("names", "prefixes", "encoded_keys")
+
+    def __init__(self, names, prefixes):
+        self.names = pd.Index(pd.unique(np.asarray(names, dtype=object)))
+        self.prefixes = pd.Index(pd.unique(np.asarray(prefixes, dtype=object)))
+        self.encoded_keys = None
+
+    @classmethod
+    def from_key_table(cls, key_table):
+        key_store = cls(key_table[NAME_KEY_COL].to_numpy(), key_table[BIZNO_PREFIX_COL].to_numpy())
+        key_store.encoded_keys = key_store.encode(key_table)
+        return key_store
+
+    def encode_names(self, names):
+        return self.names.get_indexer(np.asarray(names, dtype=object)).astype(np.int32)
+
+    def encode_prefixes(self, prefixes):
+        return self.prefixes.get_indexer(np.asarray(prefixes, dtype=object)).astype(np.int32)
+
+    def encode(self, key_table):
+        """
+        문자열 키 테이블에 정수 코드 컬럼(MATCH_CODE_COLS)을 붙입니다.
+        """
+        return key_table.assign(**{
+            NAME_CODE_COL: self.encode_names(key_table[NAME_KEY_COL]),
+            PREFIX_CODE_COL: self.encode_prefixes(key_table[BIZNO_PREFIX_COL]),
+        })
+
+
+def build_pension_key_codes(company_names, prefixes, key_store):
+    """
+    국민연금 행의 (회사명, 사업자등록번호 앞자리)를 key_store의 정수 코드로 바꿉니다.
+    앞자리 코드가 없는 행을 먼저 버리고 남은 행의 회사명만 정규화하며, 회사명 코드도 없는 행은 버립니다.
+    결과에는 코드 두 개와 행 위치(ROW_POS_COL)만 남습니다. 앞자리가 None인 행은 항상 버려집니다.
+    """
+    prefix_codes = key_store.encode_prefixes(prefixes)
+    positions = np.flatnonzero(prefix_codes >= 0)
+    instrumentation.count("prefilter_dropped_rows", len(prefix_codes) - len(positions))
+
+    name_codes = key_store.encode_names(normalize_company_names(company_names.iloc[positions]))
+    keep = name_codes >= 0
+    return pd.DataFrame({
+        NAME_CODE_COL: name_codes[keep],
+        PREFIX_CODE_COL: prefix_codes[positions[keep]],
+        ROW_POS_COL: positions[keep],
+    })
+
+
+def match_pension_keys(excellent_keys, df_pension, pension_keys=None, key_store=None):
+    """
+    국민연금 키 테이블과 강소기업 키 테이블을 한 번의 해시 조인으로 매칭합니다.
+    결과는 국민연금 행 순서(ROW_POS_COL)로 정렬됩니다.
+    pension_keys를 넘기면 그 문자열 키로 조인하고, 넘기지 않으면 강소기업 키의 정수 코드표로
+    일치할 수 있는 국민연금 행만 코드로 바꿔 조인합니다.
+    key_store는 excellent_keys로 미리 만든 코드표(CompanyKeyStore.from_key_table)이며, 넘기지 않으면 새로 만듭니다.
+    """
+    if pension_keys is not None:
+        with instrumentation.stage("match", rows=len(pension_keys)):
+            matched = pension_keys.merge(excellent_keys, on=MATCH_KEY_COLS, how="inner", sort=False)
+    else:
+        if key_store is None:
+            key_store = CompanyKeyStore.from_key_table(excellent_keys)
+        pension_bizno = to_str_column(df_pension[df_pension.columns[2]]).str.replace("-", "", regex=False)
+        pension_codes = build_pension_key_codes(df_pension[df_pension.columns[1]], pension_bizno.str[:6], key_store)
+        with instrumentation.stage("match", rows=len(pension_codes)):
+            matched = pension_codes.merge(key_store.encoded_keys, on=MATCH_CODE_COLS, how="inner", sort=False)
+            matched = matched.drop(columns=MATCH_CODE_COLS)
+
+    matched = matched.sort_values(ROW_POS_COL, kind="stable").reset_index(drop=True)
+    instrumentation.count("matched_rows", len(matched))
+    return matched
+
+
+def normalize_addresses(addresses):
+    """
+    calculate_address_similarity의 주소 전처리를 컬럼 전체에 한 번에 적용합니다.
+    """
+    return address_normalization.normalize_address_column(to_str_column(addresses))
+
+
+def tokenize_addresses(addresses):
+    """
+    주소 컬럼을 정규화한 뒤 공백 기준 토큰 목록으로 나눕니다.
+    """
+    return normalize_addresses(addresses).str.split()
+
+
+def _explode_tokens(token_lists):
+    # (행 번호, 토큰) 쌍으로 펼치고, 행 안의 중복 토큰은 집합처럼 한 번만 남깁니다.
+    token_lists = list(token_lists)
+    lengths = [len(tokens) for tokens in token_lists]
+    return pd.DataFrame({
+        "row": np.repeat(np.arange(len(token_lists)), lengths),
+        "token": list(itertools.chain.from_iterable(token_lists)),
+    }).drop_duplicates()
+
+
+def address_similarity_scores(pension_tokens, excellent_tokens):
+    """
+    같은 길이의 두 토큰 목록 컬럼에 대해 행마다 자카드 유사도를 계산합니다.
+    calculate_address_similarity와 같은 값을 교집합 조인과 bincount로 한 번에 구합니다.
+    """
+    row_count = len(pension_tokens)
+    pension_frame = _explode_tokens(pension_tokens)
+    excellent_frame = _explode_tokens(excellent_tokens)
+
+    pension_sizes = np.bincount(pension_frame["row"], minlength=row_count)
+    excellent_sizes = np.bincount(excellent_frame["row"], minlength=row_count)
+    common = pension_frame.merge(excellent_frame, on=["row", "token"])
+    intersection = np.bincount(common["row"], minlength=row_count)
+    union = pension_sizes + excellent_sizes - intersection
+
+    scores = np.zeros(row_count)
+    has_tokens = union > 0
+    scores[has_tokens] = intersection[has_tokens] / union[has_tokens]
+    return scores
+
+
+ADDRESS_SCORE_COL = "_address_score"
+
+
+def score_address_matches(matched, df_pension):
+    """
+    매칭 결과의 각 행에 국민연금 주소와 강소기업 주소의 유사도(ADDRESS_SCORE_COL)를 붙입니다.
+    """
+    pension_address_col = df_pension.columns[3]
+    pension_addresses = df_pension[pension_address_col].iloc[matched[ROW_POS_COL].to_numpy()]
+
+    with instrumentation.stage("similarity", rows=len(matched)):
+        scores = address_similarity_scores(tokenize_addresses(pension_addresses), matched["address_tokens"])
+    instrumentation.count("similarity_calls", len(matched))
+    return matched.assign(**{ADDRESS_SCORE_COL: scores})
+
+
+def best_address_match_labels(scored):
+    """
+    키마다 주소 유사도가 가장 높은 행의 라벨을 돌려줍니다.
+    동점이면 먼저 나온 행이 남고, 결과는 키가 처음 등장한 순서를 따릅니다. (기준 구현과 동일)
+    """
+    best_labels = scored.groupby(MATCH_KEY_COLS, sort=False)[ADDRESS_SCORE_COL].idxmax().to_numpy()
+    # 같은 키에 국민연금 행이 여러 개 일치한 경우가 키 충돌이며, 주소 유사도로 하나만 남깁니다.
+    instrumentation.count("key_collisions", len(scored) - len(best_labels))
+    return best_labels
+
+
+def select_best_address_matches(matched, df_pension):
+    """
+    키마다 주소 유사도가 가장 높은 국민연금 행 위치를 고릅니다.
+    """
+    scored = score_address_matches(matched, df_pension)
+    return scored.loc[best_address_match_labels(scored), ROW_POS_COL].to_numpy()
+
+
+# 유사 회사명 매칭 (선택)
+# 정확히 매칭되지 않은 국민연금 행을 사업자등록번호 앞 6자리가 같은 강소기업(블록) 안에서만
+# 회사명 유사도로 비교하므로 전체 조합(N×M)을 비교하지 않습니다.
+FUZZY_MATCH_THRESHOLD = 0.9  # 긴 회사명은 이 값 이상인 회사명 유사도만 매칭으로 인정
+# 짧은 회사명은 한 글자만 달라도 유사도가 0.9에 못 미치므로(예: 6자 0.83, 4자 0.75) 글자 차이로 판단합니다.
+# FUZZY_MIN_NAME_LENGTH자 이상 FUZZY_SHORT_NAME_LENGTH자 이하이면 한 글자 차이(바뀜/빠짐/더해짐)까지 인정하고,
+# 숫자가 다른 경우('한빛1'과 '한빛2' 등)는 다른 회사로 봅니다. 10자부터는 한 글자 차이의 유사도가 0.9 이상입니다.
+FUZZY_SHORT_NAME_LENGTH = 9
+FUZZY_MIN_NAME_LENGTH = 4
+MATCH_CONFIDENCE_COL = "매칭신뢰도"
+BIZNO_PREFIX_PATTERN = r"\d{6}"
+
+
+@functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def fuzzy_company_name(name_key):
+    """
+    정규화된 회사명 키를 유사도 비교용으로 한 번 더 정리합니다.
+    '㈜' 같은 호환 문자와 전각 문자를 풀어(NFKC) '(주)'와 같게 만든 뒤 다시 정규화합니다.
+    """
+    return normalize_company_name_fast(unicodedata.normalize("NFKC", name_key))
+
+
+def _one_edit_apart(name1, name2):
+    """
+    두 문자열이 한 글자만 바뀌거나 빠진 관계이고, 다른 글자가 숫자가 아니면 True를 반환합니다.
+    """
+    if len(name1) > len(name2):
+        name1, name2 = name2, name1
+    if len(name2) - len(name1) > 1:
+        return False
+    start = 0
+    while start < len(name1) and name1[start] == name2[start]:
+        start += 1
+    if len(name1) == len(name2):
+        if name1[start + 1:] != name2[start + 1:]:
+            return False
+        changed = name1[start] + name2[start]
+    else:
+        if name1[start:] != name2[start + 1:]:
+            return False
+        changed = name2[start]
+    return not any(char.isdigit() for char in changed)
+
+
+@functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def company_name_similarity(name1, name2, threshold=FUZZY_MATCH_THRESHOLD):
+    """
+    두 회사명의 유사도(0~1)를 계산하고, 매칭으로 인정하지 않는 쌍은 0을 반환합니다.
+    - 짧은 회사명(FUZZY_SHORT_NAME_LENGTH자 이하)은 숫자가 아닌 한 글자 차이이면 인정합니다.
+    - 그 밖에는 유사도가 threshold 이상이면 인정합니다. 빠른 상한값이 threshold에 못 미치면 전체 계산을 건너뜁니다.
+    """
+    if name1 == name2:
+        return 1.0
+    matcher = difflib.SequenceMatcher(None, name1, name2, autojunk=False)
+    if (FUZZY_MIN_NAME_LENGTH <= min(len(name1), len(name2))
+            and max(len(name1), len(name2)) <= FUZZY_SHORT_NAME_LENGTH and _one_edit_apart(name1, name2)):
+        return matcher.ratio()
+    if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+        return 0.0
+    ratio = matcher.ratio()
+    return ratio if ratio >= threshold else 0.0
+
+
+def fuzzy_match_pension_keys(excellent_keys, df_pension, exact_matched, pension_keys=None,
+                             threshold=FUZZY_MATCH_THRESHOLD):
+    """
+    정확히 매칭되지 않은 국민연금 행을 사업자등록번호 앞 6자리가 같은 강소기업과 회사명 유사도로 매칭합니다.
+    결과의 NAME_KEY_COL에는 강소기업 쪽 키가 들어가므로 정확한 매칭 결과와 같은 방식으로 다룰 수 있고,
+    MATCH_CONFIDENCE_COL에 회사명 유사도가 들어갑니다. 국민연금 행마다 가장 유사한 강소기업 하나만 남깁니다.
+    """
+    if pension_keys is None:
+        pension_keys = build_pension_key_table(df_pension)
+
+    unmatched_pension = pension_keys[~np.isin(pension_keys[ROW_POS_COL], exact_matched[ROW_POS_COL])]
+    unmatched_pension = unmatched_pension[unmatched_pension[BIZNO_PREFIX_COL].str.fullmatch(BIZNO_PREFIX_PATTERN)
+                                          & unmatched_pension[NAME_KEY_COL].ne("")]
+
+    with instrumentation.stage("fuzzy_match", rows=len(unmatched_pension)):
+        pairs = unmatched_pension.rename(columns={NAME_KEY_COL: "_pension_name_key"}).merge(
+            excellent_keys, on=BIZNO_PREFIX_COL, how="inner", sort=False)
+        pairs[MATCH_CONFIDENCE_COL] = [
+            company_name_similarity(fuzzy_company_name(pension_name), fuzzy_company_name(excellent_name), threshold)
+            for pension_name, excellent_name in zip(pairs.pop("_pension_name_key"), pairs[NAME_KEY_COL])
+        ]
+        scored_count = len(pairs)
+        pairs = pairs[pairs[MATCH_CONFIDENCE_COL] > 0]
+        # 같은 국민연금 행에 여러 강소기업이 걸리면 가장 유사한 하나만 남깁니다. (동점이면 먼저 나온 것)
+        pairs = pairs.sort_values([ROW_POS_COL, MATCH_CONFIDENCE_COL], ascending=[True, False], kind="stable")
+        pairs = pairs.drop_duplicates(ROW_POS_COL).reset_index(drop=True)
+
+    instrumentation.count("fuzzy_pairs_scored", scored_count)
+    instrumentation.count("fuzzy_matches", len(pairs))
+    return pairs
+
+
+def match_pension_keys_fuzzy(excellent_keys, df_pension, pension_keys=None, threshold=FUZZY_MATCH_THRESHOLD,
+                             key_store=None):
+    """
+    정확한 키 매칭(신뢰도 1.0)에 유사 회사명 매칭을 더한 결과를 국민연금 행 순서로 돌려줍니다.
+    key_store를 넘기면 정확한 키 매칭은 그 코드표로 합니다.
+    """
+    if pension_keys is None:
+        # 유사 매칭도 같은 앞 6자리 안에서만 비교하므로 같은 1단계 필터를 쓸 수 있습니다.
+        pension_keys = build_pension_key_table(df_pension, excellent_keys[BIZNO_PREFIX_COL].unique())
+    if key_store is not None:
+        exact_matched = match_pension_keys(excellent_keys, df_pension, key_store=key_store)
+    else:
+        exact_matched = match_pension_keys(excellent_keys, df_pension, pension_keys=pension_keys)
+    fuzzy_matched = fuzzy_match_pension_keys(excellent_keys, df_pension, exact_matched, pension_keys, threshold)
+
+    matched = pd.concat([exact_matched.assign(**{MATCH_CONFIDENCE_COL: 1.0}), fuzzy_matched], ignore_index=True)
+    return matched.sort_values(ROW_POS_COL, kind="stable").reset_index(drop=True)
+
+
+# 강소기업만 추출하는 함수 (벡터화 버전)
+def extract_excellent_companies_fast(df_excellent, df_pension, excellent_keys=None, fuzzy=False,
+                                     fuzzy_threshold=FUZZY_MATCH_THRESHOLD, key_store=None):
+    """
+    extract_excellent_companies와 같은 결과를 iterrows 없이 컬럼 단위로 계산합니다.
+    excellent_keys(와 그 코드표 key_store)를 넘기면 강소기업 키 테이블을 다시 만들지 않습니다.
+    fuzzy=True이면 유사 회사명 매칭을 더하고, 결과에 MATCH_CONFIDENCE_COL 컬럼을 붙입니다.
+    """
+    print(f"🔍 총 {len(df_pension)}개의 국민연금 데이터 중에서 강소기업 {len(df_excellent)}개를 검색합니다...")
+
+    if excellent_keys is None:
+        excellent_keys = build_excellent_key_table(df_excellent)
+    if fuzzy:
+        matched = match_pension_keys_fuzzy(excellent_keys, df_pension, threshold=fuzzy_threshold, key_store=key_store)
+    else:
+        matched = match_pension_keys(excellent_keys, df_pension, key_store=key_store)
+
+    df_filtered = df_pension.iloc[matched[ROW_POS_COL].to_numpy()]
+    if fuzzy:
+        df_filtered = df_filtered.assign(**{MATCH_CONFIDENCE_COL: matched[MATCH_CONFIDENCE_COL].to_numpy()})
+    print(f"✅ 필터링 완료: 총 {len(df_filtered)}개의 강소기업이 발견되었습니다.")
+
+    return df_filtered
+
+
+# 강소기업만 추출하는 함수 (벡터화 버전, 주소 유사도로 중복 제거)
+def extract_excellent_companies_updated_fast(df_excellent, df_pension, excellent_keys=None, fuzzy=False,
+                                             fuzzy_threshold=FUZZY_MATCH_THRESHOLD, key_store=None):
+    """
+    extract_excellent_companies_updated와 같은 결과를 iterrows 없이 컬럼 단위로 계산합니다.
+    excellent_keys(주소 포함)와 그 코드표 key_store를 넘기면 강소기업 키 테이블을 다시 만들지 않습니다.
+    fuzzy=True이면 유사 회사명 매칭을 더하고, 결과에 MATCH_CONFIDENCE_COL 컬럼을 붙입니다.
+    """
+    print(f"🔍 총 {len(df_pension)}개의 국민연금 데이터 중에서 강소기업 {len(df_excellent)}개를 검색합니다...")
+
+    if excellent_keys is None:
+        excellent_keys = build_excellent_key_table(df_excellent, with_address=True)
+    if fuzzy:
+        matched = match_pension_keys_fuzzy(excellent_keys, df_pension, threshold=fuzzy_threshold, key_store=key_store)
+    else:
+        matched = match_pension_keys(excellent_keys, df_pension, key_store=key_store)
+
+    if fuzzy:
+        # 강소기업마다 신뢰도가 가장 높은 후보만 남긴 뒤 그 안에서 주소 유사도로 고릅니다.
+        best_confidence = matched.groupby(MATCH_KEY_COLS, sort=False)[MATCH_CONFIDENCE_COL].transform("max")
+        matched = matched[matched[MATCH_CONFIDENCE_COL] == best_confidence]
+
+    positions = select_best_address_matches(matched, df_pension)
+    df_filtered = df_pension.iloc[positions]
+    if fuzzy:
+        # 국민연금 행은 많아야 한 강소기업에 매칭되므로 행 위치로 신뢰도를 찾을 수 있습니다.
+        confidence = matched.set_index(ROW_POS_COL)[MATCH_CONFIDENCE_COL]
+        df_filtered = df_filtered.assign(**{MATCH_CONFIDENCE_COL: confidence.loc[positions].to_numpy()})
+    print(f"✅ 필터링 완료: 총 {len(df_filtered)}개의 강소기업이 발견되었습니다.")
+
+    return df_filtered
+
+
 def update_company_location(df_excellent, df_pension):
     """
     국민연금 데이터에서 주소를 추출하여 강소기업 엑셀에 소재지 컬럼을 업데이트합니다.
     """
     print(f"🔄 강소기업 {len(df_excellent)}개와 국민연금 데이터 {len(df_pension)}개를 비교합니다...")
-    print("\n    [ 고죠 사토루: 무한의 가능성 속에서 답을 찾겠어... ]\n")
-    time.sleep(1)
+    if ANIMATIONS_ENABLED:
+        print("\n    [ 고죠 사토루: 무한의 가능성 속에서 답을 찾겠어... ]\n")
+        time.sleep(1)
 
     gojo_domain_expansion()
 
@@ -491,9 +1538,9 @@ def update_company_location(df_excellent, df_pension):
     total_rows = len(df_excellent)
     updated_count = 0
 
+    progress = ProgressReporter('데이터 업데이트 중', total_rows)
     for i, (idx, row) in enumerate(df_excellent.iterrows()):
-        if i % 10 == 0 or i == total_rows - 1:  # 10개 단위로 업데이트
-            update_progress(i + 1, total_rows, '데이터 업데이트 중')
+        progress.update(i + 1)
 
         company_name = normalize_company_name(row[excellent_company_col])
         excellent_bizno = str(row[excellent_bizno_col]).replace("-", "")
@@ -515,11 +1562,1311 @@ def update_company_location(df_excellent, df_pension):
 
             df_excellent.at[idx, '사업장업종상세정보'] = company_info['biz_detail']
             updated_count += 1
+    progress.close()
 
     print(f"✅ 업데이트 완료: 총 {updated_count}개 기업의 정보가 업데이트되었습니다.")
     return df_excellent
 
 
+def location_row_validity(df_pension):
+    """
+    update_company_location의 company_mapping에 들어갈 수 있는 국민연금 행을 컬럼 단위로 판정합니다.
+    (하이픈을 뺀 사업자등록번호, 행별 사용 가능 여부, 누락 항목별 건수)를 반환합니다.
+    """
+    company_name_col = df_pension.columns[1]
+    pension_bizno_col = df_pension.columns[2]
+    address_col = df_pension.columns[5]
+    biz_detail_col = df_pension.columns[14]
+
+    pension_bizno = to_str_column(df_pension[pension_bizno_col]).str.replace("-", "", regex=False)
+    address = to_str_column(df_pension[address_col]).str.replace("-", "", regex=False)
+    biz_detail = to_str_column(df_pension[biz_detail_col]).str.replace("-", "", regex=False)
+
+    # 기준 구현과 같은 순서로 검사하므로 한 행은 처음 걸린 누락 항목 하나로만 집계됩니다.
+    missing_bizno = (pension_bizno == "").to_numpy()
+    missing_address = ~missing_bizno & (address == "").to_numpy()
+    missing_biz_detail = ~missing_bizno & ~missing_address & (biz_detail == "").to_numpy()
+    missing_counts = {
+        "사업자등록번호": int(missing_bizno.sum()),
+        "주소": int(missing_address.sum()),
+        "사업장업종상세정보": int(missing_biz_detail.sum()),
+    }
+
+    # 파이썬의 참/거짓 판정과 같게 계산합니다. (NaN은 참, 빈 문자열은 거짓)
+    has_name = df_pension[company_name_col].to_numpy(dtype=object).astype(bool)
+    valid = ~(missing_bizno | missing_address | missing_biz_detail) & has_name
+    return pension_bizno, valid, missing_counts
+
+
+def build_location_lookup(df_pension, key_store):
+    """
+    국민연금 데이터로 (회사명 코드, 사업자등록번호 코드) → 국민연금 행 위치 테이블을 만듭니다.
+    update_company_location의 company_mapping과 같은 규칙을 컬럼 단위로 적용합니다.
+    - 사업자등록번호, 주소, 사업장업종상세정보가 비어 있거나 사업장명이 없는 행은 제외
+    - 같은 키가 여러 번 나오면 마지막 행이 남음
+    - 강소기업 키(key_store)와 일치할 수 없는 행은 처음부터 넣지 않음
+    우편번호/사업장업종상세정보는 복사하지 않고 행 위치(ROW_POS_COL)만 저장합니다.
+    누락 항목별 건수도 함께 반환합니다.
+    """
+    company_name_col = df_pension.columns[1]
+    pension_bizno, valid, missing_counts = location_row_validity(df_pension)
+
+    # 국민연금 쪽 키는 사업자등록번호 전체이며(기준 구현과 동일), 제외할 행은 None으로 두어 코드표에서 빠지게 합니다.
+    prefixes = np.where(valid, pension_bizno.to_numpy(dtype=object), None)
+    lookup = build_pension_key_codes(df_pension[company_name_col], prefixes, key_store)
+    return lookup.drop_duplicates(MATCH_CODE_COLS, keep="last"), missing_counts
+
+
+@instrumentation.instrumented("location", rows=lambda df, *args: len(df))
+def update_company_location_fast(df_excellent, df_pension):
+    """
+    update_company_location과 같은 결과를 iterrows 없이 한 번의 조인과 컬럼 대입으로 계산합니다.
+    행마다 출력하던 누락 경고는 항목별 건수로 한 번만 출력합니다.
+    """
+    print(f"🔄 강소기업 {len(df_excellent)}개와 국민연금 데이터 {len(df_pension)}개를 비교합니다...")
+    if ANIMATIONS_ENABLED:
+        print("\n    [ 고죠 사토루: 무한의 가능성 속에서 답을 찾겠어... ]\n")
+        time.sleep(1)
+
+    gojo_domain_expansion()
+
+    # 새 컬럼 추가
+    for col in ['지역', '우편번호', '사업장업종상세정보']:
+        if col not in df_excellent.columns:
+            df_excellent[col] = ""
+
+    excellent_keys = pd.DataFrame({
+        NAME_KEY_COL: normalize_company_names(df_excellent["사업자명"]).to_numpy(),
+        BIZNO_PREFIX_COL: to_str_column(df_excellent["사업자등록번호"]).str.replace("-", "", regex=False).str[:6].to_numpy(),
+        ROW_POS_COL: np.arange(len(df_excellent)),
+    })
+    key_store = CompanyKeyStore.from_key_table(excellent_keys)
+
+    print("회사명 매핑을 생성합니다.")
+    lookup, missing_counts = build_location_lookup(df_pension, key_store)
+    for field, count in missing_counts.items():
+        if count:
+            print(f"❌ {field}가 누락된 국민연금 데이터 {count}건을 건너뛰었습니다.")
+
+    matched = key_store.encoded_keys.merge(lookup.rename(columns={ROW_POS_COL: "_pension_pos"}),
+                                                     on=MATCH_CODE_COLS, how="inner", sort=False)
+    positions = matched[ROW_POS_COL].to_numpy()
+    pension_positions = matched["_pension_pos"].to_numpy()
+
+    # 지역은 강소기업 자신의 소재지에서 추출합니다. (기준 구현과 동일)
+    locations = to_str_column(df_excellent["소재지"]).iloc[positions]
+    df_excellent.iloc[positions, df_excellent.columns.get_loc('지역')] = \
+        address_normalization.province_abbreviations(locations).to_numpy()
+
+    zip_codes = df_pension[df_pension.columns[4]].to_numpy(dtype=object)[pension_positions]
+    has_zip_code = zip_codes.astype(bool)
+    df_excellent.iloc[positions[has_zip_code], df_excellent.columns.get_loc('우편번호')] = zip_codes[has_zip_code]
+    df_excellent.iloc[positions, df_excellent.columns.get_loc('사업장업종상세정보')] = \
+        df_pension[df_pension.columns[14]].to_numpy(dtype=object)[pension_positions]
+
+    print(f"✅ 업데이트 완료: 총 {len(positions)}개 기업의 정보가 업데이트되었습니다.")
+    return df_excellent
+
+
+# 국민연금 조회 저장소 (SQLite)
+# 국민연금 CSV를 한 번 읽어 (사업자등록번호 앞 6자리, 정규화된 회사명) 색인이 있는 SQLite 파일로 저장해 두면
+# 몇몇 기업의 우편번호/주소/사업장업종상세정보를 CSV 전체를 다시 읽지 않고 바로 찾을 수 있습니다.
+PENSION_STORE_DIR = os.path.join(DATA_DIR, "pension_store")
+PENSION_STORE_VERSION = 1
+PENSION_STORE_SUFFIX = ".sqlite"
+PENSION_STORE_RESULT_COLUMNS = ["row_id", "company_name", "bizno", "zip_code", "address", "biz_detail"]
+PENSION_STORE_SCHEMA = """
+CREATE TABLE pension_rows (
+    row_id INTEGER PRIMARY KEY,       -- 원본 CSV의 행 번호
+    company_name TEXT,
+    name_key TEXT NOT NULL,           -- 정규화된 회사명
+    bizno TEXT NOT NULL,              -- 하이픈을 뺀 사업자등록번호
+    bizno_prefix TEXT NOT NULL,       -- 사업자등록번호 앞 6자리
+    zip_code TEXT,
+    address TEXT,
+    biz_detail TEXT,                  -- 사업장업종상세정보
+    location_valid INTEGER NOT NULL   -- 소재지 업데이트에 쓸 수 있는 행 (update_company_location과 같은 규칙)
+);
+CREATE TABLE store_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+# 색인은 데이터를 모두 넣은 뒤에 만듭니다.
+PENSION_STORE_INDEXES = """
+CREATE INDEX idx_pension_prefix_name ON pension_rows (bizno_prefix, name_key);
+CREATE INDEX idx_pension_name ON pension_rows (name_key);
+"""
+
+
+def pension_store_path(file_name):
+    # 절대 경로로 넘어온 파일도 저장소는 PENSION_STORE_DIR 안에 둡니다.
+    return os.path.join(PENSION_STORE_DIR, os.path.splitext(os.path.basename(file_name))[0] + PENSION_STORE_SUFFIX)
+
+
+def _connect_pension_store(store_path):
+    # 조회는 읽기 전용으로 엽니다. (없는 파일을 빈 데이터베이스로 만들지 않음)
+    # 경로에 '?', '#', '%'가 있어도 같은 파일을 열도록 URI로 바꿔 씁니다.
+    return sqlite3.connect(pathlib.Path(store_path).resolve().as_uri() + "?mode=ro", uri=True)
+
+
+def _sql_values(series):
+    # 결측값(NaN)은 NULL로 저장합니다.
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def find_pension_store(file_name):
+    """
+    원본 CSV와 일치하는 조회 저장소가 있으면 경로를, 없거나 오래되었으면 None을 반환합니다.
+    """
+    store_path = pension_store_path(file_name)
+    if not os.path.exists(store_path):
+        return None
+    try:
+        connection = _connect_pension_store(store_path)
+        try:
+            row = connection.execute("SELECT value FROM store_meta WHERE key = 'source'").fetchone()
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        return None
+    if row is None:
+        return None
+    source = json.loads(row[0])
+    if source.get("version") != PENSION_STORE_VERSION:
+        return None
+    return store_path if _pension_source_matches(source, file_name) else None
+
+
+@instrumentation.instrumented("ingest_store")
+def ingest_pension_store(file_name, chunksize=PENSION_CHUNK_SIZE):
+    """
+    국민연금 CSV를 한 번 읽어 조회 저장소(SQLite)를 만들고 경로를 반환합니다.
+    청크 단위로 넣으므로 메모리는 청크 하나 크기로 유지되며, 다 만든 뒤에 기존 저장소와 바꿉니다.
+    """
+    pension_file_path = os.path.join(PENSION_DATA_DIR, file_name)
+    file_stat = os.stat(pension_file_path)
+    source = {
+        "version": PENSION_STORE_VERSION,
+        "mtime_ns": file_stat.st_mtime_ns,
+        "size": file_stat.st_size,
+        "sha256": _file_sha256(pension_file_path),
+    }
+
+    store_path = pension_store_path(file_name)
+    os.makedirs(PENSION_STORE_DIR, exist_ok=True)
+    temp_path = _unique_temp_path(store_path)  # 빈 파일은 SQLite가 빈 데이터베이스로 엽니다.
+
+    total_rows = 0
+    connection = sqlite3.connect(temp_path)
+    try:
+        # 임시 파일에 쓰고 마지막에 바꿔 넣으므로 저널 없이 빠르게 씁니다.
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.executescript(PENSION_STORE_SCHEMA)
+        with ProgressReporter('🗂️ 국민연금 조회 저장소 만드는 중', unit='행') as progress:
+            for chunk in iter_pension_chunks(file_name, chunksize, project=True):
+                pension_bizno, valid, _ = location_row_validity(chunk)
+                company_names = chunk[chunk.columns[1]]
+                connection.executemany("INSERT INTO pension_rows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", zip(
+                    chunk.index.tolist(),
+                    _sql_values(company_names),
+                    normalize_company_names(company_names).tolist(),
+                    pension_bizno.tolist(),
+                    pension_bizno.str[:6].tolist(),
+                    _sql_values(chunk[chunk.columns[4]]),
+                    _sql_values(chunk[chunk.columns[5]]),
+                    _sql_values(chunk[chunk.columns[14]]),
+                    valid.astype(int).tolist(),
+                ))
+                total_rows += len(chunk)
+                progress.update(total_rows)
+        connection.executescript(PENSION_STORE_INDEXES)
+        connection.executemany("INSERT INTO store_meta VALUES (?, ?)", [
+            ("source", json.dumps(source)),
+            ("pension_file", os.path.abspath(pension_file_path)),
+            ("rows", str(total_rows)),
+        ])
+        connection.commit()
+    except BaseException:
+        connection.close()
+        _remove_quietly(temp_path)
+        raise
+    connection.close()
+    os.replace(temp_path, store_path)
+
+    print(f"✅ 조회 저장소 생성 완료: {store_path} ({total_rows}행)")
+    return store_path
+
+
+def lookup_pension_store(store_path, keys):
+    """
+    (사업자등록번호, 회사명) 목록으로 조회 저장소를 찾아 키마다 일치하는 국민연금 행 목록을 반환합니다.
+    - 사업자등록번호는 하이픈을 빼고 앞 6자리로, 회사명은 normalize_company_name으로 정규화해 비교합니다.
+    - 둘 중 하나는 None이어도 되며, 그 경우 나머지 하나만으로 찾습니다.
+    - 행은 원본 CSV 순서이며, 각 행은 PENSION_STORE_RESULT_COLUMNS를 키로 하는 dict입니다.
+    """
+    results = []
+    connection = _connect_pension_store(store_path)
+    try:
+        for bizno, company_name in keys:
+            conditions, params = [], []
+            if bizno is not None:
+                conditions.append("bizno_prefix = ?")
+                params.append(str(bizno).replace("-", "")[:6])
+            if company_name is not None:
+                conditions.append("name_key = ?")
+                params.append(normalize_company_name_fast(company_name))
+            if not conditions:
+                raise ValueError("사업자등록번호와 회사명 중 하나는 있어야 합니다.")
+            rows = connection.execute(
+                f"SELECT {', '.join(PENSION_STORE_RESULT_COLUMNS)} FROM pension_rows "
+                f"WHERE {' AND '.join(conditions)} ORDER BY row_id", params).fetchall()
+            results.append({"bizno": bizno, "company_name": company_name,
+                            "matches": [dict(zip(PENSION_STORE_RESULT_COLUMNS, row)) for row in rows]})
+    finally:
+        connection.close()
+    return results
+
+
+@instrumentation.instrumented("location_store", rows=lambda df, *args: len(df))
+def update_company_location_from_store(df_excellent, store_path):
+    """
+    update_company_location과 같은 결과를 국민연금 CSV 대신 조회 저장소에서 계산합니다.
+    강소기업 키마다 색인으로 조건에 맞는 마지막 국민연금 행만 찾으므로 CSV를 다시 읽지 않습니다.
+    """
+    print(f"🔄 강소기업 {len(df_excellent)}개를 조회 저장소에서 찾습니다... ({store_path})")
+    for col in ['지역', '우편번호', '사업장업종상세정보']:
+        if col not in df_excellent.columns:
+            df_excellent[col] = ""
+
+    excellent_keys = pd.DataFrame({
+        NAME_KEY_COL: normalize_company_names(df_excellent["사업자명"]).to_numpy(),
+        BIZNO_PREFIX_COL: to_str_column(df_excellent["사업자등록번호"]).str.replace("-", "", regex=False).str[:6].to_numpy(),
+        ROW_POS_COL: np.arange(len(df_excellent)),
+    })
+    unique_keys = excellent_keys[MATCH_KEY_COLS].drop_duplicates()
+
+    connection = _connect_pension_store(store_path)
+    try:
+        connection.execute("CREATE TEMP TABLE query_keys (name_key TEXT, bizno TEXT)")
+        connection.executemany("INSERT INTO query_keys VALUES (?, ?)", unique_keys.itertuples(index=False, name=None))
+        # 국민연금 쪽 키는 사업자등록번호 전체이며, 같은 키가 여러 번 나오면 마지막 행이 남습니다. (기준 구현과 동일)
+        rows = connection.execute("""
+            SELECT q.name_key, q.bizno, p.zip_code, p.biz_detail
+            FROM query_keys AS q
+            JOIN pension_rows AS p ON p.row_id = (
+                SELECT MAX(row_id) FROM pension_rows
+                WHERE bizno_prefix = q.bizno AND name_key = q.name_key AND bizno = q.bizno AND location_valid = 1)
+        """).fetchall()
+    finally:
+        connection.close()
+
+    found = pd.DataFrame(rows, columns=MATCH_KEY_COLS + ["zip_code", "biz_detail"], dtype=object)
+    found = found.where(found.notna(), np.nan)
+    matched = excellent_keys.merge(found, on=MATCH_KEY_COLS, how="inner", sort=False)
+    positions = matched[ROW_POS_COL].to_numpy()
+
+    locations = to_str_column(df_excellent["소재지"]).iloc[positions]
+    df_excellent.iloc[positions, df_excellent.columns.get_loc('지역')] = \
+        address_normalization.province_abbreviations(locations).to_numpy()
+
+    zip_codes = matched["zip_code"].to_numpy(dtype=object)
+    has_zip_code = zip_codes.astype(bool)
+    df_excellent.iloc[positions[has_zip_code], df_excellent.columns.get_loc('우편번호')] = zip_codes[has_zip_code]
+    df_excellent.iloc[positions, df_excellent.columns.get_loc('사업장업종상세정보')] = \
+        matched["biz_detail"].to_numpy(dtype=object)
+
+    print(f"✅ 업데이트 완료: 총 {len(positions)}개 기업의 정보가 업데이트되었습니다.")
+    return df_excellent
+
+
+# 결과 저장 (스트리밍 출력)
+OUTPUT_FORMATS = {".xlsx": "xlsx", ".csv": "csv", ".parquet": "parquet"}
+EXCEL_MAX_ROWS = 1_048_576  # 헤더 포함 엑셀 시트 최대 행 수
+
+
+class ResultWriter:
+    """
+    결과 데이터프레임을 행 단위로 흘려 쓰는 출력기입니다. 형식은 확장자로 정합니다.
+    - .xlsx: xlsxwriter constant_memory 모드 (없으면 openpyxl write_only 모드)
+    - .csv: UTF-8(BOM) CSV
+    - .parquet: Parquet (pyarrow 필요)
+    전체 통합문서를 메모리에 만들지 않으므로 write()를 여러 번 호출해 청크 단위로 쓸 수 있습니다.
+    같은 폴더의 임시 파일에 쓰고 close()에서 결과 파일과 바꿔 넣으므로, 예외로 종료되면 임시 파일만 지우고
+    이전에 저장된 결과 파일은 그대로 남습니다.
+    """
+
+    def __init__(self, output_path):
+        extension = os.path.splitext(output_path)[1].lower()
+        if extension not in OUTPUT_FORMATS:
+            raise ValueError(f"지원하지 않는 출력 형식입니다: {extension} (지원: {', '.join(OUTPUT_FORMATS)})")
+        if OUTPUT_FORMATS[extension] == "parquet" and not PYARROW_AVAILABLE:
+            raise ValueError("Parquet으로 저장하려면 pyarrow가 필요합니다.")
+
+        self.output_path = output_path
+        self.output_format = OUTPUT_FORMATS[extension]
+        self.rows_written = 0
+        self._columns = None
+        self._temp_path = None
+        self._file = None
+        self._workbook = None
+        self._sheet = None
+        self._parquet_writer = None
+        self._parquet_schema = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def _open(self, df):
+        self._columns = [str(col) for col in df.columns]
+        self._temp_path = _unique_temp_path(self.output_path)
+
+        if self.output_format == "csv":
+            self._file = open(self._temp_path, "w", encoding="utf-8-sig", newline="")
+        elif self.output_format == "parquet":
+            self._parquet_schema = parquet_result_schema(df)
+            self._parquet_writer = pq.ParquetWriter(self._temp_path, self._parquet_schema, compression="zstd")
+        elif XLSXWRITER_AVAILABLE:
+            self._workbook = xlsxwriter.Workbook(self._temp_path, {"constant_memory": True,
+                                                                    "strings_to_urls": False})
+            self._sheet = self._workbook.add_worksheet("Sheet1")
+            self._sheet.write_row(0, 0, self._columns)
+        else:
+            from openpyxl import Workbook
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet("Sheet1")
+            self._sheet.append(self._columns)
+
+    def write(self, df):
+        """
+        데이터프레임의 행을 이어서 씁니다. 빈 데이터프레임도 헤더를 정하는 데 사용됩니다.
+        """
+        if self._columns is None:
+            self._open(df)
+
+        with instrumentation.stage("write", rows=len(df)):
+            self._write_rows(df)
+        self.rows_written += len(df)
+
+    def _write_rows(self, df):
+        if self.output_format == "csv":
+            df.to_csv(self._file, header=self._file.tell() == 0, index=False)
+        elif self.output_format == "parquet":
+            self._parquet_writer.write_table(
+                pa.Table.from_pandas(df, schema=self._parquet_schema, preserve_index=False))
+        else:
+            if self.rows_written + len(df) + 1 > EXCEL_MAX_ROWS:
+                raise ValueError(f"엑셀 최대 행 수({EXCEL_MAX_ROWS})를 넘습니다. .csv 또는 .parquet으로 저장하세요.")
+            values = df.astype(object).where(df.notna(), None)
+            if XLSXWRITER_AVAILABLE:
+                for row_number, row in enumerate(values.itertuples(index=False, name=None), self.rows_written + 1):
+                    self._sheet.write_row(row_number, 0, row)
+            else:
+                for row in values.itertuples(index=False, name=None):
+                    self._sheet.append(row)
+
+    def close(self):
+        """
+        파일을 마무리하고 결과 파일과 바꿔 넣습니다. 한 번도 쓰지 않았으면 빈 결과 파일을 만듭니다.
+        """
+        if self._columns is None:
+            self._open(pd.DataFrame())
+        self._close_files()
+        if self._temp_path is not None:
+            os.replace(self._temp_path, self.output_path)
+            self._temp_path = None
+
+    def _close_files(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if self._workbook is not None:
+            # 엑셀은 통합문서를 닫을 때 파일을 마무리하므로 이 시간도 쓰기 단계에 포함합니다.
+            with instrumentation.stage("write_close"):
+                if XLSXWRITER_AVAILABLE:
+                    self._workbook.close()
+                else:
+                    self._workbook.save(self._temp_path)
+            self._workbook = None
+
+    def abort(self):
+        """
+        파일을 닫고 쓰다 만 임시 파일만 지웁니다. 결과 파일은 건드리지 않습니다.
+        """
+        try:
+            self._close_files()
+        finally:
+            if self._temp_path is not None:
+                _remove_quietly(self._temp_path)
+                self._temp_path = None
+
+
+def parquet_result_schema(df):
+    """
+    결과 Parquet 파일의 스키마를 정합니다. 문자열(object/문자열 dtype) 컬럼은 값과 관계없이 string으로 고정하고,
+    숫자 컬럼(예: 매칭신뢰도)만 dtype에서 타입을 가져옵니다.
+    첫 청크가 비어 있거나 한 컬럼이 모두 결측값이어도 null 타입으로 굳지 않으므로 이후 청크를 그대로 쓸 수 있습니다.
+    """
+    fields = []
+    for field, dtype in zip(pa.Schema.from_pandas(df, preserve_index=False), df.dtypes):
+        if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype) or pa.types.is_null(field.type):
+            field = field.with_type(pa.string())
+        fields.append(field)
+    # pandas 메타데이터는 첫 청크의 dtype만 기록하므로 넣지 않습니다.
+    return pa.schema(fields)
+
+
+def save_result(df, output_path):
+    """
+    결과 데이터프레임을 output_path의 확장자에 맞는 형식으로 저장하고 저장한 행 수를 반환합니다.
+    """
+    with ResultWriter(output_path) as writer:
+        writer.write(df)
+    return writer.rows_written
+
+
+def resolve_output_file(name, default_extension=".xlsx"):
+    """
+    입력한 파일명에 지원하는 확장자(.xlsx/.csv/.parquet)가 없으면 기본 확장자를 붙입니다.
+    """
+    if os.path.splitext(name)[1].lower() in OUTPUT_FORMATS:
+        return name
+    return name + default_extension
+
+
+# 여러 국민연금 파일 병렬 일괄 처리
+BATCH_MAX_WORKERS = None  # None이면 CPU 코어 수만큼 프로세스를 사용
+BATCH_OUTPUT_EXTENSION = ".xlsx"
+_batch_worker_state = {}
+
+
+def _init_batch_worker(excellent_keys, pension_data_dir, pension_cache_dir, output_dir, output_extension,
+                       collect_report=False, csv_reader=PENSION_CSV_READER):
+    """
+    작업 프로세스마다 한 번 실행되어, 부모 프로세스에서 만든 키 테이블과 경로, CSV 읽기 방식을 넘겨받습니다.
+    collect_report가 True이면 파일마다 실행 보고서를 만들어 결과와 함께 돌려줍니다.
+    """
+    global PENSION_DATA_DIR, PENSION_CACHE_DIR, OUTPUT_DIR, PENSION_CSV_READER
+    PENSION_DATA_DIR = pension_data_dir
+    PENSION_CACHE_DIR = pension_cache_dir
+    OUTPUT_DIR = output_dir
+    PENSION_CSV_READER = csv_reader
+    _batch_worker_state["excellent_keys"] = excellent_keys
+    # 코드표는 작업 프로세스마다 한 번만 만들어 모든 파일/청크에 사용합니다.
+    _batch_worker_state["key_store"] = CompanyKeyStore.from_key_table(excellent_keys)
+    _batch_worker_state["output_extension"] = output_extension
+    _batch_worker_state["collect_report"] = collect_report
+
+
+def _filter_pension_file(file_name):
+    """
+    국민연금 파일 하나를 청크 단위로 읽으면서 강소기업만 추출해 바로 저장합니다. (작업 프로세스에서 실행)
+    """
+    excellent_keys = _batch_worker_state["excellent_keys"]
+    key_store = _batch_worker_state["key_store"]
+    output_name = f"filtered_{file_name}".split(".")[0] + _batch_worker_state["output_extension"]
+    report = instrumentation.start_report(file_name) if _batch_worker_state["collect_report"] else None
+
+    try:
+        with ResultWriter(os.path.join(OUTPUT_DIR, output_name)) as writer:
+            for chunk in iter_pension_chunks(file_name):
+                matched = match_pension_keys(excellent_keys, chunk, key_store=key_store)
+                writer.write(chunk.iloc[matched[ROW_POS_COL].to_numpy()])
+    finally:
+        if report is not None:
+            instrumentation.finish_report()
+
+    result = {"file": file_name, "output": output_name, "rows": writer.rows_written, "error": None}
+    if report is not None:
+        result["report"] = report.to_dict()
+    return result
+
+
+def run_parallel_batch(df_excellent, pension_files, max_workers=BATCH_MAX_WORKERS, company_index=None,
+                       output_extension=BATCH_OUTPUT_EXTENSION):
+    """
+    여러 국민연금 파일을 작업 프로세스에 나누어 처리합니다.
+    - 강소기업 키 테이블은 한 번만 만들어 모든 작업 프로세스에 공유합니다.
+    - 결과는 pension_files 순서대로 보고합니다.
+    - 한 파일이 실패해도 나머지 파일은 계속 처리하고, 실패 내용은 결과의 error에 남깁니다.
+    company_index를 넘기면 그 안의 키 테이블을 그대로 사용합니다.
+    output_extension(.xlsx/.csv/.parquet)으로 결과 파일 형식을 정합니다.
+    """
+    if output_extension not in OUTPUT_FORMATS:
+        raise ValueError(f"지원하지 않는 출력 형식입니다: {output_extension}")
+    if company_index is None:
+        company_index = build_company_index(df_excellent)
+    excellent_keys = company_index["excellent_keys"]
+
+    results = []
+    total_files = len(pension_files)
+    with concurrent_futures.ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_batch_worker,
+            initargs=(excellent_keys, PENSION_DATA_DIR, PENSION_CACHE_DIR, OUTPUT_DIR,
+                      output_extension, instrumentation.active_report() is not None,
+                      PENSION_CSV_READER)) as executor:
+        futures = [executor.submit(_filter_pension_file, file_name) for file_name in pension_files]
+
+        with ProgressReporter('일괄 처리 중', total_files, unit='파일') as progress:
+            for i, (file_name, future) in enumerate(zip(pension_files, futures)):
+                try:
+                    result = future.result()
+                    if "report" in result:
+                        instrumentation.active_report().add_child(file_name, result.pop("report"))
+                    progress.log(f"[{i + 1}/{total_files}] ✅ 저장 완료: {result['output']} ({result['rows']}개 기업)")
+                except Exception as e:
+                    result = {"file": file_name, "output": None, "rows": 0, "error": str(e)}
+                    progress.log(f"[{i + 1}/{total_files}] ❌ {file_name} 처리 실패: {str(e)}")
+                results.append(result)
+                progress.update(i + 1)
+
+    failed_count = sum(1 for result in results if result["error"])
+    print(f"✅ 일괄 처리 완료: 성공 {total_files - failed_count}개, 실패 {failed_count}개")
+    return results
+
+
+# 파이프라인 일괄 처리
+# 읽기(작업 스레드) → 매칭(호출한 스레드) → 저장(작업 스레드)을 크기가 정해진 큐로 잇습니다.
+# 현재 청크를 매칭하는 동안 다음 청크(다음 파일)를 미리 읽고, 매칭이 끝난 청크는 뒤에서 저장하므로
+# 전체 시간은 세 단계 시간의 합이 아니라 가장 느린 단계에 가까워집니다.
+# 큐가 가득 차면 앞 단계가 기다리므로 메모리에는 큐 크기만큼의 청크만 남습니다.
+PIPELINE_QUEUE_SIZE = 4  # 단계 사이 큐에 쌓아 둘 수 있는 최대 청크 수
+PIPELINE_POLL_INTERVAL = 0.1  # 중단 여부를 확인하는 간격(초)
+PIPELINE_STAGES = ("load", "match", "write")
+
+
+def _pipeline_put(target_queue, item, stop_event):
+    # 다음 단계가 밀려 있으면 자리가 날 때까지 기다리고, 중단되면 False를 반환합니다.
+    while not stop_event.is_set():
+        try:
+            target_queue.put(item, timeout=PIPELINE_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _pipeline_get(source_queue, stop_event):
+    # 앞 단계의 다음 항목을 기다리고, 중단되면 None(끝)을 반환합니다.
+    while not stop_event.is_set():
+        try:
+            return source_queue.get(timeout=PIPELINE_POLL_INTERVAL)
+        except queue.Empty:
+            pass
+    return None
+
+
+def _pipeline_load(pension_files, chunksize, output_queue, stop_event, busy_seconds):
+    """
+    파일 순서대로 청크를 읽어 ("chunk", 파일명, 청크)로 넘기고, 파일이 끝나면 ("done", 파일명, None),
+    읽기에 실패하면 ("error", 파일명, 오류 메시지)를 넘깁니다. 모든 파일을 보내면 None을 넘깁니다.
+    """
+    for file_name in pension_files:
+        try:
+            chunks = iter_pension_chunks(file_name, chunksize)
+            while True:
+                start = time.perf_counter()
+                chunk = next(chunks, None)
+                busy_seconds["load"] += time.perf_counter() - start
+                if chunk is None:
+                    break
+                if not _pipeline_put(output_queue, ("chunk", file_name, chunk), stop_event):
+                    return
+            item = ("done", file_name, None)
+        except Exception as e:
+            item = ("error", file_name, str(e))
+        if not _pipeline_put(output_queue, item, stop_event):
+            return
+    _pipeline_put(output_queue, None, stop_event)
+
+
+def _pipeline_match(excellent_keys, key_store, input_queue, output_queue, stop_event, busy_seconds):
+    """
+    청크마다 강소기업과 일치하는 행만 남겨 저장 단계로 넘깁니다.
+    매칭에 실패한 파일은 오류를 한 번만 넘기고 그 파일의 나머지 청크는 버립니다.
+    """
+    failed_files = set()
+    while True:
+        item = _pipeline_get(input_queue, stop_event)
+        if item is None:
+            break
+        kind, file_name, chunk = item
+        if file_name in failed_files:
+            continue
+        if kind == "chunk":
+            start = time.perf_counter()
+            try:
+                matched = match_pension_keys(excellent_keys, chunk, key_store=key_store)
+                item = ("chunk", file_name, chunk.iloc[matched[ROW_POS_COL].to_numpy()])
+            except Exception as e:
+                failed_files.add(file_name)
+                item = ("error", file_name, str(e))
+            busy_seconds["match"] += time.perf_counter() - start
+        if not _pipeline_put(output_queue, item, stop_event):
+            return
+    _pipeline_put(output_queue, None, stop_event)
+
+
+def _pipeline_write(input_queue, output_extension, total_files, results, stop_event, busy_seconds):
+    """
+    파일마다 ResultWriter를 열어 청크를 이어서 쓰고, 파일이 끝나거나 실패하면 결과를 results에 추가합니다.
+    실패한 파일의 쓰다 만 결과 파일은 지웁니다.
+    """
+    writer = None
+    failed_file = None
+    try:
+        with ProgressReporter('일괄 처리 중', total_files, unit='파일') as progress:
+            while True:
+                item = _pipeline_get(input_queue, stop_event)
+                if item is None:
+                    break
+                kind, file_name, payload = item
+                if file_name == failed_file:
+                    continue
+
+                output_name = f"filtered_{file_name}".split(".")[0] + output_extension
+                start = time.perf_counter()
+                try:
+                    if kind == "error":
+                        raise RuntimeError(payload)
+                    if writer is None:
+                        writer = ResultWriter(os.path.join(OUTPUT_DIR, output_name))
+                    if kind == "chunk":
+                        writer.write(payload)
+                        continue
+                    writer.close()
+                    result = {"file": file_name, "output": output_name, "rows": writer.rows_written, "error": None}
+                    progress.log(f"[{len(results) + 1}/{total_files}] ✅ 저장 완료: {output_name} ({writer.rows_written}개 기업)")
+                except Exception as e:
+                    if writer is not None:
+                        writer.abort()
+                    failed_file = file_name
+                    result = {"file": file_name, "output": None, "rows": 0, "error": str(e)}
+                    progress.log(f"[{len(results) + 1}/{total_files}] ❌ {file_name} 처리 실패: {str(e)}")
+                finally:
+                    busy_seconds["write"] += time.perf_counter() - start
+
+                writer = None
+                results.append(result)
+                progress.update(len(results))
+    finally:
+        # 저장 단계가 예기치 않게 끝나면 앞 단계가 큐에서 기다리며 멈추지 않도록 함께 중단합니다.
+        stop_event.set()
+
+
+def run_pipelined_batch(company_index, pension_files, output_extension=BATCH_OUTPUT_EXTENSION,
+                        chunksize=PENSION_CHUNK_SIZE, queue_size=PIPELINE_QUEUE_SIZE):
+    """
+    여러 국민연금 파일을 한 프로세스 안에서 읽기/매칭/저장 단계를 겹쳐 처리합니다.
+    - 단계 사이에는 queue_size 청크까지만 쌓이므로 파일 크기와 관계없이 메모리 사용량이 일정합니다.
+    - 결과는 pension_files 순서대로 보고하며, 한 파일이 실패해도 나머지 파일은 계속 처리합니다.
+    - 단계별 작업 시간(대기 시간 제외)과 전체 시간을 함께 출력합니다.
+    """
+    if output_extension not in OUTPUT_FORMATS:
+        raise ValueError(f"지원하지 않는 출력 형식입니다: {output_extension}")
+
+    load_queue = queue.Queue(maxsize=queue_size)
+    write_queue = queue.Queue(maxsize=queue_size)
+    stop_event = threading.Event()
+    busy_seconds = dict.fromkeys(PIPELINE_STAGES, 0.0)
+    results = []
+
+    start = time.perf_counter()
+    threads = [
+        threading.Thread(target=_pipeline_load, name="pipeline-load", daemon=True,
+                         args=(pension_files, chunksize, load_queue, stop_event, busy_seconds)),
+        threading.Thread(target=_pipeline_write, name="pipeline-write", daemon=True,
+                         args=(write_queue, output_extension, len(pension_files), results, stop_event, busy_seconds)),
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        _pipeline_match(company_index["excellent_keys"], company_index["key_store"], load_queue, write_queue,
+                        stop_event, busy_seconds)
+        threads[1].join()
+    finally:
+        # 정상 종료가 아니면(예: Ctrl+C) 다른 단계도 멈추게 합니다.
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+    wall_seconds = time.perf_counter() - start
+
+    for stage_name, seconds in busy_seconds.items():
+        instrumentation.count(f"pipeline_{stage_name}_seconds", round(seconds, 4))
+    print(f"⏱️ 단계별 작업 시간: 읽기 {busy_seconds['load']:.1f}초, 매칭 {busy_seconds['match']:.1f}초, "
+          f"저장 {busy_seconds['write']:.1f}초 / 전체 {wall_seconds:.1f}초")
+
+    failed_count = sum(1 for result in results if result["error"])
+    print(f"✅ 파이프라인 처리 완료: 성공 {len(results) - failed_count}개, 실패 {failed_count}개")
+    return results
+
+
+# 여러 국민연금 파일을 하나의 결과로 통합
+# 파일마다 강소기업 키별로 주소 유사도가 가장 높은 행을 고른 뒤, 강소기업마다 전체 스냅샷 중
+# 주소 유사도가 가장 높은 행 하나만 남깁니다.
+SNAPSHOT_COL = "스냅샷"
+COMBINED_OUTPUT_NAME = "combined_filtered"
+COMBINED_KEY_ORDER_COL = "_key_order"  # 키가 파일 안에서 처음 나온 행 번호 (파일별 후보를 합칠 때 키 순서)
+
+
+def _reduce_file_candidates(candidates):
+    # 키마다 주소 유사도가 가장 높은 행(동점이면 먼저 나온 행) 하나만 남기고, 키가 처음 나온 행 번호를 유지합니다.
+    first_order = candidates.groupby(MATCH_KEY_COLS, sort=False)[COMBINED_KEY_ORDER_COL].min().to_numpy()
+    best = candidates.loc[best_address_match_labels(candidates)]
+    return best.assign(**{COMBINED_KEY_ORDER_COL: first_order}).reset_index(drop=True)
+
+
+def _collect_pension_candidates(file_name, chunksize=PENSION_CHUNK_SIZE):
+    """
+    국민연금 파일 하나를 청크 단위로 읽으면서 강소기업 키마다 이 파일에서 주소 유사도가 가장 높은 행 하나를 골라
+    스냅샷, 매칭 키, 주소 유사도를 붙여 돌려줍니다. (작업 프로세스에서 실행)
+    청크마다 앞 청크까지의 후보와 합쳐 바로 줄이므로, 돌려주는 행 수는 파일 크기와 관계없이 키 수를 넘지 않습니다.
+    결과는 키가 파일에서 처음 나온 순서이므로, 파일 순서로 이어 붙인 뒤 다시 고르면 전체를 한 번에 고른 것과 같습니다.
+    """
+    excellent_keys = _batch_worker_state["excellent_keys"]
+    key_store = _batch_worker_state["key_store"]
+    snapshot = os.path.splitext(file_name)[0]
+    report = instrumentation.start_report(file_name) if _batch_worker_state["collect_report"] else None
+
+    candidates = None
+    try:
+        for chunk in iter_pension_chunks(file_name, chunksize):
+            scored = score_address_matches(match_pension_keys(excellent_keys, chunk, key_store=key_store), chunk)
+            positions = scored[ROW_POS_COL].to_numpy()
+            chunk_candidates = chunk.iloc[positions].assign(**{
+                SNAPSHOT_COL: snapshot,
+                NAME_KEY_COL: scored[NAME_KEY_COL].to_numpy(),
+                BIZNO_PREFIX_COL: scored[BIZNO_PREFIX_COL].to_numpy(),
+                ADDRESS_SCORE_COL: scored[ADDRESS_SCORE_COL].to_numpy(),
+                COMBINED_KEY_ORDER_COL: chunk.index[positions],
+            })
+            if candidates is not None:
+                chunk_candidates = pd.concat([candidates, chunk_candidates], ignore_index=True)
+            candidates = _reduce_file_candidates(chunk_candidates.reset_index(drop=True))
+    finally:
+        if report is not None:
+            instrumentation.finish_report()
+
+    if candidates is not None:
+        candidates = candidates.sort_values(COMBINED_KEY_ORDER_COL, kind="stable").drop(columns=COMBINED_KEY_ORDER_COL)
+    result = {"file": file_name, "candidates": candidates}
+    if report is not None:
+        result["report"] = report.to_dict()
+    return result
+
+
+def run_combined_batch(company_index, pension_files, output_path, max_workers=BATCH_MAX_WORKERS,
+                       chunksize=PENSION_CHUNK_SIZE):
+    """
+    여러 국민연금 파일을 작업 프로세스에서 함께 읽어 하나의 중복 없는 결과로 저장합니다.
+    - 각 행에는 어느 파일(스냅샷)에서 왔는지 SNAPSHOT_COL로 표시합니다.
+    - 강소기업마다 모든 스냅샷 중 주소 유사도가 가장 높은 행 하나를 고릅니다.
+      파일명 순서로 이어 붙인 데이터에 extract_excellent_companies_updated를 적용한 것과 같습니다.
+    - 작업 프로세스는 파일마다 키별 최선의 행만 돌려주므로 프로세스 사이에 오가는 데이터는 키 수에 비례합니다.
+    - 한 파일이 실패해도 나머지 파일로 결과를 만들고, 실패 내용은 files의 error에 남깁니다.
+    """
+    pension_files = sorted(pension_files)
+    excellent_keys = company_index["excellent_keys"]
+
+    results = []
+    candidate_frames = []
+    total_files = len(pension_files)
+    with concurrent_futures.ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_batch_worker,
+            initargs=(excellent_keys, PENSION_DATA_DIR, PENSION_CACHE_DIR, OUTPUT_DIR,
+                      BATCH_OUTPUT_EXTENSION, instrumentation.active_report() is not None,
+                      PENSION_CSV_READER)) as executor:
+        futures = [executor.submit(_collect_pension_candidates, file_name, chunksize) for file_name in pension_files]
+
+        with ProgressReporter('통합 처리 중', total_files, unit='파일') as progress:
+            for i, (file_name, future) in enumerate(zip(pension_files, futures)):
+                try:
+                    worker_result = future.result()
+                    if "report" in worker_result:
+                        instrumentation.active_report().add_child(file_name, worker_result.pop("report"))
+                    candidates = worker_result["candidates"]
+                    candidate_count = 0 if candidates is None else len(candidates)
+                    if candidates is not None:
+                        candidate_frames.append(candidates)
+                    result = {"file": file_name, "rows": candidate_count, "error": None}
+                    progress.log(f"[{i + 1}/{total_files}] ✅ {file_name}: 후보 {candidate_count}개")
+                except Exception as e:
+                    result = {"file": file_name, "rows": 0, "error": str(e)}
+                    progress.log(f"[{i + 1}/{total_files}] ❌ {file_name} 처리 실패: {str(e)}")
+                results.append(result)
+                progress.update(i + 1)
+
+    if not candidate_frames:
+        print("❌ 통합할 국민연금 데이터가 없습니다.")
+        return {"output": None, "rows": 0, "files": results}
+
+    candidates = pd.concat(candidate_frames, ignore_index=True)
+    df_combined = candidates.loc[best_address_match_labels(candidates)]
+    df_combined = df_combined.drop(columns=MATCH_KEY_COLS + [ADDRESS_SCORE_COL])
+    save_result(df_combined, output_path)
+
+    failed_count = sum(1 for result in results if result["error"])
+    print(f"✅ 통합 완료: {total_files - failed_count}개 파일의 후보 {len(candidates)}개에서 "
+          f"강소기업 {len(df_combined)}개를 골라 저장했습니다. (실패 {failed_count}개)")
+    return {"output": output_path, "rows": len(df_combined), "files": results}
+
+
+# 월별 증분 처리
+# 같은 계열(series)의 스냅샷마다 행 해시별 매칭 결과(일치한 강소기업 키의 위치, 없으면 -1)를 저장해 두고,
+# 다음 스냅샷에서는 이전과 같은 행의 결과를 그대로 가져와 새로 생기거나 바뀐 행만 정규화하고 매칭합니다.
+# 매칭 결과는 사업장명과 사업자등록번호로만 정해지므로 두 컬럼만 해시합니다.
+# 강소기업 키 테이블이 바뀌면 저장된 결과를 쓰지 않습니다.
+INCREMENTAL_STATE_DIR = os.path.join(DATA_DIR, "incremental_state")
+INCREMENTAL_STATE_SUFFIX = ".state.pkl"
+INCREMENTAL_STATE_VERSION = 2
+INCREMENTAL_SNAPSHOT_PATTERN = re.compile(r"[_\-.]?\d{6,8}$")  # 파일명 끝의 연월(일)
+INCREMENTAL_DEFAULT_SERIES = "pension"
+KEY_POS_COL = "_key_pos"
+
+
+def incremental_series_name(file_name):
+    """
+    스냅샷 파일명에서 끝의 연월(일)을 뺀 계열 이름을 돌려줍니다. 예: 'pension_202401.csv' → 'pension'
+    """
+    snapshot_name = os.path.splitext(os.path.basename(file_name))[0]
+    return INCREMENTAL_SNAPSHOT_PATTERN.sub("", snapshot_name) or INCREMENTAL_DEFAULT_SERIES
+
+
+def _incremental_state_path(series):
+    return os.path.join(INCREMENTAL_STATE_DIR, series + INCREMENTAL_STATE_SUFFIX)
+
+
+def compute_match_fingerprints(chunk):
+    """
+    국민연금 청크의 각 행에서 매칭에 쓰는 사업장명과 사업자등록번호만으로 64비트 해시를 계산합니다.
+    """
+    return pd.util.hash_pandas_object(chunk.iloc[:, [1, 2]], index=False).to_numpy()
+
+
+def company_keys_fingerprint(excellent_keys):
+    """
+    강소기업 키 테이블(키와 순서)의 해시입니다. 저장된 키 위치가 지금의 키 테이블과 맞는지 확인하는 데 씁니다.
+    """
+    key_hashes = pd.util.hash_pandas_object(excellent_keys[MATCH_KEY_COLS], index=False).to_numpy()
+    return hashlib.sha256(key_hashes.tobytes()).hexdigest()
+
+
+def load_incremental_state(series, keys_fingerprint):
+    """
+    계열의 마지막 스냅샷 상태를 불러옵니다. 없거나 강소기업 키 테이블이 달라졌으면 None입니다.
+    """
+    try:
+        with open(_incremental_state_path(series), "rb") as f:
+            state = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != INCREMENTAL_STATE_VERSION:
+        return None
+    if state["series"] != series or state["company_keys"] != keys_fingerprint:
+        return None
+    return state
+
+
+def save_incremental_state(series, snapshot, keys_fingerprint, row_hashes, key_positions):
+    # 같은 해시는 같은 매칭 결과이므로 한 번만 저장합니다.
+    row_hashes, unique_positions = np.unique(row_hashes, return_index=True)
+    state = {
+        "version": INCREMENTAL_STATE_VERSION,
+        "series": series,
+        "snapshot": snapshot,
+        "company_keys": keys_fingerprint,
+        "row_hashes": row_hashes,
+        "key_positions": key_positions[unique_positions],
+    }
+    os.makedirs(INCREMENTAL_STATE_DIR, exist_ok=True)
+    _write_pickle_atomic(_incremental_state_path(series), state)
+
+
+def match_chunk_incremental(excellent_keys, key_store, chunk, previous_hashes=None, previous_positions=None):
+    """
+    청크의 각 행이 일치하는 강소기업 키의 위치(없으면 -1)를 구합니다.
+    (행 해시, 키 위치, 재사용한 행 수)를 반환합니다.
+    - 이전 상태(previous_hashes, previous_positions)에 있는 행은 저장된 결과를 그대로 씁니다.
+    - 나머지 행만 회사명을 정규화해 강소기업 키와 매칭합니다.
+    excellent_keys에는 키 위치 컬럼(KEY_POS_COL)이 있어야 하며, key_store는 excellent_keys로 만든 코드표입니다.
+    """
+    row_hashes = compute_match_fingerprints(chunk)
+    key_positions = np.full(len(chunk), -1, dtype=np.int32)
+
+    known = np.zeros(len(chunk), dtype=bool)
+    if previous_hashes is not None and len(previous_hashes):
+        lookup = previous_hashes.get_indexer(row_hashes)
+        known = lookup >= 0
+        key_positions[known] = previous_positions[lookup[known]]
+
+    new_rows = np.flatnonzero(~known)
+    if len(new_rows):
+        matched = match_pension_keys(excellent_keys, chunk.iloc[new_rows], key_store=key_store)
+        key_positions[new_rows[matched[ROW_POS_COL].to_numpy()]] = matched[KEY_POS_COL].to_numpy()
+    return row_hashes, key_positions, int(known.sum())
+
+
+def filter_pension_incremental(file_name, company_index, dedupe=False, series=None, chunksize=PENSION_CHUNK_SIZE):
+    """
+    같은 계열의 이전 스냅샷 결과를 이어받아, 새로 생기거나 바뀐 행만 매칭하면서 강소기업을 추출합니다.
+    결과는 extract_excellent_companies_fast (dedupe=True이면 extract_excellent_companies_updated_fast)와 같습니다.
+    파일은 청크 단위로 읽으며, 일치한 행만 모아 두므로 메모리는 청크 하나와 결과 크기 정도로 유지됩니다.
+    series를 넘기지 않으면 파일명에서 정합니다. (incremental_series_name)
+    """
+    series = series or incremental_series_name(file_name)
+    excellent_keys = company_index["excellent_keys"]
+    keys_fingerprint = company_keys_fingerprint(excellent_keys)
+    match_keys = excellent_keys[MATCH_KEY_COLS].assign(**{KEY_POS_COL: np.arange(len(excellent_keys), dtype=np.int32)})
+    match_key_store = CompanyKeyStore.from_key_table(match_keys)
+
+    state = load_incremental_state(series, keys_fingerprint)
+    previous_hashes = previous_positions = None
+    if state is not None:
+        previous_hashes = pd.Index(state["row_hashes"])
+        previous_positions = state["key_positions"]
+
+    hash_parts, position_parts, candidate_chunks, candidate_positions = [], [], [], []
+    total_rows = reused_count = 0
+    for chunk in iter_pension_chunks(file_name, chunksize):
+        row_hashes, key_positions, reused = match_chunk_incremental(match_keys, match_key_store, chunk,
+                                                                    previous_hashes, previous_positions)
+        matched_rows = np.flatnonzero(key_positions >= 0)
+        candidate_chunks.append(chunk.iloc[matched_rows])
+        candidate_positions.append(key_positions[matched_rows])
+        hash_parts.append(row_hashes)
+        position_parts.append(key_positions)
+        total_rows += len(chunk)
+        reused_count += reused
+
+    if not candidate_chunks:
+        pension_file_path = os.path.join(PENSION_DATA_DIR, file_name)
+        df_filtered = pd.DataFrame(columns=read_pension_csv_header(pension_file_path), dtype=str)
+    else:
+        df_filtered = pd.concat(candidate_chunks)
+        if dedupe:
+            # 일치한 행만 모은 뒤 키마다 주소 유사도가 가장 높은 행을 고릅니다.
+            key_positions = np.concatenate(candidate_positions)
+            matched = excellent_keys.iloc[key_positions].reset_index(drop=True)
+            matched[ROW_POS_COL] = np.arange(len(key_positions))
+            df_filtered = df_filtered.iloc[select_best_address_matches(matched, df_filtered)]
+
+    snapshot = os.path.splitext(os.path.basename(file_name))[0]
+    save_incremental_state(series, snapshot, keys_fingerprint,
+                           np.concatenate(hash_parts) if hash_parts else np.empty(0, dtype=np.uint64),
+                           np.concatenate(position_parts) if position_parts else np.empty(0, dtype=np.int32))
+    instrumentation.count("incremental_reused_rows", reused_count)
+    previous_label = f"이전 스냅샷({state['snapshot']})" if state is not None else "이전 스냅샷"
+    print(f"♻️ {file_name}: {previous_label}과 같은 {reused_count}개 행은 결과를 이어받고 "
+          f"{total_rows - reused_count}개 행만 새로 매칭했습니다.")
+    return df_filtered
+
+
+def run_incremental_batch(company_index, pension_files, output_extension=BATCH_OUTPUT_EXTENSION, series=None):
+    """
+    국민연금 파일을 파일명 순서대로 증분 처리합니다. 각 파일은 같은 계열에서 바로 앞에 처리한 스냅샷의 결과를 이어받습니다.
+    series를 넘기면 모든 파일을 그 계열로 처리하고, 넘기지 않으면 파일명마다 계열을 정합니다.
+    한 파일이 실패해도 나머지 파일은 계속 처리합니다.
+    """
+    results = []
+    pension_files = sorted(pension_files)
+    total_files = len(pension_files)
+    for i, file_name in enumerate(pension_files):
+        output_name = f"filtered_{file_name}".split(".")[0] + output_extension
+        try:
+            df_filtered = filter_pension_incremental(file_name, company_index, series=series)
+            save_result(df_filtered, os.path.join(OUTPUT_DIR, output_name))
+            result = {"file": file_name, "output": output_name, "rows": len(df_filtered), "error": None}
+            print(f"[{i + 1}/{total_files}] ✅ 저장 완료: {output_name} ({len(df_filtered)}개 기업)")
+        except Exception as e:
+            result = {"file": file_name, "output": None, "rows": 0, "error": str(e)}
+            print(f"[{i + 1}/{total_files}] ❌ {file_name} 처리 실패: {str(e)}")
+        results.append(result)
+
+    failed_count = sum(1 for result in results if result["error"])
+    print(f"✅ 증분 처리 완료: 성공 {total_files - failed_count}개, 실패 {failed_count}개")
+    return results
+
+# 사업자등록번호 앞 6자리 기준 샤드 처리
+# 모든 매칭 키에 사업자등록번호 앞 6자리가 들어 있으므로, 앞 6자리의 해시로 국민연금 데이터와 강소기업 명단을
+# N개로 나누면 샤드마다 따로 처리한 결과를 합쳐도 한 번에 처리한 결과와 같습니다.
+# 샤드 파일은 공유 디렉토리에 두므로 샤드 처리는 다른 프로세스나 다른 컴퓨터에서 실행할 수 있습니다.
+SHARD_DIR = os.path.join(DATA_DIR, "shards")
+SHARD_COUNT = 4
+SHARD_VERSION = 2
+SHARD_MANIFEST_NAME = "manifest.json"
+SHARD_MODES = ("filter", "update-location")
+SHARD_KEY_ORDER_COL = "_key_order"  # 키가 원본 국민연금 파일에서 처음 나온 행 번호 (병합 순서)
+
+
+def bizno_shard_ids(prefixes, shard_count):
+    """
+    사업자등록번호 앞 6자리 컬럼의 샤드 번호 배열을 반환합니다.
+    파이썬 hash()와 달리 crc32는 실행마다 같으므로 어느 프로세스/컴퓨터에서 계산해도 같은 샤드가 나옵니다.
+    """
+    codes, uniques = pd.factorize(prefixes.str[:6])
+    shard_of_prefix = np.array([zlib.crc32(prefix.encode("utf-8")) % shard_count for prefix in uniques],
+                               dtype=np.int64)
+    return shard_of_prefix[codes]
+
+
+def _shard_file_name(kind, shard_id, mode=None):
+    return f"{kind}_{mode}_{shard_id:03d}.pkl" if mode else f"{kind}_{shard_id:03d}.pkl"
+
+
+def _shard_path(shard_dir, kind, shard_id, mode=None):
+    return os.path.join(shard_dir, _shard_file_name(kind, shard_id, mode))
+
+
+def shard_file_names(shard_count):
+    """
+    shard_count개로 나눈 분할이 만드는 모든 파일 이름(강소기업/국민연금 샤드와 작업별 결과)을 반환합니다.
+    """
+    names = []
+    for shard_id in range(shard_count):
+        names.append(_shard_file_name("company", shard_id))
+        names.append(_shard_file_name("pension", shard_id))
+        names.extend(_shard_file_name("result", shard_id, mode) for mode in SHARD_MODES)
+    return names
+
+
+def _write_shard_manifest(shard_dir, manifest):
+    manifest_path = os.path.join(shard_dir, SHARD_MANIFEST_NAME)
+    temp_path = _unique_temp_path(manifest_path)
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, manifest_path)
+
+
+def read_shard_manifest(shard_dir):
+    manifest_path = os.path.join(shard_dir, SHARD_MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"샤드 정보 파일이 없습니다. 먼저 분할하세요: {manifest_path}")
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != SHARD_VERSION:
+        raise ValueError(f"샤드 형식 버전이 다릅니다. 다시 분할하세요: {manifest_path}")
+    if not manifest.get("complete"):
+        raise ValueError(f"분할이 끝나지 않았습니다. 다시 분할하세요: {manifest_path}")
+    return manifest
+
+
+def _remove_previous_shards(shard_dir):
+    # 이전 분할의 정보 파일에 적힌 파일만 지웁니다. 정보 파일이 없는데 비어 있지 않은 폴더는
+    # 다른 용도의 폴더일 수 있으므로 아무것도 지우지 않고 오류를 냅니다.
+    manifest_path = os.path.join(shard_dir, SHARD_MANIFEST_NAME)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            previous = json.load(f)
+    except FileNotFoundError:
+        if os.listdir(shard_dir):
+            raise ValueError(f"샤드 정보 파일이 없는 비어 있지 않은 폴더에는 분할할 수 없습니다. "
+                             f"빈 폴더를 지정하세요: {shard_dir}")
+        return
+    except ValueError:
+        raise ValueError(f"샤드 정보 파일을 읽을 수 없습니다. 빈 폴더를 지정하세요: {manifest_path}")
+
+    if "files" in previous:
+        names = previous["files"]
+    else:
+        # 파일 목록이 없는 이전 형식은 샤드 수로 이름을 정합니다.
+        names = shard_file_names(int(previous.get("shard_count", 0)))
+    for name in names:
+        # 정보 파일에 다른 폴더의 경로가 적혀 있어도 이 폴더 밖의 파일은 지우지 않습니다.
+        if isinstance(name, str) and name == os.path.basename(name) and name != SHARD_MANIFEST_NAME:
+            _remove_quietly(os.path.join(shard_dir, name))
+    os.remove(manifest_path)
+
+
+def split_into_shards(company_file, pension_file, shard_count=SHARD_COUNT, shard_dir=SHARD_DIR,
+                      chunksize=PENSION_CHUNK_SIZE):
+    """
+    강소기업 명단과 국민연금 파일을 사업자등록번호 앞 6자리의 해시로 shard_count개로 나누어 shard_dir에 저장합니다.
+    - 강소기업 행은 필터링 키(앞 6자리, zfill 적용)와 소재지 키(zfill 미적용)의 샤드에 모두 들어갑니다.
+    - 국민연금 파일은 청크 단위로 읽어 바로 샤드 파일에 이어 쓰므로 메모리는 청크 하나 크기로 유지됩니다.
+      강소기업과 앞 6자리가 겹치지 않는 행은 어느 키와도 일치할 수 없으므로 저장하지 않습니다.
+    - 행 인덱스에는 원본 파일의 행 번호가 남아 병합할 때 원래 순서를 되살립니다.
+    - 샤드 정보(manifest.json)에는 분할이 만드는 파일 목록이 있으며, 다시 분할할 때는 그 파일만 지웁니다.
+      정보 파일이 없는 비어 있지 않은 폴더에는 분할하지 않습니다.
+    샤드 정보는 파일을 쓰기 전에 complete=False로 먼저 쓰고, 분할이 끝나면 complete=True로 바꿉니다.
+    """
+    if shard_count < 1:
+        raise ValueError("샤드 수는 1 이상이어야 합니다.")
+    os.makedirs(shard_dir, exist_ok=True)
+    _remove_previous_shards(shard_dir)
+    # 중간에 실패해도 다음 분할이 이 파일들을 지울 수 있도록 파일 목록을 먼저 남깁니다.
+    files = shard_file_names(shard_count)
+    _write_shard_manifest(shard_dir, {"version": SHARD_VERSION, "complete": False, "files": files})
+
+    df_excellent = load_company_index(company_file)["data"].reset_index(drop=True)
+    bizno = to_str_column(df_excellent["사업자등록번호"]).str.replace("-", "", regex=False)
+    filter_prefixes = bizno.str.zfill(10).str[:6]
+    location_prefixes = bizno.str[:6]
+    filter_shards = bizno_shard_ids(filter_prefixes, shard_count)
+    location_shards = bizno_shard_ids(location_prefixes, shard_count)
+    for shard_id in range(shard_count):
+        in_shard = (filter_shards == shard_id) | (location_shards == shard_id)
+        _write_pickle_atomic(_shard_path(shard_dir, "company", shard_id), df_excellent[in_shard])
+
+    candidate_prefixes = pd.concat([filter_prefixes, location_prefixes]).unique()
+    shard_rows = [0] * shard_count
+    total_rows = 0
+    pension_columns = None
+    shard_files = [open(_shard_path(shard_dir, "pension", shard_id), "wb") for shard_id in range(shard_count)]
+    try:
+        with ProgressReporter('✂️ 국민연금 데이터 나누는 중', unit='행') as progress:
+            for chunk in iter_pension_chunks(pension_file, chunksize):
+                total_rows += len(chunk)
+                pension_columns = [str(col) for col in chunk.columns]
+                pension_prefixes = to_str_column(chunk[chunk.columns[2]]).str.replace("-", "", regex=False).str[:6]
+                keep = pension_prefixes.isin(candidate_prefixes).to_numpy()
+                chunk_shards = bizno_shard_ids(pension_prefixes[keep], shard_count)
+                kept = chunk[keep]
+                for shard_id in np.unique(chunk_shards):
+                    # 샤드 파일마다 청크 조각을 pickle로 이어 붙입니다.
+                    part = kept[chunk_shards == shard_id]
+                    pickle.dump(part, shard_files[shard_id], protocol=pickle.HIGHEST_PROTOCOL)
+                    shard_rows[shard_id] += len(part)
+                progress.update(total_rows)
+    finally:
+        for f in shard_files:
+            f.close()
+
+    manifest = {
+        "version": SHARD_VERSION,
+        "complete": True,
+        "files": files,
+        "split_id": uuid.uuid4().hex,
+        "shard_count": shard_count,
+        "company_file": os.path.abspath(os.path.join(COMPANY_DATA_DIR, company_file)),
+        "pension_file": os.path.abspath(os.path.join(PENSION_DATA_DIR, pension_file)),
+        "company_rows": len(df_excellent),
+        "pension_rows": total_rows,
+        "pension_columns": pension_columns,
+        "shard_pension_rows": shard_rows,
+    }
+    _write_shard_manifest(shard_dir, manifest)
+    print(f"✅ 분할 완료: 국민연금 {total_rows}행 중 후보 {sum(shard_rows)}행을 {shard_count}개 샤드로 나눴습니다. ({shard_dir})")
+    return manifest
+
+
+def _read_pension_shard(shard_dir, shard_id, pension_columns):
+    parts = []
+    with open(_shard_path(shard_dir, "pension", shard_id), "rb") as f:
+        while True:
+            try:
+                parts.append(pickle.load(f))
+            except EOFError:
+                break
+    if not parts:
+        return pd.DataFrame(columns=pension_columns, dtype=str)
+    return pd.concat(parts)
+
+
+def process_shard(shard_dir, shard_id, mode="filter"):
+    """
+    샤드 하나를 처리해 결과를 shard_dir에 저장합니다. (다른 프로세스/컴퓨터에서 실행 가능)
+    - filter: extract_excellent_companies_updated_fast와 같은 규칙으로 강소기업마다 국민연금 행 하나를 고르고,
+      병합 순서를 위해 키가 처음 나온 원본 행 번호(SHARD_KEY_ORDER_COL)를 붙입니다.
+    - update-location: 소재지 키가 이 샤드에 속한 강소기업 행만 update_company_location_fast로 업데이트합니다.
+    """
+    if mode not in SHARD_MODES:
+        raise ValueError(f"지원하지 않는 샤드 작업입니다: {mode} (지원: {', '.join(SHARD_MODES)})")
+    manifest = read_shard_manifest(shard_dir)
+    if not 0 <= shard_id < manifest["shard_count"]:
+        raise ValueError(f"샤드 번호는 0 이상 {manifest['shard_count']} 미만이어야 합니다: {shard_id}")
+
+    with open(_shard_path(shard_dir, "company", shard_id), "rb") as f:
+        df_excellent = pickle.load(f)
+    df_pension = _read_pension_shard(shard_dir, shard_id, manifest["pension_columns"])
+
+    if mode == "filter":
+        excellent_keys = build_excellent_key_table(df_excellent, with_address=True)
+        scored = score_address_matches(match_pension_keys(excellent_keys, df_pension), df_pension)
+        positions = scored.loc[best_address_match_labels(scored), ROW_POS_COL].to_numpy()
+        # best_address_match_labels와 같은 키 순서(처음 등장한 순서)로 키마다 첫 행 위치를 구합니다.
+        first_positions = scored.groupby(MATCH_KEY_COLS, sort=False)[ROW_POS_COL].first().to_numpy()
+        result = df_pension.iloc[positions].assign(**{SHARD_KEY_ORDER_COL: df_pension.index[first_positions]})
+    else:
+        bizno = to_str_column(df_excellent["사업자등록번호"]).str.replace("-", "", regex=False)
+        owned = bizno_shard_ids(bizno.str[:6], manifest["shard_count"]) == shard_id
+        result = update_company_location_fast(df_excellent[owned].copy(), df_pension)
+
+    _write_pickle_atomic(_shard_path(shard_dir, "result", shard_id, mode),
+                        {"split_id": manifest["split_id"], "mode": mode, "data": result})
+    print(f"✅ 샤드 {shard_id} 처리 완료: {len(result)}행")
+    return {"shard": shard_id, "rows": len(result), "error": None}
+
+
+def merge_shards(shard_dir, output_path, mode="filter"):
+    """
+    모든 샤드 결과를 합쳐 한 번에 처리한 것과 같은 결과 파일로 저장합니다.
+    - filter: 키가 원본 파일에서 처음 나온 순서대로 (extract_excellent_companies_updated와 같은 순서)
+    - update-location: 강소기업 명단의 원래 행 순서대로
+    샤드 결과가 빠졌거나 다른 분할에서 나온 것이면 오류를 냅니다.
+    """
+    manifest = read_shard_manifest(shard_dir)
+    results = []
+    for shard_id in range(manifest["shard_count"]):
+        result_path = _shard_path(shard_dir, "result", shard_id, mode)
+        if not os.path.exists(result_path):
+            raise FileNotFoundError(f"샤드 {shard_id}의 결과가 없습니다: {result_path}")
+        with open(result_path, "rb") as f:
+            shard_result = pickle.load(f)
+        if shard_result["split_id"] != manifest["split_id"]:
+            raise ValueError(f"샤드 {shard_id}의 결과가 현재 분할과 맞지 않습니다. 다시 처리하세요: {result_path}")
+        results.append(shard_result["data"])
+
+    merged = pd.concat(results)
+    if mode == "filter":
+        merged = merged.sort_values(SHARD_KEY_ORDER_COL, kind="stable").drop(columns=SHARD_KEY_ORDER_COL)
+    else:
+        merged = merged.sort_index()
+        if len(merged) != manifest["company_rows"]:
+            raise ValueError(f"샤드 결과의 강소기업 수({len(merged)})가 원본({manifest['company_rows']})과 다릅니다.")
+
+    rows = save_result(merged, output_path)
+    print(f"✅ 병합 완료: {manifest['shard_count']}개 샤드를 합쳐 {rows}행을 저장했습니다. ({output_path})")
+    return {"output": output_path, "rows": rows}
+
+
+def _init_shard_worker(animations_enabled):
+    global ANIMATIONS_ENABLED
+    ANIMATIONS_ENABLED = animations_enabled
+
+
+def run_sharded(company_file, pension_file, output_path, mode="filter", shard_count=SHARD_COUNT,
+                shard_dir=SHARD_DIR, max_workers=BATCH_MAX_WORKERS, chunksize=PENSION_CHUNK_SIZE):
+    """
+    한 컴퓨터에서 분할 → 샤드별 처리(작업 프로세스) → 병합을 차례로 실행합니다.
+    한 샤드라도 실패하면 병합하지 않고 실패한 샤드 목록과 함께 오류를 냅니다.
+    """
+    split_into_shards(company_file, pension_file, shard_count, shard_dir, chunksize)
+
+    results = []
+    with concurrent_futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_init_shard_worker,
+                                                initargs=(ANIMATIONS_ENABLED,)) as executor:
+        futures = [executor.submit(process_shard, shard_dir, shard_id, mode) for shard_id in range(shard_count)]
+        for shard_id, future in enumerate(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"❌ 샤드 {shard_id} 처리 실패: {str(e)}")
+                results.append({"shard": shard_id, "rows": 0, "error": str(e)})
+
+    failed = [result["shard"] for result in results if result["error"]]
+    if failed:
+        raise RuntimeError(f"샤드 {', '.join(map(str, failed))} 처리에 실패해 병합하지 않았습니다.")
+    return merge_shards(shard_dir, output_path, mode)
+
+
 # 옵션 1: 국민연금 데이터에서 강소기업만 추출
 def run_filter_companies():
     print("강소기업 데이터가 경로 data/company_data/에 있는지 확인하세요.")
@@ -528,10 +2875,11 @@ def run_filter_companies():
 
     try:
         print(f"📝 강소기업 데이터를 불러오는 중...")
-        df_excellent = load_company_data(company_file)
+        company_index = load_company_index(company_file)
+        df_excellent = company_index["data"]
         print(f"✅ 강소기업 데이터 불러오기 완료: {len(df_excellent)}개 기업")
 
-        print("📌 하나의 파일만 처리하려면 1, 여러 개를 처리하려면 2를 입력하세요:")
+        print("📌 하나의 파일만 처리하려면 1, 여러 개를 처리하려면 2, 여러 개를 하나로 합치려면 3을 입력하세요:")
         mode = input().strip()
 
         if mode == "1":
@@ -539,17 +2887,19 @@ def run_filter_companies():
             pension_file = input().strip() + ".csv"
 
             print(f"📝 국민연금 데이터를 불러오는 중...")
-            df_pension = load_pension_data(pension_file)
-            print(f"✅ 국민연금 데이터 불러오기 완료: {len(df_pension)}개 항목")
+            df_pension = load_pension_candidates(pension_file, df_excellent,
+                                                 candidate_keys=company_index["candidate_keys"])
 
-            df_filtered = extract_excellent_companies_updated(df_excellent, df_pension)
+            df_filtered = extract_excellent_companies_updated_fast(df_excellent, df_pension,
+                                                                   excellent_keys=company_index["excellent_keys"],
+                                                                   key_store=company_index["key_store"])
 
-            print("💾 저장할 파일명을 입력하세요 (예: filtered_202401):")
-            output_file = input().strip() + ".xlsx"
+            print("💾 저장할 파일명을 입력하세요 (예: filtered_202401, .csv/.parquet을 붙이면 해당 형식으로 저장):")
+            output_file = resolve_output_file(input().strip())
 
 
             print(f"💾 결과를 저장하는 중...")
-            df_filtered.to_excel(os.path.join(OUTPUT_DIR, output_file), index=False)
+            save_result(df_filtered, os.path.join(OUTPUT_DIR, output_file))
             print(f"✅ 저장 완료: {output_file} ({len(df_filtered)}개 기업)")
 
         elif mode == "2":
@@ -559,18 +2909,17 @@ def run_filter_companies():
             print("📁 국민연금 데이터가 저장된 디렉토리에서 모든 파일을 처리합니다.")
             pension_files = [f for f in os.listdir(PENSION_DATA_DIR) if f.endswith(".csv")]
 
-            for i, file in enumerate(pension_files):
-                print(f"\n[{i + 1}/{len(pension_files)}] 📂 {file} 처리 중...")
+            run_parallel_batch(df_excellent, pension_files, company_index=company_index)
 
-                df_pension = load_pension_data(file)
-                print(f"✅ 국민연금 데이터 불러오기 완료: {len(df_pension)}개 항목")
+        elif mode == "3":
+            print("📁 국민연금 데이터가 저장된 디렉토리의 모든 파일을 하나의 결과로 합칩니다.")
+            pension_files = [f for f in os.listdir(PENSION_DATA_DIR) if f.endswith(".csv")]
 
-                df_filtered = extract_excellent_companies(df_excellent, df_pension)
+            print("💾 저장할 파일명을 입력하세요 (예: combined_filtered, .csv/.parquet을 붙이면 해당 형식으로 저장):")
+            output_file = resolve_output_file(input().strip())
 
-                output_name = f"filtered_{file}"
-                print(f"💾 결과를 저장하는 중: {output_name}")
-                df_filtered.to_excel(os.path.join(OUTPUT_DIR, output_name.split(".")[0] + ".xlsx"), index=False)
-                print(f"✅ 저장 완료: {output_name} ({len(df_filtered)}개 기업)")
+            gojo_domain_expansion()
+            run_combined_batch(company_index, pension_files, os.path.join(OUTPUT_DIR, output_file))
         else:
             print("❌ 잘못된 입력입니다.")
     except Exception as e:
@@ -586,24 +2935,31 @@ def run_update_location():
     try:
         print(f"📝 강소기업 데이터를 불러오는 중...")
 
-        df_excellent = load_company_data(company_file)
+        company_index = load_company_index(company_file)
+        df_excellent = company_index["data"]
         print(f"✅ 강소기업 데이터 불러오기 완료: {len(df_excellent)}개 기업")
 
         print("국민연금 데이터가 경로 data/pension_data/에 있는지 확인하세요.")
         print("📄 국민연금 csv 파일명을 입력하세요 (예: pension_202401):")
         pension_file = input().strip() + ".csv"
 
-        print(f"📝 국민연금 데이터를 불러오는 중...")
-        df_pension = load_pension_data(pension_file)
-        print(f"✅ 국민연금 데이터 불러오기 완료: {len(df_pension)}개 항목")
+        store_path = find_pension_store(pension_file)
+        if store_path is not None:
+            # 조회 저장소가 있으면 CSV를 다시 읽지 않고 색인으로 찾습니다.
+            print(f"🗂️ 국민연금 조회 저장소를 사용합니다: {store_path}")
+            updated_df = update_company_location_from_store(df_excellent, store_path)
+        else:
+            print(f"📝 국민연금 데이터를 불러오는 중...")
+            df_pension = load_pension_candidates(pension_file, df_excellent, project=True,
+                                                 candidate_keys=company_index["candidate_keys"])
 
-        updated_df = update_company_location(df_excellent, df_pension)
+            updated_df = update_company_location_fast(df_excellent, df_pension)
 
-        print("💾 저장할 파일명을 입력하세요 (예: updated_gangso):")
-        output_file = input().strip() + ".xlsx"
+        print("💾 저장할 파일명을 입력하세요 (예: updated_gangso, .csv/.parquet을 붙이면 해당 형식으로 저장):")
+        output_file = resolve_output_file(input().strip())
 
         print(f"💾 결과를 저장하는 중...")
-        updated_df.to_excel(os.path.join(OUTPUT_DIR, output_file), index=False)
+        save_result(updated_df, os.path.join(OUTPUT_DIR, output_file))
         print(f"✅ 저장 완료: {output_file} ({len(updated_df)}개 기업)")
     except Exception as e:
         print(f"❌ 오류 발생: {str(e)}")
@@ -637,5 +2993,322 @@ def main():
             print("❌ 잘못된 선택입니다. 다시 입력해주세요.")
 
 
+# 명령줄(비대화형) 실행
+class CliArgumentError(ValueError):
+    """
+    argparse가 확인할 수 없는 인자 조합 오류입니다. run_cli는 argparse 오류와 같이 종료 코드 2를 반환합니다.
+    """
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog="company_filter.py",
+        description="국민연금 & 강소기업 데이터 처리 프로그램 (인자 없이 실행하면 대화형 메뉴)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    base = argparse.ArgumentParser(add_help=False)
+    base.add_argument("--quiet", action="store_true", help="애니메이션과 대기 시간을 건너뜁니다")
+    base.add_argument("--chunksize", type=int, default=PENSION_CHUNK_SIZE,
+                      help=f"국민연금 CSV를 한 번에 읽는 행 수 (기본값: {PENSION_CHUNK_SIZE})")
+    base.add_argument("--csv-reader", choices=PENSION_CSV_READERS, default=PENSION_CSV_READER,
+                      help="국민연금 CSV 읽기 방식 (기본값: pandas, auto이면 pyarrow가 있을 때 arrow)")
+    base.add_argument("--report", action="store_true",
+                      help="단계별 소요 시간/행 수/메모리를 <결과 파일>.report.json으로 저장합니다")
+    base.add_argument("--profile", choices=instrumentation.PROFILERS,
+                      help="프로파일러를 켜고 결과를 결과 파일 옆에 저장합니다")
+    base.add_argument("--cache-dir",
+                      help="Parquet 캐시/조회 저장소/증분 상태/샤드를 둘 디렉토리 "
+                           f"(기본값: 국민연금 입력 옆의 {CLI_CACHE_DIR_NAME} 폴더)")
+
+    common = argparse.ArgumentParser(add_help=False, parents=[base])
+    common.add_argument("--company", required=True, help="강소기업 엑셀 파일 경로")
+
+    filter_parser = subparsers.add_parser("filter", parents=[common],
+                                          help="국민연금 파일 하나에서 강소기업만 추출")
+    filter_parser.add_argument("--pension", required=True, help="국민연금 CSV 파일 경로")
+    filter_parser.add_argument("--output", required=True, help="결과 파일 경로 (.xlsx/.csv/.parquet)")
+    filter_parser.add_argument("--all-matches", action="store_true",
+                               help="주소 유사도로 중복을 제거하지 않고 일치하는 행을 모두 저장합니다")
+    filter_parser.add_argument("--fuzzy", action="store_true",
+                               help="사업자등록번호 앞 6자리가 같은 행 중 회사명이 비슷한 행도 매칭하고 신뢰도 컬럼을 붙입니다")
+    filter_parser.add_argument("--fuzzy-threshold", type=float, default=FUZZY_MATCH_THRESHOLD,
+                               help=f"{FUZZY_SHORT_NAME_LENGTH + 1}자 이상 회사명을 유사 회사명으로 인정할 최소 유사도 "
+                                    f"(기본값: {FUZZY_MATCH_THRESHOLD}, 짧은 회사명은 한 글자 차이까지 인정)")
+
+    batch_parser = subparsers.add_parser("batch-filter", parents=[common],
+                                         help="디렉토리의 모든 국민연금 CSV에서 강소기업만 추출")
+    batch_parser.add_argument("--pension-dir", default=PENSION_DATA_DIR, help="국민연금 CSV 디렉토리")
+    batch_parser.add_argument("--output-dir", default=OUTPUT_DIR, help="결과 파일을 저장할 디렉토리")
+    batch_parser.add_argument("--workers", type=int, default=BATCH_MAX_WORKERS,
+                              help="작업 프로세스 수 (기본값: CPU 코어 수)")
+    batch_parser.add_argument("--format", choices=[extension[1:] for extension in OUTPUT_FORMATS],
+                              default="xlsx", help="결과 파일 형식 (기본값: xlsx)")
+    batch_mode = batch_parser.add_mutually_exclusive_group()
+    batch_mode.add_argument("--incremental", action="store_true",
+                            help="이전 스냅샷과 비교해 바뀐 행만 새로 처리합니다 (파일명 순서로 처리)")
+    batch_mode.add_argument("--pipeline", action="store_true",
+                            help="한 프로세스에서 읽기/매칭/저장을 겹쳐 처리합니다 (작업 프로세스를 쓰지 않음)")
+    batch_mode.add_argument("--combine", action="store_true",
+                            help="모든 파일을 하나의 결과로 합치고 강소기업마다 가장 잘 맞는 행 하나만 남깁니다")
+    batch_parser.add_argument("--series", help="--incremental 상태를 나누는 계열 이름 "
+                                               "(기본값: 파일명에서 끝의 연월을 뺀 이름, 예: pension_202401 → pension)")
+    batch_parser.add_argument("--output", help="--combine 결과 파일 경로 "
+                                               f"(기본값: <output-dir>/{COMBINED_OUTPUT_NAME}.<format>)")
+
+    location_parser = subparsers.add_parser("update-location", parents=[common],
+                                            help="국민연금 데이터의 소재지 정보를 강소기업 엑셀에 복사")
+    location_parser.add_argument("--pension", required=True, help="국민연금 CSV 파일 경로")
+    location_parser.add_argument("--output", required=True, help="결과 파일 경로 (.xlsx/.csv/.parquet)")
+    location_parser.add_argument("--use-store", action="store_true",
+                                 help="국민연금 조회 저장소에서 찾습니다 (없거나 오래되었으면 먼저 만듦)")
+
+    ingest_parser = subparsers.add_parser("store-ingest", parents=[base],
+                                          help="국민연금 CSV로 조회 저장소(SQLite)를 만듭니다")
+    ingest_parser.add_argument("--pension", required=True, help="국민연금 CSV 파일 경로")
+
+    lookup_parser = subparsers.add_parser("store-lookup", parents=[base],
+                                          help="조회 저장소에서 사업자등록번호/회사명으로 우편번호, 주소, 업종을 찾습니다")
+    lookup_source = lookup_parser.add_mutually_exclusive_group(required=True)
+    lookup_source.add_argument("--pension", help="국민연금 CSV 파일 경로 (이 파일로 만든 저장소를 사용)")
+    lookup_source.add_argument("--store", help="조회 저장소(.sqlite) 경로")
+    lookup_parser.add_argument("--bizno", action="append", default=[],
+                               help="사업자등록번호 (여러 번 지정 가능, 앞 6자리로 비교)")
+    lookup_parser.add_argument("--name", action="append", default=[],
+                               help="회사명 (여러 번 지정 가능, --bizno와 함께 쓰면 순서대로 짝지음)")
+    lookup_parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력합니다")
+
+    shard_parser = subparsers.add_parser("shard", parents=[base],
+                                         help="사업자등록번호 앞 6자리로 나눈 샤드 단위 처리 (여러 프로세스/컴퓨터)")
+    shard_parser.add_argument("--mode", choices=SHARD_MODES, default="filter",
+                              help="filter: 강소기업 추출(주소 유사도로 중복 제거), update-location: 소재지 복사")
+    shard_parser.add_argument("--step", choices=("all", "split", "run", "merge"), default="all",
+                              help="all: 이 컴퓨터에서 분할/처리/병합, split/run/merge: 해당 단계만 실행 (기본값: all)")
+    shard_parser.add_argument("--shard-dir", help="샤드 파일을 둘 (공유) 디렉토리 "
+                                                  "(split/run/merge에는 필수, all의 기본값: <cache-dir>/shards)")
+    shard_parser.add_argument("--shards", type=int, default=SHARD_COUNT,
+                              help=f"샤드 수 (split/all, 기본값: {SHARD_COUNT})")
+    shard_parser.add_argument("--shard-id", type=int, help="처리할 샤드 번호 (run)")
+    shard_parser.add_argument("--company", help="강소기업 엑셀 파일 경로 (split/all)")
+    shard_parser.add_argument("--pension", help="국민연금 CSV 파일 경로 (split/all)")
+    shard_parser.add_argument("--output", help="결과 파일 경로 (merge/all)")
+    shard_parser.add_argument("--workers", type=int, default=BATCH_MAX_WORKERS,
+                              help="샤드를 처리할 작업 프로세스 수 (all, 기본값: CPU 코어 수)")
+
+    return parser
+
+
+def _configure_cache_dirs(args):
+    """
+    명령줄 실행의 캐시 폴더(Parquet 캐시, 조회 저장소, 증분 상태, 샤드)를 정합니다.
+    --cache-dir가 없으면 국민연금 입력 파일(또는 폴더) 옆의 CLI_CACHE_DIR_NAME 폴더를 사용하므로,
+    입력과 출력 경로를 지정한 실행은 프로그램 폴더 아래 data/에 파일을 만들지 않습니다.
+    """
+    global PENSION_CACHE_DIR, PENSION_STORE_DIR, INCREMENTAL_STATE_DIR
+    cache_dir = args.cache_dir
+    if cache_dir is None:
+        pension_input = getattr(args, "pension_dir", None) or getattr(args, "pension", None)
+        if pension_input is None:
+            return
+        pension_input = os.path.abspath(pension_input)
+        input_dir = pension_input if os.path.isdir(pension_input) else os.path.dirname(pension_input)
+        cache_dir = os.path.join(input_dir, CLI_CACHE_DIR_NAME)
+
+    cache_dir = os.path.abspath(cache_dir)
+    PENSION_CACHE_DIR = os.path.join(cache_dir, "pension_cache")
+    PENSION_STORE_DIR = os.path.join(cache_dir, "pension_store")
+    INCREMENTAL_STATE_DIR = os.path.join(cache_dir, "incremental_state")
+    if args.command == "shard" and args.step == "all" and args.shard_dir is None:
+        args.shard_dir = os.path.join(cache_dir, "shards")
+
+
+def _prepare_output_path(output_path):
+    output_path = os.path.abspath(output_path)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    return output_path
+
+
+def _cli_filter(args):
+    company_index = load_company_index(os.path.abspath(args.company))
+    df_excellent = company_index["data"]
+    df_pension = load_pension_candidates(os.path.abspath(args.pension), df_excellent, args.chunksize,
+                                         candidate_keys=company_index["candidate_keys"], prefix_only=args.fuzzy)
+
+    extract = extract_excellent_companies_fast if args.all_matches else extract_excellent_companies_updated_fast
+    df_filtered = extract(df_excellent, df_pension, excellent_keys=company_index["excellent_keys"],
+                          fuzzy=args.fuzzy, fuzzy_threshold=args.fuzzy_threshold, key_store=company_index["key_store"])
+
+    output_path = _prepare_output_path(args.output)
+    save_result(df_filtered, output_path)
+    print(f"✅ 저장 완료: {output_path} ({len(df_filtered)}개 기업)")
+    return 0
+
+
+def _cli_batch_filter(args):
+    global PENSION_DATA_DIR, OUTPUT_DIR
+    PENSION_DATA_DIR = os.path.abspath(args.pension_dir)
+    OUTPUT_DIR = os.path.abspath(args.output_dir)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    company_index = load_company_index(os.path.abspath(args.company))
+    pension_files = sorted(f for f in os.listdir(PENSION_DATA_DIR) if f.endswith(".csv"))
+    if not pension_files:
+        print(f"❌ 처리할 국민연금 CSV 파일이 없습니다: {PENSION_DATA_DIR}")
+        return 1
+
+    gojo_domain_expansion()
+    if args.combine:
+        output_path = _prepare_output_path(
+            args.output or os.path.join(OUTPUT_DIR, COMBINED_OUTPUT_NAME + "." + args.format))
+        results = run_combined_batch(company_index, pension_files, output_path, args.workers, args.chunksize)["files"]
+    elif args.incremental:
+        results = run_incremental_batch(company_index, pension_files, output_extension="." + args.format,
+                                        series=args.series)
+    elif args.pipeline:
+        results = run_pipelined_batch(company_index, pension_files, output_extension="." + args.format,
+                                      chunksize=args.chunksize)
+    else:
+        results = run_parallel_batch(company_index["data"], pension_files, args.workers,
+                                     company_index=company_index, output_extension="." + args.format)
+    return 1 if any(result["error"] for result in results) else 0
+
+
+def _cli_update_location(args):
+    company_index = load_company_index(os.path.abspath(args.company))
+    df_excellent = company_index["data"]
+    pension_file = os.path.abspath(args.pension)
+    if args.use_store:
+        store_path = find_pension_store(pension_file) or ingest_pension_store(pension_file, args.chunksize)
+        updated_df = update_company_location_from_store(df_excellent, store_path)
+    else:
+        df_pension = load_pension_candidates(pension_file, df_excellent, args.chunksize,
+                                             project=True, candidate_keys=company_index["candidate_keys"])
+        updated_df = update_company_location_fast(df_excellent, df_pension)
+
+    output_path = _prepare_output_path(args.output)
+    save_result(updated_df, output_path)
+    print(f"✅ 저장 완료: {output_path} ({len(updated_df)}개 기업)")
+    return 0
+
+
+def _cli_store_ingest(args):
+    ingest_pension_store(os.path.abspath(args.pension), args.chunksize)
+    return 0
+
+
+def _cli_store_lookup(args):
+    if args.bizno and args.name and len(args.bizno) != len(args.name):
+        raise CliArgumentError("--bizno와 --name을 함께 쓰면 개수가 같아야 합니다.")
+    if not args.bizno and not args.name:
+        raise CliArgumentError("--bizno 또는 --name을 하나 이상 지정하세요.")
+    if args.bizno and args.name:
+        keys = list(zip(args.bizno, args.name))
+    else:
+        keys = [(bizno, None) for bizno in args.bizno] + [(None, name) for name in args.name]
+
+    if args.store:
+        store_path = os.path.abspath(args.store)
+        if not os.path.exists(store_path):
+            raise FileNotFoundError(f"조회 저장소가 없습니다: {store_path}")
+    else:
+        store_path = find_pension_store(os.path.abspath(args.pension))
+        if store_path is None:
+            raise FileNotFoundError("이 국민연금 파일의 조회 저장소가 없거나 오래되었습니다. 먼저 store-ingest를 실행하세요.")
+
+    start = time.perf_counter()
+    results = lookup_pension_store(store_path, keys)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return 0
+    for result in results:
+        label = " ".join(str(value) for value in (result["bizno"], result["company_name"]) if value is not None)
+        print(f"🔎 {label}: {len(result['matches'])}건")
+        for match in result["matches"]:
+            print(f"   [행 {match['row_id']}] {match['company_name']} | {match['bizno']} | 우편번호 {match['zip_code']} | "
+                  f"주소 {match['address']} | 업종 {match['biz_detail']}")
+    print(f"⏱️ 조회 시간: {elapsed_ms:.1f}ms ({len(keys)}건)")
+    return 0
+
+
+def _cli_shard(args):
+    required = {"split": ["company", "pension", "shard_dir"], "run": ["shard_id", "shard_dir"],
+                "merge": ["output", "shard_dir"], "all": ["company", "pension", "output", "shard_dir"]}[args.step]
+    missing = ["--" + name.replace("_", "-") for name in required if getattr(args, name) is None]
+    if missing:
+        raise CliArgumentError(f"--step {args.step}에는 {', '.join(missing)} 인자가 필요합니다.")
+
+    shard_dir = os.path.abspath(args.shard_dir)
+    if args.step == "split":
+        split_into_shards(os.path.abspath(args.company), os.path.abspath(args.pension), args.shards,
+                          shard_dir, args.chunksize)
+    elif args.step == "run":
+        process_shard(shard_dir, args.shard_id, args.mode)
+    elif args.step == "merge":
+        merge_shards(shard_dir, _prepare_output_path(args.output), args.mode)
+    else:
+        run_sharded(os.path.abspath(args.company), os.path.abspath(args.pension), _prepare_output_path(args.output),
+                    args.mode, args.shards, shard_dir, args.workers, args.chunksize)
+    return 0
+
+
+def _report_base_path(args):
+    # 보고서와 프로파일은 결과 파일 옆에, 일괄 처리는 결과 디렉토리 안에 저장합니다.
+    if args.command == "batch-filter":
+        return os.path.join(os.path.abspath(args.output_dir), "batch_filter")
+    if args.command == "shard" and args.output is None:
+        return os.path.join(os.path.abspath(args.shard_dir or "."), f"shard_{args.step}")
+    if args.command in ("store-ingest", "store-lookup"):
+        return os.path.abspath(getattr(args, "store", None) or pension_store_path(args.pension))
+    return os.path.abspath(args.output)
+
+
+CLI_COMMANDS = {
+    "filter": _cli_filter,
+    "batch-filter": _cli_batch_filter,
+    "update-location": _cli_update_location,
+    "shard": _cli_shard,
+    "store-ingest": _cli_store_ingest,
+    "store-lookup": _cli_store_lookup,
+}
+
+
+def run_cli(argv=None):
+    """
+    명령줄 인자로 작업을 실행하고 종료 코드를 반환합니다. (0: 성공, 1: 실패, 2: 잘못된 인자)
+    """
+    global ANIMATIONS_ENABLED, PENSION_CSV_READER
+    args = build_arg_parser().parse_args(argv)
+    if args.quiet:
+        ANIMATIONS_ENABLED = False
+    PENSION_CSV_READER = args.csv_reader
+    _configure_cache_dirs(args)
+
+    report_base = _report_base_path(args)
+    if args.report:
+        instrumentation.start_report(args.command)
+
+    try:
+        with instrumentation.profiling(args.profile, report_base):
+            status = CLI_COMMANDS[args.command](args)
+    except CliArgumentError as e:
+        print(f"❌ 잘못된 인자: {str(e)}", file=sys.stderr)
+        status = 2
+    except Exception as e:
+        print(f"❌ 오류 발생: {str(e)}", file=sys.stderr)
+        status = 1
+
+    if args.report:
+        report_path = report_base + ".report.json"
+        try:
+            instrumentation.finish_report().write_json(report_path, status=status)
+            print(f"📊 실행 보고서 저장: {report_path}")
+        except OSError as e:
+            print(f"⚠️ 실행 보고서를 저장하지 못했습니다: {str(e)}", file=sys.stderr)
+    return status
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_cli())
     main()
\ No newline at end of file
@@ -0,0 +1,328 @@
+"""
+강소기업 필터 로컬 HTTP 서비스
+
+강소기업 명단을 시작할 때 한 번만 읽어 인덱스를 메모리에 두고, 국민연금 CSV를 받아
+강소기업 추출 또는 소재지 업데이트 결과 파일을 돌려줍니다.
+- GET  /health                                  : 상태, 작업 수, 대기열 정보
+- POST /filter?file=pension_202401.csv&format=csv  : 국민연금 데이터 폴더의 파일로 강소기업 추출
+- POST /filter?format=xlsx (본문에 CP949 CSV)       : 업로드한 CSV로 강소기업 추출
+  (all_matches=1이면 주소 유사도로 중복을 제거하지 않음)
+- POST /update-location?file=...&format=xlsx      : 소재지 정보를 복사한 강소기업 명단
+- POST /reload                                  : 강소기업 파일이 바뀌었으면 인덱스를 다시 읽음
+동시에 처리하는 요청은 작업 스레드 수(--workers)까지, 그 외에는 대기열(--queue-size)까지 기다리며
+대기열이 가득 차면 503으로 바로 거절하므로 동시 요청이 많아도 처리량과 메모리가 예측 가능합니다.
+자리는 업로드 본문을 받기 전에 잡으므로, 거절된 요청은 본문을 디스크에 쓰지 않습니다.
+
+사용 예:
+    python filter_service.py --company data/company_data/강소기업_명단.xlsx
+    curl -X POST "http://127.0.0.1:8765/filter?file=pension_202401.csv&format=csv" -o filtered.csv
+    curl -X POST --data-binary @pension_202401.csv "http://127.0.0.1:8765/filter?format=xlsx" -o filtered.xlsx
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import company_filter as cf
+
+SERVICE_HOST = "127.0.0.1"  # 로컬에서만 접속
+SERVICE_PORT = 8765
+SERVICE_WORKERS = 2  # 동시에 처리하는 요청 수
+SERVICE_QUEUE_SIZE = 8  # 처리를 기다릴 수 있는 요청 수
+MAX_UPLOAD_BYTES = 2 * 1024 ** 3
+STREAM_BLOCK_SIZE = 1024 * 1024
+CONTENT_TYPES = {
+    ".csv": "text/csv; charset=utf-8",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".parquet": "application/vnd.apache.parquet",
+}
+
+
+class ServiceError(Exception):
+    """
+    HTTP 상태 코드와 함께 요청자에게 돌려줄 오류입니다.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class FilterService:
+    """
+    강소기업 인덱스와 작업 스레드 풀을 가진 서비스 상태입니다.
+    작업 중인 요청과 대기 중인 요청(업로드를 받는 중인 요청 포함)을 합쳐 workers + queue_size개까지만 받습니다.
+    """
+
+    def __init__(self, company_file, workers=SERVICE_WORKERS, queue_size=SERVICE_QUEUE_SIZE):
+        self.company_file = os.path.abspath(company_file)
+        self.company_index = cf.load_company_index(self.company_file)
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="filter-worker")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._path_locks = {}
+        self._stats = {"accepted": 0, "rejected": 0, "completed": 0, "failed": 0, "in_flight": 0}
+
+    def reload(self):
+        # load_company_index는 파일이 바뀌지 않았으면 캐시를 바로 돌려줍니다.
+        company_index = cf.load_company_index(self.company_file)
+        self.company_index = company_index
+        return len(company_index["data"])
+
+    @contextlib.contextmanager
+    def reserve(self):
+        """
+        요청 하나의 자리를 잡고 작업이 끝날 때까지 유지합니다. 자리가 없으면 기다리지 않고 바로 503 오류를 냅니다.
+        """
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            raise ServiceError(HTTPStatus.SERVICE_UNAVAILABLE, "처리 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요.")
+        self._count("accepted")
+        self._count("in_flight")
+        try:
+            yield
+        finally:
+            self._count("in_flight", -1)
+            self._slots.release()
+
+    def submit(self, job, *args):
+        """
+        작업을 스레드 풀에 넣고 끝날 때까지 기다립니다. reserve()로 자리를 잡은 요청에서만 호출합니다.
+        """
+        try:
+            result = self._executor.submit(job, *args).result()
+            self._count("completed")
+            return result
+        except Exception:
+            self._count("failed")
+            raise
+
+    def _path_lock(self, path):
+        with self._lock:
+            return self._path_locks.setdefault(path, threading.Lock())
+
+    def ensure_pension_cache(self, pension_path):
+        """
+        국민연금 파일의 컬럼형 캐시를 준비합니다. 같은 파일을 요청한 다른 작업이 캐시를 만드는 중이면
+        끝날 때까지 기다렸다가 만들어진 캐시를 사용합니다.
+        """
+        if not (cf.PENSION_CACHE_ENABLED and cf.PYARROW_AVAILABLE):
+            return
+        with self._path_lock(pension_path):
+            if cf.find_pension_cache(pension_path) is None:
+                cf.ingest_pension_csv(pension_path)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def status(self):
+        with self._lock:
+            stats = dict(self._stats)
+        return {
+            "status": "ok",
+            "company_file": self.company_file,
+            "companies": len(self.company_index["data"]),
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            **stats,
+        }
+
+    def filter_pension(self, pension_path, output_path, use_cache, all_matches=False):
+        company_index = self.company_index
+        df_excellent = company_index["data"]
+        if use_cache:
+            self.ensure_pension_cache(pension_path)
+        df_pension = cf.load_pension_candidates(pension_path, df_excellent, candidate_keys=company_index["candidate_keys"],
+                                                use_cache=use_cache)
+        extract = cf.extract_excellent_companies_fast if all_matches else cf.extract_excellent_companies_updated_fast
+        df_filtered = extract(df_excellent, df_pension, excellent_keys=company_index["excellent_keys"],
+                              key_store=company_index["key_store"])
+        return cf.save_result(df_filtered, output_path)
+
+    def update_location(self, pension_path, output_path, use_cache):
+        company_index = self.company_index
+        # 소재지 업데이트는 데이터프레임을 직접 고치므로 공유 인덱스의 복사본을 사용합니다.
+        df_excellent = company_index["data"].copy()
+        if use_cache:
+            self.ensure_pension_cache(pension_path)
+        df_pension = cf.load_pension_candidates(pension_path, df_excellent, project=True,
+                                                candidate_keys=company_index["candidate_keys"], use_cache=use_cache)
+        updated_df = cf.update_company_location_fast(df_excellent, df_pension)
+        return cf.save_result(updated_df, output_path)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+class FilterRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "CompanyFilterService/1.0"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def do_GET(self):
+        self._response_started = False
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(HTTPStatus.OK, self.service.status())
+        else:
+            self._send_error(ServiceError(HTTPStatus.NOT_FOUND, f"알 수 없는 경로입니다: {path}"))
+
+    def do_POST(self):
+        self._response_started = False
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            if url.path == "/filter":
+                all_matches = query.get("all_matches") in ("1", "true")
+                self._run_job(lambda *args: self.service.filter_pension(*args, all_matches=all_matches), query)
+            elif url.path == "/update-location":
+                self._run_job(self.service.update_location, query)
+            elif url.path == "/reload":
+                self._send_json(HTTPStatus.OK, {"status": "ok", "companies": self.service.reload()})
+            else:
+                raise ServiceError(HTTPStatus.NOT_FOUND, f"알 수 없는 경로입니다: {url.path}")
+        except ServiceError as e:
+            self._send_error(e)
+        except Exception as e:
+            self._send_error(ServiceError(HTTPStatus.INTERNAL_SERVER_ERROR, str(e)))
+
+    def _run_job(self, job, query):
+        output_extension = "." + query.get("format", "csv").lower()
+        if output_extension not in cf.OUTPUT_FORMATS:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, f"지원하지 않는 출력 형식입니다: {output_extension}")
+
+        with tempfile.TemporaryDirectory(prefix="company_filter_") as work_dir:
+            # 업로드 본문을 받기 전에 자리를 잡아, 대기열이 가득 차면 본문을 받지 않고 바로 거절합니다.
+            # 자리는 결과 파일을 다 만든 뒤 돌려주므로, 응답을 받은 클라이언트의 다음 요청이 거절되지 않습니다.
+            with self.service.reserve():
+                pension_path, use_cache = self._pension_source(query, work_dir)
+                output_path = os.path.join(work_dir, "result" + output_extension)
+                rows = self.service.submit(job, pension_path, output_path, use_cache)
+            self._send_file(output_path, rows)
+
+    def _pension_source(self, query, work_dir):
+        """
+        file 파라미터가 있으면 국민연금 데이터 폴더 안의 파일을, 없으면 요청 본문(업로드)을 사용합니다.
+        업로드는 임시 파일에 나누어 저장하며, 한 번만 읽으므로 컬럼형 캐시는 만들지 않습니다.
+        """
+        if "file" in query:
+            data_dir = os.path.realpath(cf.PENSION_DATA_DIR)
+            pension_path = os.path.realpath(os.path.join(data_dir, query["file"]))
+            if os.path.dirname(pension_path) != data_dir:
+                raise ServiceError(HTTPStatus.BAD_REQUEST, "국민연금 데이터 폴더 안의 파일만 지정할 수 있습니다.")
+            if not os.path.isfile(pension_path):
+                raise ServiceError(HTTPStatus.NOT_FOUND, f"국민연금 파일이 없습니다: {query['file']}")
+            return pension_path, True
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "file 파라미터나 업로드할 CSV 본문이 필요합니다.")
+        if length > MAX_UPLOAD_BYTES:
+            raise ServiceError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"업로드는 {MAX_UPLOAD_BYTES} 바이트까지 가능합니다.")
+
+        pension_path = os.path.join(work_dir, "upload.csv")
+        with open(pension_path, "wb") as f:
+            remaining = length
+            while remaining > 0:
+                block = self.rfile.read(min(STREAM_BLOCK_SIZE, remaining))
+                if not block:
+                    raise ServiceError(HTTPStatus.BAD_REQUEST, "업로드가 중간에 끊겼습니다.")
+                f.write(block)
+                remaining -= len(block)
+        return pension_path, False
+
+    def _send_file(self, output_path, rows):
+        # 결과 파일을 통째로 메모리에 올리지 않고 나누어 보냅니다.
+        extension = os.path.splitext(output_path)[1]
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", CONTENT_TYPES[extension])
+        self.send_header("Content-Length", str(os.path.getsize(output_path)))
+        self.send_header("Content-Disposition", f'attachment; filename="result{extension}"')
+        self.send_header("X-Result-Rows", str(rows))
+        self.end_headers()
+        self._response_started = True
+        with open(output_path, "rb") as f:
+            while True:
+                block = f.read(STREAM_BLOCK_SIZE)
+                if not block:
+                    break
+                self.wfile.write(block)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self._response_started = True
+        self.wfile.write(body)
+
+    def _send_error(self, error):
+        # 읽지 않은 업로드 본문이 남아 있을 수 있으므로 오류 응답 뒤에는 연결을 닫습니다.
+        self.close_connection = True
+        if self._response_started:
+            # 응답 헤더를 이미 보냈으면 오류 응답을 덧붙일 수 없으므로 연결만 닫아 응답이 끊겼음을 알립니다.
+            self.log_error("응답을 보내는 중 실패: %s", error)
+            return
+        if error.status == HTTPStatus.SERVICE_UNAVAILABLE:
+            self.log_message("요청 거절: %s", error)
+        self._send_json(error.status, {"status": "error", "error": str(error)})
+
+
+def make_server(service, host=SERVICE_HOST, port=SERVICE_PORT):
+    server = ThreadingHTTPServer((host, port), FilterRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="강소기업 필터 로컬 HTTP 서비스")
+    parser.add_argument("--company", required=True, help="강소기업 엑셀 파일 경로")
+    parser.add_argument("--pension-dir", default=cf.PENSION_DATA_DIR, help="file 파라미터로 지정할 국민연금 CSV 디렉토리")
+    parser.add_argument("--host", default=SERVICE_HOST, help=f"접속을 받을 주소 (기본값: {SERVICE_HOST})")
+    parser.add_argument("--port", type=int, default=SERVICE_PORT, help=f"포트 (기본값: {SERVICE_PORT})")
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS,
+                        help=f"동시에 처리하는 요청 수 (기본값: {SERVICE_WORKERS})")
+    parser.add_argument("--queue-size", type=int, default=SERVICE_QUEUE_SIZE,
+                        help=f"처리를 기다릴 수 있는 요청 수 (기본값: {SERVICE_QUEUE_SIZE})")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    # 여러 요청이 같은 콘솔을 쓰므로 애니메이션과 진행 줄은 끕니다.
+    cf.ANIMATIONS_ENABLED = False
+    cf.PROGRESS_ENABLED = False
+    cf.PENSION_DATA_DIR = os.path.abspath(args.pension_dir)
+
+    print("📝 강소기업 인덱스를 불러오는 중...")
+    service = FilterService(args.company, args.workers, args.queue_size)
+    server = make_server(service, args.host, args.port)
+    print(f"✅ 강소기업 {len(service.company_index['data'])}개 준비 완료. "
+          f"http://{args.host}:{server.server_port} 에서 요청을 기다립니다. (종료: Ctrl+C)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 서비스를 종료합니다.")
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
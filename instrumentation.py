@@ -0,0 +1,217 @@
+"""
+실행 계측 도구
+
+단계별 소요 시간, 행 수, 처리량(rows/sec), 최대 메모리(RSS)와
+키 충돌 수, 주소 유사도 계산 횟수 같은 카운터를 모아 JSON 실행 보고서로 저장합니다.
+start_report()로 보고서를 시작하지 않으면 stage()/count()는 아무 일도 하지 않으므로
+계측 코드를 핫 패스에 그대로 두어도 비용이 거의 없습니다.
+"""
+import contextlib
+import functools
+import json
+import sys
+import threading
+import time
+
+_active_report = None
+
+
+# 메모리 측정
+def reset_peak_rss():
+    """
+    최대 RSS를 현재 값으로 초기화합니다. (Linux의 /proc/self/clear_refs 사용, 그 외 환경에서는 무시)
+    """
+    if not sys.platform.startswith("linux"):
+        return
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb():
+    """
+    프로세스의 최대 RSS를 MB 단위로 반환합니다.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# 실행 보고서
+class RunReport:
+    """
+    한 번의 실행에서 단계별 측정값과 카운터를 모읍니다.
+    단계는 중첩될 수 있으며, 최대 RSS는 가장 바깥 단계에서만 초기화합니다.
+    중첩 깊이는 스레드마다 따로 세고 카운터와 단계 기록은 잠금으로 보호하므로 여러 스레드에서 동시에 기록해도 됩니다.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.started_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.stages = []
+        self.counters = {}
+        self.children = []
+        self._start = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self, name, rows=None):
+        depth = getattr(self._local, "depth", 0)
+        record = {"stage": name, "depth": depth, "rows": rows}
+        if depth == 0:
+            reset_peak_rss()
+        self._local.depth = depth + 1
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            seconds = time.perf_counter() - start
+            self._local.depth = depth
+            record["seconds"] = round(seconds, 4)
+            record["rows_per_sec"] = round(record["rows"] / seconds) if record["rows"] and seconds > 0 else None
+            record["peak_rss_mb"] = round(peak_rss_mb(), 1)
+            with self._lock:
+                self.stages.append(record)
+
+    def count(self, name, amount=1):
+        # 읽고 더해서 쓰는 사이에 다른 스레드가 끼어들면 값을 잃으므로 잠금 안에서 갱신합니다.
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_child(self, name, report_dict):
+        """
+        다른 프로세스에서 만든 보고서(to_dict 결과)를 하위 보고서로 붙입니다.
+        """
+        with self._lock:
+            self.children.append({"name": name, **report_dict})
+
+    def stage_totals(self):
+        totals = {}
+        for record in self.stages:
+            total = totals.setdefault(record["stage"], {"calls": 0, "seconds": 0.0, "rows": 0})
+            total["calls"] += 1
+            total["seconds"] = round(total["seconds"] + record["seconds"], 4)
+            total["rows"] += record["rows"] or 0
+        for total in totals.values():
+            total["rows_per_sec"] = round(total["rows"] / total["seconds"]) if total["rows"] and total["seconds"] else None
+        return totals
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "total_seconds": round(time.perf_counter() - self._start, 4),
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "stage_totals": self.stage_totals(),
+            "counters": self.counters,
+            "stages": self.stages,
+            "children": self.children,
+        }
+
+    def write_json(self, output_path, **extra):
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump({**self.to_dict(), **extra}, f, ensure_ascii=False, indent=2)
+
+
+def start_report(name):
+    global _active_report
+    _active_report = RunReport(name)
+    return _active_report
+
+
+def finish_report():
+    global _active_report
+    report, _active_report = _active_report, None
+    return report
+
+
+def active_report():
+    return _active_report
+
+
+@contextlib.contextmanager
+def stage(name, rows=None):
+    """
+    보고서가 켜져 있으면 단계 측정값을 기록합니다. 넘겨받은 dict의 "rows"를 바꿔 행 수를 나중에 채울 수 있습니다.
+    """
+    if _active_report is None:
+        yield {"rows": rows}
+        return
+    with _active_report.stage(name, rows) as record:
+        yield record
+
+
+def count(name, amount=1):
+    if _active_report is not None:
+        _active_report.count(name, amount)
+
+
+def instrumented(name, rows=None):
+    """
+    함수 실행을 하나의 단계로 기록하는 데코레이터입니다.
+    rows는 (반환값, *인자, **키워드 인자)를 받아 처리한 행 수를 돌려주는 함수입니다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active_report is None:
+                return func(*args, **kwargs)
+            with _active_report.stage(name) as record:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    record["rows"] = rows(result, *args, **kwargs)
+            return result
+        return wrapper
+    return decorator
+
+
+# 프로파일러 연결
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+@contextlib.contextmanager
+def profiling(mode, output_base):
+    """
+    mode가 "cprofile"이면 <output_base>.prof, "pyinstrument"이면 <output_base>.profile.html을 남깁니다.
+    mode가 None이면 아무 일도 하지 않습니다.
+    """
+    if not mode:
+        yield
+        return
+
+    if mode == "cprofile":
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(output_base + ".prof")
+            print(f"📊 프로파일 저장: {output_base}.prof")
+    elif mode == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise ImportError("pyinstrument 프로파일러를 사용하려면 pyinstrument를 설치하세요.")
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(output_base + ".profile.html", "w", encoding="utf-8") as f:
+                f.write(profiler.output_html())
+            print(f"📊 프로파일 저장: {output_base}.profile.html")
+    else:
+        raise ValueError(f"지원하지 않는 프로파일러입니다: {mode} (지원: {', '.join(PROFILERS)})")
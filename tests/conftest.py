@@ -0,0 +1,51 @@
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import company_filter as cf  # noqa: E402
+
+
+PENSION_COLUMNS = ["자료생성년월", "사업장명", "사업자등록번호", "사업장지번상세주소", "우편번호",
+                   "사업장도로명상세주소"] + [f"기타{i}" for i in range(8)] + ["사업장업종상세정보", "신규취득자수"]
+
+
+def pension_row(name, bizno, address="서울 강남구 테헤란로 1", zip_code="06234", detail="제조업"):
+    """
+    company_filter가 위치로 읽는 컬럼 배치(1: 사업장명, 2: 사업자등록번호, 3/5: 주소, 4: 우편번호,
+    14: 사업장업종상세정보)를 따르는 국민연금 행 하나를 만듭니다.
+    """
+    return ["202401", name, bizno, address, zip_code, address] + ["0"] * 8 + [detail, "0"]
+
+
+def quietly(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def quiet_company_filter(monkeypatch):
+    monkeypatch.setattr(cf, "ANIMATIONS_ENABLED", False)
+    monkeypatch.setattr(cf, "PROGRESS_ENABLED", False)
+
+
+@pytest.fixture
+def data_dirs(tmp_path, monkeypatch):
+    """
+    데이터/캐시/출력 폴더를 테스트마다 새 임시 디렉토리로 바꿉니다.
+    """
+    dirs = {name: tmp_path / name for name in ("company_data", "pension_data", "pension_cache",
+                                               "pension_store", "incremental_state", "output")}
+    for path in dirs.values():
+        path.mkdir()
+    monkeypatch.setattr(cf, "COMPANY_DATA_DIR", str(dirs["company_data"]))
+    monkeypatch.setattr(cf, "PENSION_DATA_DIR", str(dirs["pension_data"]))
+    monkeypatch.setattr(cf, "PENSION_CACHE_DIR", str(dirs["pension_cache"]))
+    monkeypatch.setattr(cf, "PENSION_STORE_DIR", str(dirs["pension_store"]))
+    monkeypatch.setattr(cf, "INCREMENTAL_STATE_DIR", str(dirs["incremental_state"]))
+    monkeypatch.setattr(cf, "OUTPUT_DIR", str(dirs["output"]))
+    return dirs
@@ -0,0 +1,82 @@
+"""
+명령줄 실행의 종료 코드(0: 성공, 1: 실패, 2: 잘못된 인자)와 캐시 위치를 확인합니다.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+import company_filter as cf
+from conftest import PENSION_COLUMNS, pension_row, quietly
+
+
+def _tree(path):
+    if not os.path.exists(path):
+        return None
+    return sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+
+
+@pytest.fixture
+def cli_files(tmp_path, data_dirs, monkeypatch):
+    # run_cli가 바꾸는 모듈 전역값은 data_dirs와 monkeypatch가 테스트 뒤에 되돌립니다.
+    monkeypatch.setattr(cf, "PENSION_CSV_READER", cf.PENSION_CSV_READER)
+    inputs = tmp_path / "inputs"
+    pension_dir = inputs / "pension"
+    pension_dir.mkdir(parents=True)
+    company_path = inputs / "companies.xlsx"
+    pd.DataFrame({"사업자명": ["(주)가나"], "사업자등록번호": ["123-45-67890"], "소재지": ["서울 중구"]}).to_excel(
+        company_path, index=False)
+    for month in ("202401", "202402"):
+        pd.DataFrame([pension_row("가나", "123456"), pension_row("다라", "999999")], columns=PENSION_COLUMNS).to_csv(
+            pension_dir / f"pension_{month}.csv", index=False, encoding="CP949")
+    return company_path, pension_dir, tmp_path / "out"
+
+
+def test_bad_arguments_exit_with_2(cli_files):
+    with pytest.raises(SystemExit) as excinfo:
+        quietly(cf.run_cli, ["filter", "--company", str(cli_files[0])])
+    assert excinfo.value.code == 2
+    with pytest.raises(SystemExit) as excinfo:
+        quietly(cf.run_cli, ["batch-filter", "--company", str(cli_files[0]), "--format", "txt"])
+    assert excinfo.value.code == 2
+
+    # argparse가 확인하지 못하는 인자 조합도 2를 반환합니다.
+    assert quietly(cf.run_cli, ["shard", "--step", "run", "--shard-id", "0"]) == 2
+    assert quietly(cf.run_cli, ["store-lookup", "--store", "x.sqlite"]) == 2
+
+
+def test_batch_filter_returns_1_when_a_file_fails(cli_files):
+    company_path, pension_dir, output_dir = cli_files
+    argv = ["batch-filter", "--company", str(company_path), "--pension-dir", str(pension_dir),
+            "--output-dir", str(output_dir), "--format", "csv", "--workers", "1", "--quiet"]
+    assert quietly(cf.run_cli, argv) == 0
+    assert sorted(os.listdir(output_dir)) == ["filtered_pension_202401.csv", "filtered_pension_202402.csv"]
+
+    (pension_dir / "pension_202403.csv").write_bytes(b"a,b,c\n\xff\xff,1,2\n")
+    assert quietly(cf.run_cli, argv) == 1
+    assert len(pd.read_csv(output_dir / "filtered_pension_202402.csv", dtype=str, encoding="utf-8-sig")) == 1
+
+
+def test_explicit_paths_do_not_write_under_the_program_data_dir(cli_files, tmp_path):
+    company_path, pension_dir, output_dir = cli_files
+    data_dir_before = _tree(cf.DATA_DIR)
+    pension_path = str(pension_dir / "pension_202401.csv")
+    for argv in (["filter", "--pension", pension_path, "--output", str(output_dir / "filtered.csv")],
+                 ["update-location", "--pension", pension_path, "--output", str(output_dir / "updated.csv"),
+                  "--use-store"],
+                 ["batch-filter", "--pension-dir", str(pension_dir), "--output-dir", str(output_dir),
+                  "--format", "csv", "--incremental"],
+                 ["shard", "--pension", pension_path, "--output", str(output_dir / "sharded.csv"), "--shards", "2",
+                  "--workers", "1"]):
+        assert quietly(cf.run_cli, argv + ["--company", str(company_path), "--quiet"]) == 0
+    assert _tree(cf.DATA_DIR) == data_dir_before
+
+    cache_dir = pension_dir / cf.CLI_CACHE_DIR_NAME
+    assert (cache_dir / "pension_store" / "pension_202401.sqlite").exists()
+    assert os.listdir(cache_dir / "incremental_state")
+    assert (cache_dir / "shards" / cf.SHARD_MANIFEST_NAME).exists()
+
+    other_cache = tmp_path / "cache"
+    argv = ["store-ingest", "--pension", pension_path, "--cache-dir", str(other_cache), "--quiet"]
+    assert quietly(cf.run_cli, argv) == 0
+    assert (other_cache / "pension_store" / "pension_202401.sqlite").exists()
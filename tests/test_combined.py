@@ -0,0 +1,70 @@
+"""
+통합 일괄 처리(batch-filter --combine)가 파일을 이어 붙인 데이터에 기준 구현을 적용한 결과와 같은지 확인합니다.
+"""
+import os
+import random
+
+import pandas as pd
+import pytest
+
+import company_filter as cf
+from conftest import PENSION_COLUMNS, pension_row, quietly
+
+
+@pytest.fixture
+def combined_files(data_dirs):
+    rng = random.Random(3)
+    sidos = ["서울특별시", "서울", "경기도", "경기", "부산광역시"]
+
+    def address():
+        return f"{rng.choice(sidos)} {rng.choice(['중구', '수원시'])} {rng.choice(['세종대로', '왕림로'])} {rng.randint(1, 2)}"
+
+    companies = [(f"회사{i}", f"{100 + i}-45-{rng.randint(10000, 99999)}") for i in range(12)]
+    pd.DataFrame({"사업자명": [name for name, _ in companies], "사업자등록번호": [bizno for _, bizno in companies],
+                  "소재지": [address() for _ in companies]}).to_excel(
+        os.path.join(data_dirs["company_data"], "companies.xlsx"), index=False)
+
+    file_names = []
+    for month in ("202403", "202401", "202402"):
+        rows = []
+        for _ in range(25):
+            name, bizno = rng.choice(companies)
+            if rng.random() < 0.3:
+                name = "다른" + name
+            rows.append(pension_row(rng.choice(["", "(주)"]) + name, bizno.replace("-", "")[:6], address(),
+                                    detail=f"{month} 업종"))
+        file_name = f"pension_{month}.csv"
+        pd.DataFrame(rows, columns=PENSION_COLUMNS).to_csv(
+            os.path.join(data_dirs["pension_data"], file_name), index=False, encoding="CP949")
+        file_names.append(file_name)
+    return quietly(cf.load_company_index, "companies.xlsx"), file_names
+
+
+def _reference(company_index, file_names):
+    frames = [cf.load_pension_data(file_name).assign(**{cf.SNAPSHOT_COL: os.path.splitext(file_name)[0]})
+              for file_name in sorted(file_names)]
+    return quietly(cf.extract_excellent_companies_updated, company_index["data"].copy(),
+                   pd.concat(frames, ignore_index=True))
+
+
+@pytest.mark.parametrize("chunksize", [4, 1000])
+def test_combined_matches_reference_on_concatenated_files(combined_files, data_dirs, chunksize):
+    company_index, file_names = combined_files
+    output_path = str(data_dirs["output"] / "combined.csv")
+    result = quietly(cf.run_combined_batch, company_index, file_names, output_path, max_workers=1, chunksize=chunksize)
+
+    expected_path = str(data_dirs["output"] / "expected.csv")
+    cf.save_result(_reference(company_index, file_names), expected_path)
+    expected = pd.read_csv(expected_path, dtype=str, encoding="utf-8-sig")
+    assert result["rows"] == len(expected) > 3
+    assert pd.read_csv(output_path, dtype=str, encoding="utf-8-sig").equals(expected)
+
+
+def test_worker_returns_one_row_per_key(combined_files, data_dirs):
+    company_index, file_names = combined_files
+    excellent_keys = company_index["excellent_keys"]
+    cf._init_batch_worker(excellent_keys, cf.PENSION_DATA_DIR, cf.PENSION_CACHE_DIR, cf.OUTPUT_DIR, ".csv",
+                          csv_reader=cf.PENSION_CSV_READER)
+    candidates = cf._collect_pension_candidates(file_names[0], chunksize=3)["candidates"]
+    assert not candidates.duplicated(cf.MATCH_KEY_COLS).any()
+    assert len(candidates) <= len(excellent_keys) < len(cf.load_pension_data(file_names[0]))
@@ -0,0 +1,84 @@
+"""
+강소기업 인덱스 캐시(<엑셀>.index.pkl)를 원본 파일이나 정규화 규칙이 바뀔 때만 다시 만드는지 확인합니다.
+"""
+import os
+import pickle
+
+import pandas as pd
+import pytest
+
+import address_normalization
+import company_filter as cf
+from conftest import quietly
+
+
+def _write_companies(path, names):
+    pd.DataFrame({"사업자명": names, "사업자등록번호": [f"{100 + i}-45-67890" for i in range(len(names))],
+                  "소재지": ["서울 중구"] * len(names)}).to_excel(path, index=False)
+
+
+def _bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+@pytest.fixture
+def company_file(data_dirs, monkeypatch):
+    path = str(data_dirs["company_data"] / "companies.xlsx")
+    _write_companies(path, ["가나", "다라"])
+    excel_reads = []
+    read_excel = pd.read_excel
+
+    def counting_read_excel(*args, **kwargs):
+        excel_reads.append(args[0])
+        return read_excel(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_excel", counting_read_excel)
+    return path, excel_reads
+
+
+def _load():
+    return quietly(cf.load_company_index, "companies.xlsx")
+
+
+def test_unchanged_file_uses_cache(company_file):
+    path, excel_reads = company_file
+    first = _load()
+    assert os.path.exists(path + cf.COMPANY_INDEX_SUFFIX)
+    assert _load()["data"].equals(first["data"])
+    assert len(excel_reads) == 1
+
+
+def test_touched_file_with_same_content_uses_cache(company_file):
+    path, excel_reads = company_file
+    _load()
+    _bump_mtime(path)
+    assert _load()["source"]["mtime_ns"] == os.stat(path).st_mtime_ns
+    # 갱신한 수정 시각이 캐시에 저장되어 다음에는 해시도 다시 계산하지 않습니다.
+    with open(path + cf.COMPANY_INDEX_SUFFIX, "rb") as f:
+        assert pickle.load(f)["source"]["mtime_ns"] == os.stat(path).st_mtime_ns
+    assert len(excel_reads) == 1
+
+
+def test_changed_file_rebuilds_index(company_file):
+    path, excel_reads = company_file
+    _load()
+    _write_companies(path, ["가나", "마바"])
+    _bump_mtime(path)
+    company_index = _load()
+    assert company_index["data"]["사업자명"].tolist() == ["가나", "마바"]
+    assert len(excel_reads) == 2
+
+
+def test_version_change_rebuilds_index(company_file, monkeypatch):
+    path, excel_reads = company_file
+    _load()
+    assert cf.COMPANY_INDEX_VERSION[1] == address_normalization.NORMALIZATION_VERSION
+    monkeypatch.setattr(cf, "COMPANY_INDEX_VERSION",
+                        (cf.COMPANY_INDEX_VERSION[0], address_normalization.NORMALIZATION_VERSION + 1))
+    company_index = _load()
+    assert company_index["version"] == cf.COMPANY_INDEX_VERSION
+    assert len(excel_reads) == 2
+    # 새 버전으로 저장한 캐시는 다음 실행에서 그대로 사용합니다.
+    _load()
+    assert len(excel_reads) == 2
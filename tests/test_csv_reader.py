@@ -0,0 +1,92 @@
+"""
+arrow CSV 리더가 pandas 파서(read_csv(dtype=str, encoding="CP949"))와 같은 값을 읽는지 확인합니다.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+import company_filter as cf
+from conftest import PENSION_COLUMNS, pension_row, quietly
+
+pytestmark = pytest.mark.skipif(not cf.PYARROW_AVAILABLE, reason="pyarrow가 필요합니다.")
+
+
+def _write_csv(data_dirs, file_name, text):
+    path = os.path.join(data_dirs["pension_data"], file_name)
+    with open(path, "w", encoding="CP949", newline="") as f:
+        f.write(text)
+    return file_name
+
+
+def _csv_text(rows):
+    return pd.DataFrame(rows, columns=PENSION_COLUMNS).to_csv(index=False, lineterminator="\n")
+
+
+def _same_values(expected, actual):
+    assert list(actual.columns) == list(expected.columns)
+    assert list(actual.index) == list(expected.index)
+    assert actual.astype(object).equals(expected.astype(object))
+
+
+def _compare_readers(file_name, chunksize=2):
+    path = os.path.join(cf.PENSION_DATA_DIR, file_name)
+    for project in (False, True):
+        expected = cf.read_pension_csv(path, project, "pandas")
+        _same_values(expected, quietly(cf.read_pension_csv, path, project, "arrow"))
+
+        expected_chunks = list(cf._iter_csv_chunks(file_name, chunksize, project, "pandas"))
+        actual_chunks = quietly(lambda: list(cf._iter_csv_chunks(file_name, chunksize, project, "arrow")))
+        assert len(actual_chunks) == len(expected_chunks)
+        for expected_chunk, actual_chunk in zip(expected_chunks, actual_chunks):
+            _same_values(expected_chunk, actual_chunk)
+
+
+@pytest.fixture
+def rows():
+    return [pension_row(f"회사{i}", f"12345{i}", address=f"서울 중구 세종대로 {i}") for i in range(5)]
+
+
+def test_readers_agree_on_quoted_newlines_and_na_strings(data_dirs, rows):
+    rows[1] = pension_row("줄\n바꿈", "NA", address="")
+    rows[3] = pension_row("null", "123456", address="\"따옴표\", 쉼표", detail="N/A")
+    _compare_readers(_write_csv(data_dirs, "pension_quoted.csv", _csv_text(rows)))
+
+
+@pytest.mark.parametrize("short_row", [1, 4])
+def test_readers_agree_on_short_rows(data_dirs, rows, short_row, monkeypatch):
+    # 블록을 작게 나누어 앞쪽 청크를 arrow로 돌려준 뒤에 모자란 행을 만나는 경우도 확인합니다.
+    monkeypatch.setattr(cf, "PENSION_CSV_BLOCK_SIZE", 256)
+    lines = _csv_text(rows).splitlines()
+    # 뒤쪽 컬럼이 빠진 행은 pandas처럼 NaN으로 채워져야 합니다.
+    lines[short_row + 1] = ",".join(lines[short_row + 1].split(",")[:6])
+    _compare_readers(_write_csv(data_dirs, "pension_short.csv", "\n".join(lines) + "\n"))
+
+
+def test_header_only_file(data_dirs, monkeypatch):
+    file_name = _write_csv(data_dirs, "pension_empty.csv", _csv_text([]))
+    _compare_readers(file_name)
+
+    monkeypatch.setattr(cf, "PENSION_CSV_READER", "arrow")
+    tables = list(cf._iter_arrow_csv_tables(os.path.join(cf.PENSION_DATA_DIR, file_name)))
+    assert [table.num_rows for table in tables] == [0]
+    assert tables[0].column_names == PENSION_COLUMNS
+
+    cached = quietly(cf.load_pension_data_cached, file_name)
+    assert list(cached.columns) == PENSION_COLUMNS and cached.empty
+    chunks = list(cf.iter_pension_chunks(file_name))
+    assert len(chunks) == 1 and list(chunks[0].columns) == PENSION_COLUMNS
+
+
+def test_default_reader_is_pandas():
+    assert cf.PENSION_CSV_READER == "pandas"
+    assert cf.resolve_csv_reader() == "pandas"
+
+
+def test_failed_cache_ingest_leaves_no_temp_files(data_dirs):
+    # CP949로 읽을 수 없는 바이트가 있으면 오류를 그대로 내고, 쓰던 임시 캐시 파일은 남기지 않습니다.
+    (data_dirs["pension_data"] / "pension_bad.csv").write_bytes(b"a,b,c\n\xff\xff,1,2\n")
+    for _ in range(3):
+        with pytest.raises(UnicodeDecodeError):
+            quietly(cf.ingest_pension_csv, "pension_bad.csv")
+    assert os.listdir(data_dirs["pension_cache"]) == []
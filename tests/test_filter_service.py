@@ -0,0 +1,175 @@
+"""
+로컬 HTTP 서비스를 임의 포트로 띄워 실제 요청으로 확인합니다.
+"""
+import http.client
+import io
+import json
+import os
+import socket
+import threading
+import time
+from http import HTTPStatus
+
+import pandas as pd
+import pytest
+
+import company_filter as cf
+import filter_service
+from conftest import PENSION_COLUMNS, pension_row, quietly
+
+
+@pytest.fixture
+def service_files(data_dirs):
+    company_path = os.path.join(data_dirs["company_data"], "companies.xlsx")
+    pd.DataFrame({"사업자명": ["(주)가나", "다라"], "사업자등록번호": ["123-45-67890", "234-56-78901"],
+                  "소재지": ["서울 중구 세종대로 1", "부산 해운대구"]}).to_excel(company_path, index=False)
+    pension_path = os.path.join(data_dirs["pension_data"], "pension_202401.csv")
+    pd.DataFrame([
+        pension_row("가나", "123456", address="부산 중구"),
+        pension_row("다른회사", "999999"),
+        pension_row("가나(주)", "123456", address="서울특별시 중구 세종대로 1"),
+        pension_row("다라", "234567", address="부산 해운대구"),
+    ], columns=PENSION_COLUMNS).to_csv(pension_path, index=False, encoding="CP949")
+    return company_path, pension_path
+
+
+@pytest.fixture
+def start_service(service_files):
+    servers = []
+
+    def start(workers=1, queue_size=0):
+        service = quietly(filter_service.FilterService, service_files[0], workers, queue_size)
+        server = filter_service.make_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append((server, service))
+        return service, server.server_port
+
+    yield start
+    for server, service in servers:
+        server.shutdown()
+        server.server_close()
+        service.shutdown()
+
+
+def _post(port, path, body=None):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        connection.request("POST", path, body=body)
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+
+def _expected_filter(service_files):
+    company_index = quietly(cf.load_company_index, service_files[0])
+    df_pension = cf.load_pension_data(service_files[1])
+    return quietly(cf.extract_excellent_companies_updated_fast, company_index["data"], df_pension,
+                   excellent_keys=company_index["excellent_keys"])
+
+
+def test_upload_returns_filtered_csv(service_files, start_service):
+    _, port = start_service()
+    with open(service_files[1], "rb") as f:
+        status, headers, body = _post(port, "/filter?format=csv", f.read())
+
+    assert status == HTTPStatus.OK
+    expected = _expected_filter(service_files)
+    actual = pd.read_csv(io.BytesIO(body), dtype=str, encoding="utf-8-sig")
+    assert headers["X-Result-Rows"] == str(len(expected)) == "2"
+    assert actual["사업장명"].tolist() == expected["사업장명"].tolist()
+
+
+def test_file_parameter_and_location_update(start_service):
+    _, port = start_service()
+    status, _, body = _post(port, "/filter?file=pension_202401.csv&format=csv&all_matches=1")
+    assert status == HTTPStatus.OK
+    assert len(pd.read_csv(io.BytesIO(body), dtype=str, encoding="utf-8-sig")) == 3
+
+    status, _, body = _post(port, "/update-location?file=pension_202401.csv&format=csv")
+    assert status == HTTPStatus.OK
+    updated = pd.read_csv(io.BytesIO(body), dtype=str, encoding="utf-8-sig")
+    assert updated["사업장업종상세정보"].tolist() == ["제조업", "제조업"]
+
+    status, _, body = _post(port, "/filter?file=../secret.csv")
+    assert status == HTTPStatus.BAD_REQUEST
+
+
+def test_full_queue_is_rejected_before_reading_the_body(service_files, start_service):
+    service, port = start_service(workers=1, queue_size=0)
+    with service.reserve():
+        # 본문을 보내지 않고 헤더만 보내도 바로 503을 받아야 합니다.
+        with socket.create_connection(("127.0.0.1", port), timeout=10) as sock:
+            sock.sendall(b"POST /filter?format=csv HTTP/1.1\r\nHost: localhost\r\n"
+                         b"Content-Length: 1000000\r\n\r\n")
+            response = sock.makefile("rb").readline()
+        assert b" 503 " in response
+        assert service.status()["rejected"] == 1
+
+    with open(service_files[1], "rb") as f:
+        status, _, _ = _post(port, "/filter?format=csv", f.read())
+    assert status == HTTPStatus.OK
+    # 자리는 응답을 보내기 전에 돌려주므로 바로 이어서 보낸 요청도 받아들입니다.
+    assert service.status()["in_flight"] == 0
+    for _ in range(5):
+        assert _post(port, "/filter?file=pension_202401.csv")[0] == HTTPStatus.OK
+
+
+def test_concurrent_requests_build_the_cache_once(start_service, monkeypatch):
+    if not cf.PYARROW_AVAILABLE:
+        pytest.skip("pyarrow가 필요합니다.")
+    ingested = []
+    ingest_pension_csv = cf.ingest_pension_csv
+
+    def slow_ingest(*args, **kwargs):
+        ingested.append(args[0])
+        time.sleep(0.2)
+        return ingest_pension_csv(*args, **kwargs)
+
+    monkeypatch.setattr(cf, "ingest_pension_csv", slow_ingest)
+    _, port = start_service(workers=2, queue_size=0)
+    statuses = []
+    threads = [threading.Thread(target=lambda: statuses.append(_post(port, "/filter?file=pension_202401.csv")[0]))
+               for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses == [HTTPStatus.OK, HTTPStatus.OK]
+    assert len(ingested) == 1
+    assert [name for name in os.listdir(cf.PENSION_CACHE_DIR) if name.endswith(".tmp")] == []
+
+
+def test_failure_after_headers_only_closes_the_connection(start_service, monkeypatch):
+    def broken_send_file(handler, output_path, rows):
+        handler.send_response(HTTPStatus.OK)
+        handler.send_header("Content-Length", "100")
+        handler.end_headers()
+        handler._response_started = True
+        handler.wfile.write(b"partial")
+        raise RuntimeError("전송 실패")
+
+    monkeypatch.setattr(filter_service.FilterRequestHandler, "_send_file", broken_send_file)
+    _, port = start_service()
+    with socket.create_connection(("127.0.0.1", port), timeout=10) as sock:
+        sock.sendall(b"POST /filter?file=pension_202401.csv HTTP/1.1\r\nHost: localhost\r\nContent-Length: 0\r\n\r\n")
+        received = b""
+        while True:
+            block = sock.recv(65536)
+            if not block:
+                break
+            received += block
+    # 상태 줄은 하나뿐이고, 본문이 끝나기 전에 연결이 닫혀야 합니다.
+    assert received.count(b"HTTP/1.1 ") == 1
+    assert received.endswith(b"partial")
+
+
+def test_health(start_service):
+    service, port = start_service()
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    connection.request("GET", "/health")
+    payload = json.loads(connection.getresponse().read())
+    connection.close()
+    assert payload["status"] == "ok"
+    assert payload["companies"] == 2
@@ -0,0 +1,63 @@
+"""
+유사 회사명 매칭(--fuzzy)이 한 글자 오타를 찾아 신뢰도와 함께 돌려주고, 다른 회사는 매칭하지 않는지 확인합니다.
+"""
+import pandas as pd
+import pytest
+
+import company_filter as cf
+from conftest import PENSION_COLUMNS, pension_row, quietly
+
+
+@pytest.fixture
+def fuzzy_data():
+    df_excellent = pd.DataFrame({
+        "사업자명": ["(주)한국정밀기계", "삼성전자", "세진테크1", "한국정밀기계공업사"],
+        "사업자등록번호": ["123-45-67890", "234-56-78901", "345-67-89012", "456-78-90123"],
+        "소재지": ["서울 중구", "경기 수원시", "부산 해운대구", "대구 중구"],
+    }, dtype=object)
+    df_pension = pd.DataFrame([
+        pension_row("한국정밀기게", "123456"),          # 6자, 한 글자 오타
+        pension_row("한국정밀기계(주)", "123456"),      # 정확히 일치
+        pension_row("삼성전지", "234567"),              # 4자, 한 글자 오타
+        pension_row("한국정밀기게", "999999"),          # 앞 6자리가 다르면 비교하지 않음
+        pension_row("세진테크2", "345678"),             # 숫자만 다른 다른 회사
+        pension_row("대한물산", "123456"),              # 같은 앞 6자리의 다른 회사
+        pension_row("삼성전자서비스", "234567"),         # 두 글자 이상 차이
+        pension_row("한국정밀기계공엄사", "456789"),     # 9자, 한 글자 오타
+    ], columns=PENSION_COLUMNS, dtype=object)
+    return df_excellent, df_pension
+
+
+def test_one_character_typos_are_recovered_with_confidence(fuzzy_data):
+    df_excellent, df_pension = fuzzy_data
+    exact = quietly(cf.extract_excellent_companies_fast, df_excellent, df_pension)
+    fuzzy = quietly(cf.extract_excellent_companies_fast, df_excellent, df_pension, fuzzy=True)
+
+    assert list(exact.index) == [1]
+    assert list(fuzzy.index) == [0, 1, 2, 7]
+    assert fuzzy[cf.MATCH_CONFIDENCE_COL].round(3).tolist() == [0.833, 1.0, 0.75, 0.889]
+
+
+def test_updated_fuzzy_prefers_exact_match_and_uses_key_store(fuzzy_data):
+    df_excellent, df_pension = fuzzy_data
+    excellent_keys = cf.build_excellent_key_table(df_excellent, with_address=True)
+    key_store = cf.CompanyKeyStore.from_key_table(excellent_keys)
+    expected = quietly(cf.extract_excellent_companies_updated_fast, df_excellent, df_pension, fuzzy=True)
+    actual = quietly(cf.extract_excellent_companies_updated_fast, df_excellent, df_pension,
+                     excellent_keys=excellent_keys, fuzzy=True, key_store=key_store)
+
+    assert actual.equals(expected)
+    # 한국정밀기계는 정확히 일치하는 행(신뢰도 1.0)이 오타 행보다 우선합니다.
+    assert list(actual.index) == [1, 2, 7]
+    assert actual[cf.MATCH_CONFIDENCE_COL].round(3).tolist() == [1.0, 0.75, 0.889]
+
+
+@pytest.mark.parametrize("name1, name2, expected", [
+    ("한국정밀기게", "한국정밀기계", True),
+    ("삼성전자", "삼성전", False),      # 3자 회사명은 글자 차이로 인정하지 않음
+    ("세진테크", "세진테크1", False),   # 더해진 글자가 숫자
+    ("가나다라", "가나다라", True),
+    ("가나다라마", "가다나라마", False),  # 두 글자 바뀜
+])
+def test_company_name_similarity_rules(name1, name2, expected):
+    assert (cf.company_name_similarity(name1, name2) > 0) == expected
@@ -0,0 +1,107 @@
+"""
+월별 증분 처리가 전체를 다시 처리한 결과와 같으면서, 이전 스냅샷에 없던 행만 다시 매칭하는지 확인합니다.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+import company_filter as cf
+from conftest import PENSION_COLUMNS, pension_row, quietly
+
+
+def _write_company(data_dirs, names, biznos, addresses, file_name="companies.xlsx"):
+    pd.DataFrame({"사업자명": names, "사업자등록번호": biznos, "소재지": addresses}).to_excel(
+        os.path.join(data_dirs["company_data"], file_name), index=False)
+    return quietly(cf.load_company_index, file_name)
+
+
+def _write_pension(data_dirs, file_name, rows):
+    df = pd.DataFrame(rows, columns=PENSION_COLUMNS)
+    df.to_csv(os.path.join(data_dirs["pension_data"], file_name), index=False, encoding="CP949")
+    return file_name
+
+
+@pytest.fixture
+def company_index(data_dirs):
+    return _write_company(data_dirs, ["(주)가나", "다라", "마바"], ["123-45-67890", "234-56-78901", "345-67-89012"],
+                          ["서울 중구 세종대로 1", "부산 해운대구", "경기도 수원시 왕림로 3"])
+
+
+def _january():
+    return [
+        pension_row("가나", "123456", address="서울 중구 세종대로 9"),
+        pension_row("다른회사", "999999"),
+        pension_row("다라(주)", "234567", address="부산 중구"),
+        pension_row("가나", "123456", address="서울특별시 중구 세종대로 1"),
+        pension_row("또다른회사", "888888"),
+    ]
+
+
+def _february():
+    rows = _january()
+    rows[4] = pension_row("마바", "345678", address="경기 수원시 왕림로 3")  # 새로 생긴 행
+    rows[1] = pension_row("다른회사", "999999", zip_code="99999")  # 매칭과 관계없는 컬럼만 바뀐 행
+    rows.append(pension_row("다라", "234567", address="부산 해운대구"))
+    return rows
+
+
+def _expected(company_index, file_name, dedupe):
+    df_pension = cf.load_pension_data(file_name)
+    extract = cf.extract_excellent_companies_updated_fast if dedupe else cf.extract_excellent_companies_fast
+    return quietly(extract, company_index["data"], df_pension, excellent_keys=company_index["excellent_keys"])
+
+
+@pytest.fixture
+def matched_row_counts(monkeypatch):
+    # 증분 처리에서 실제로 매칭한 국민연금 행 수를 기록합니다.
+    counts = []
+    match_pension_keys = cf.match_pension_keys
+
+    def counting_match(excellent_keys, df_pension, *args, **kwargs):
+        counts.append(len(df_pension))
+        return match_pension_keys(excellent_keys, df_pension, *args, **kwargs)
+
+    monkeypatch.setattr(cf, "match_pension_keys", counting_match)
+    return counts
+
+
+@pytest.mark.parametrize("dedupe", [False, True])
+def test_incremental_matches_full_processing(data_dirs, company_index, matched_row_counts, dedupe):
+    january = _write_pension(data_dirs, "pension_202401.csv", _january())
+    february = _write_pension(data_dirs, "pension_202402.csv", _february())
+
+    for file_name, new_rows in [(january, 5), (february, 2)]:
+        del matched_row_counts[:]
+        actual = quietly(cf.filter_pension_incremental, file_name, company_index, dedupe=dedupe)
+        assert sum(matched_row_counts) == new_rows
+        expected = _expected(company_index, file_name, dedupe)
+        assert list(actual.index) == list(expected.index)
+        assert actual.astype(object).equals(expected.astype(object))
+
+
+def test_state_is_scoped_per_series(data_dirs, company_index, matched_row_counts):
+    other = _write_pension(data_dirs, "other_202312.csv", _january())
+    january = _write_pension(data_dirs, "pension_202401.csv", _january())
+
+    quietly(cf.filter_pension_incremental, other, company_index)
+    del matched_row_counts[:]
+    quietly(cf.filter_pension_incremental, january, company_index)
+    # 다른 계열의 상태는 파일명 순서가 앞서도 쓰지 않습니다.
+    assert sum(matched_row_counts) == 5
+    assert cf.incremental_series_name(january) == "pension"
+    assert cf.incremental_series_name("202401.csv") == cf.INCREMENTAL_DEFAULT_SERIES
+
+
+def test_state_is_discarded_when_company_keys_change(data_dirs, company_index, matched_row_counts):
+    january = _write_pension(data_dirs, "pension_202401.csv", _january())
+    february = _write_pension(data_dirs, "pension_202402.csv", _february())
+    quietly(cf.filter_pension_incremental, january, company_index)
+
+    changed_index = _write_company(data_dirs, ["가나", "마바"], ["123-45-67890", "345-67-89012"],
+                                   ["서울 중구", "경기 수원시"], file_name="changed.xlsx")
+    del matched_row_counts[:]
+    actual = quietly(cf.filter_pension_incremental, february, changed_index)
+    assert sum(matched_row_counts) == 6
+    expected = _expected(changed_index, february, dedupe=False)
+    assert actual.astype(object).equals(expected.astype(object))
@@ -0,0 +1,72 @@
+"""
+실행 계측 도구의 카운터가 여러 스레드에서 값을 잃지 않고, 최대 RSS 초기화가 Linux에서만 동작하는지 확인합니다.
+"""
+import sys
+import threading
+
+import pytest
+
+import instrumentation
+
+
+@pytest.fixture
+def report():
+    report = instrumentation.start_report("test")
+    yield report
+    instrumentation.finish_report()
+
+
+def test_concurrent_counts_are_exact(report):
+    # 스레드 전환을 잦게 만들어 잠금이 없으면 갱신을 잃기 쉽게 합니다.
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        def work():
+            for _ in range(20000):
+                instrumentation.count("rows")
+                instrumentation.count("score_calls", 2)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert report.counters == {"rows": 8 * 20000, "score_calls": 8 * 20000 * 2}
+
+
+def test_stages_from_threads_are_all_recorded(report):
+    def work(i):
+        for _ in range(200):
+            with instrumentation.stage(f"stage_{i}", rows=1):
+                pass
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    totals = report.stage_totals()
+    assert {name: total["calls"] for name, total in totals.items()} == {f"stage_{i}": 200 for i in range(4)}
+    assert {record["depth"] for record in report.stages} == {0}
+
+
+@pytest.mark.parametrize("platform", ["darwin", "win32"])
+def test_reset_peak_rss_skips_proc_outside_linux(monkeypatch, platform):
+    opened = []
+    monkeypatch.setattr(instrumentation.sys, "platform", platform)
+    monkeypatch.setattr(instrumentation, "open", lambda *args, **kwargs: opened.append(args), raising=False)
+    instrumentation.reset_peak_rss()
+    assert opened == []
+
+
+def test_reset_peak_rss_ignores_missing_proc(monkeypatch):
+    def missing(*args, **kwargs):
+        raise FileNotFoundError(args[0])
+
+    monkeypatch.setattr(instrumentation.sys, "platform", "linux")
+    monkeypatch.setattr(instrumentation, "open", missing, raising=False)
+    instrumentation.reset_peak_rss()
@@ -0,0 +1,33 @@
+"""
+normalize_company_name_fast가 기준 구현(normalize_company_name)과 같은 결과를 내는지 회귀 말뭉치로 확인합니다.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+import company_filter as cf
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "data", "company_name_corpus.txt")
+
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if not line.startswith("#")]
+
+
+def test_corpus_has_no_mismatches():
+    names = load_corpus()
+    assert len(names) > 50
+    assert cf.find_normalizer_mismatches(names) == []
+
+
+def test_non_string_values_have_no_mismatches():
+    assert cf.find_normalizer_mismatches([None, np.nan, "", 123, 0.5]) == []
+
+
+def test_batch_api_matches_scalar_reference():
+    names = load_corpus()
+    series = pd.Series(names + [None, np.nan], dtype=object)
+    expected = [cf.normalize_company_name(name) for name in series]
+    assert cf.normalize_company_names(series).tolist() == expected
@@ -0,0 +1,57 @@
+"""
+병렬 일괄 처리(batch-filter)의 파일별 결과가 파일마다 기준 구현을 차례로 실행한 결과와 같은지 확인합니다.
+"""
+import os
+import random
+
+import pandas as pd
+import pytest
+
+import company_filter as cf
+from conftest import PENSION_COLUMNS, pension_row, quietly
+
+
+@pytest.fixture
+def batch_files(data_dirs):
+    rng = random.Random(5)
+    companies = [(f"회사{i}", f"{200 + i}-45-{rng.randint(10000, 99999)}") for i in range(10)]
+    pd.DataFrame({"사업자명": [name for name, _ in companies], "사업자등록번호": [bizno for _, bizno in companies],
+                  "소재지": ["서울특별시 중구 세종대로 1"] * len(companies)}).to_excel(
+        os.path.join(data_dirs["company_data"], "companies.xlsx"), index=False)
+
+    file_names = []
+    for month in ("202402", "202401", "202403"):
+        rows = []
+        for _ in range(30):
+            name, bizno = rng.choice(companies)
+            if rng.random() < 0.3:
+                name = "다른" + name
+            rows.append(pension_row(rng.choice(["", "(주)"]) + name, bizno.replace("-", "")[:6],
+                                    detail=f"{month} 업종"))
+        file_name = f"pension_{month}.csv"
+        pd.DataFrame(rows, columns=PENSION_COLUMNS).to_csv(
+            os.path.join(data_dirs["pension_data"], file_name), index=False, encoding="CP949")
+        file_names.append(file_name)
+    return quietly(cf.load_company_index, "companies.xlsx"), file_names
+
+
+def _read_output(path):
+    return pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_parallel_outputs_match_serial_reference(batch_files, data_dirs, max_workers):
+    company_index, file_names = batch_files
+    results = quietly(cf.run_parallel_batch, company_index["data"], file_names + ["pension_missing.csv"],
+                      max_workers, company_index=company_index, output_extension=".csv")
+
+    assert [result["file"] for result in results] == file_names + ["pension_missing.csv"]
+    assert results[-1]["error"] and results[-1]["output"] is None
+    for file_name, result in zip(file_names, results):
+        expected = quietly(cf.extract_excellent_companies, company_index["data"].copy(),
+                           cf.load_pension_data(file_name))
+        expected_path = str(data_dirs["output"] / f"expected_{file_name}")
+        cf.save_result(expected, expected_path)
+        assert result["error"] is None
+        assert result["rows"] == len(expected) > 0
+        assert _read_output(data_dirs["output"] / result["output"]).equals(_read_output(expected_path))
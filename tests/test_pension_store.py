@@ -0,0 +1,90 @@
+"""
+SQLite 조회 저장소(store-ingest/store-lookup, update-location --use-store)가 CSV로 처리한 결과와 같은지 확인합니다.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import company_filter as cf
+from conftest import PENSION_COLUMNS, pension_row, quietly
+
+
+@pytest.fixture
+def store_files(data_dirs):
+    company_path = data_dirs["company_data"] / "companies.xlsx"
+    pd.DataFrame({"사업자명": ["(주)가나", "다라", "마바", "사아"],
+                  "사업자등록번호": ["123456", "234-56-78901", "345678", "456789"],
+                  "소재지": ["서울 중구 세종대로 1", "부산 해운대구", "경기도 수원시", "대구 중구"]}).to_excel(
+        company_path, index=False)
+    pension_path = data_dirs["pension_data"] / "pension_202401.csv"
+    pd.DataFrame([
+        pension_row("가나", "123456", zip_code="04524", detail="제조업"),
+        pension_row("가나(주)", "123456", zip_code="", detail="도매업"),  # 마지막 행이 남고, 빈 우편번호는 덮어쓰지 않음
+        pension_row("다라", "234567", detail="서비스업"),
+        pension_row("마바", "345678", detail=np.nan),
+        pension_row("마바", "345-678", detail="건설업"),
+        pension_row("다른회사", "999999"),
+    ], columns=PENSION_COLUMNS).to_csv(pension_path, index=False, encoding="CP949")
+    return str(company_path), str(pension_path)
+
+
+def _csv_location(store_files):
+    df_excellent = quietly(cf.load_company_index, store_files[0])["data"]
+    return quietly(cf.update_company_location_fast, df_excellent.copy(), cf.load_pension_data(store_files[1]))
+
+
+def test_store_location_matches_csv_path(store_files):
+    store_path = quietly(cf.ingest_pension_store, store_files[1])
+    assert cf.find_pension_store(store_files[1]) == store_path
+
+    df_excellent = quietly(cf.load_company_index, store_files[0])["data"]
+    actual = quietly(cf.update_company_location_from_store, df_excellent.copy(), store_path)
+    expected = _csv_location(store_files)
+    assert actual.astype(object).equals(expected.astype(object))
+    assert expected["사업장업종상세정보"].tolist()[:2] == ["도매업", "서비스업"]
+
+
+def test_lookup_matches_csv_rows(store_files):
+    store_path = quietly(cf.ingest_pension_store, store_files[1])
+    df_pension = cf.load_pension_data(store_files[1])
+    bizno = df_pension["사업자등록번호"].str.replace("-", "", regex=False)
+    name_keys = cf.normalize_company_names(df_pension["사업장명"])
+
+    keys = [("123-45-67890", "(주)가나"), ("345678", None), (None, "다라"), ("999999", "없는회사")]
+    results = cf.lookup_pension_store(store_path, keys)
+    for (key_bizno, key_name), result in zip(keys, results):
+        expected = pd.Series(True, index=df_pension.index)
+        if key_bizno is not None:
+            expected &= bizno.str[:6] == key_bizno.replace("-", "")[:6]
+        if key_name is not None:
+            expected &= name_keys == cf.normalize_company_name_fast(key_name)
+        rows = df_pension[expected]
+        assert [match["row_id"] for match in result["matches"]] == rows.index.tolist()
+        assert [match["biz_detail"] for match in result["matches"]] == \
+            [None if pd.isna(value) else value for value in rows["사업장업종상세정보"]]
+
+
+def test_cli_use_store_matches_csv_path(store_files, data_dirs):
+    outputs = {}
+    for use_store in (False, True):
+        output_path = str(data_dirs["output"] / f"updated_{use_store}.csv")
+        argv = ["update-location", "--company", store_files[0], "--pension", store_files[1], "--output", output_path,
+                "--quiet"] + (["--use-store"] if use_store else [])
+        assert quietly(cf.run_cli, argv) == 0
+        outputs[use_store] = pd.read_csv(output_path, dtype=str, encoding="utf-8-sig")
+    assert outputs[True].equals(outputs[False])
+    # 명령줄 실행의 저장소는 국민연금 입력 옆의 캐시 폴더에 만듭니다.
+    store_dir = data_dirs["pension_data"] / cf.CLI_CACHE_DIR_NAME / "pension_store"
+    assert os.listdir(store_dir) == ["pension_202401.sqlite"]
+    assert os.listdir(data_dirs["pension_store"]) == []
+
+
+def test_store_path_with_uri_characters(store_files, tmp_path, monkeypatch):
+    store_dir = tmp_path / "store?mode=rw#100%"
+    monkeypatch.setattr(cf, "PENSION_STORE_DIR", str(store_dir))
+    store_path = quietly(cf.ingest_pension_store, store_files[1])
+    assert os.path.dirname(store_path) == str(store_dir)
+    assert cf.find_pension_store(store_files[1]) == store_path
+    assert len(cf.lookup_pension_store(store_path, [("123456", None)])[0]["matches"]) == 2
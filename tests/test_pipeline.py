@@ -0,0 +1,101 @@
+"""
+파이프라인 일괄 처리(batch-filter --pipeline)가 단계에서 오류가 나도 멈추지 않고 끝나며, 쓰다 만 결과를 남기지 않는지 확인합니다.
+"""
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+import company_filter as cf
+from conftest import PENSION_COLUMNS, pension_row, quietly
+
+
+@pytest.fixture
+def pipeline_files(data_dirs):
+    company = pd.DataFrame({"사업자명": ["가나", "다라"], "사업자등록번호": ["123-45-67890", "234-56-78901"],
+                            "소재지": ["서울 중구", "부산 중구"]})
+    company.to_excel(os.path.join(data_dirs["company_data"], "companies.xlsx"), index=False)
+    file_names = []
+    for month in ("202401", "202402", "202403"):
+        rows = [pension_row("가나", "123456"), pension_row("다른회사", "999999"), pension_row("다라", "234567")] * 3
+        file_name = f"pension_{month}.csv"
+        pd.DataFrame(rows, columns=PENSION_COLUMNS).to_csv(
+            os.path.join(data_dirs["pension_data"], file_name), index=False, encoding="CP949")
+        file_names.append(file_name)
+    return quietly(cf.load_company_index, "companies.xlsx"), file_names
+
+
+def _run_with_timeout(func, *args, timeout=30, **kwargs):
+    # 파이프라인이 멈추면 테스트도 멈추지 않도록 별도 스레드에서 실행합니다.
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = quietly(func, *args, **kwargs)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "파이프라인이 끝나지 않았습니다."
+    assert not [t for t in threading.enumerate() if t.name.startswith("pipeline-")]
+    return outcome
+
+
+def _output_names(data_dirs):
+    return sorted(os.listdir(data_dirs["output"]))
+
+
+def test_reader_failure_ends_only_that_file(pipeline_files, data_dirs, monkeypatch):
+    company_index, file_names = pipeline_files
+    iter_pension_chunks = cf.iter_pension_chunks
+
+    def failing_chunks(file_name, *args, **kwargs):
+        for i, chunk in enumerate(iter_pension_chunks(file_name, *args, **kwargs)):
+            if file_name == "pension_202402.csv" and i == 1:
+                raise UnicodeDecodeError("cp949", b"\xff", 0, 1, "읽기 실패")
+            yield chunk
+
+    monkeypatch.setattr(cf, "iter_pension_chunks", failing_chunks)
+    outcome = _run_with_timeout(cf.run_pipelined_batch, company_index, file_names, ".csv", chunksize=2,
+                                queue_size=1)
+
+    results = outcome["result"]
+    assert [result["file"] for result in results] == file_names
+    assert [bool(result["error"]) for result in results] == [False, True, False]
+    # 실패한 파일은 앞 청크를 이미 썼더라도 결과 파일(임시 파일 포함)을 남기지 않습니다.
+    assert _output_names(data_dirs) == ["filtered_pension_202401.csv", "filtered_pension_202403.csv"]
+    written = pd.read_csv(data_dirs["output"] / "filtered_pension_202403.csv", dtype=str, encoding="utf-8-sig")
+    assert written["사업장명"].tolist() == ["가나", "다라"] * 3
+
+
+def test_match_failure_is_reported_per_file(pipeline_files, data_dirs, monkeypatch):
+    company_index, file_names = pipeline_files
+    match_pension_keys = cf.match_pension_keys
+    calls = []
+
+    def failing_match(excellent_keys, chunk, *args, **kwargs):
+        calls.append(len(chunk))
+        if len(calls) == 2:
+            raise ValueError("매칭 실패")
+        return match_pension_keys(excellent_keys, chunk, *args, **kwargs)
+
+    monkeypatch.setattr(cf, "match_pension_keys", failing_match)
+    results = _run_with_timeout(cf.run_pipelined_batch, company_index, file_names, ".csv", chunksize=5)["result"]
+    assert [result["error"] for result in results] == ["매칭 실패", None, None]
+    assert _output_names(data_dirs) == ["filtered_pension_202402.csv", "filtered_pension_202403.csv"]
+
+
+def test_interrupt_stops_all_stages(pipeline_files, data_dirs, monkeypatch):
+    company_index, file_names = pipeline_files
+
+    def interrupted_match(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(cf, "match_pension_keys", interrupted_match)
+    outcome = _run_with_timeout(cf.run_pipelined_batch, company_index, file_names, ".csv", chunksize=1,
+                                queue_size=1)
+    assert isinstance(outcome["error"], KeyboardInterrupt)
+    assert _output_names(data_dirs) == []
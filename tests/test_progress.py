@@ -0,0 +1,59 @@
+"""
+진행 표시(ProgressReporter)가 update() 호출 횟수와 관계없이 PROGRESS_INTERVAL 간격으로만 다시 그리는지 확인합니다.
+"""
+import types
+
+import pytest
+
+import company_filter as cf
+
+REDRAW = "\r\033[K"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # 진행 표시가 보는 시계만 바꿔, 실제로 기다리지 않고 시간이 흐르게 합니다.
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(cf, "time", types.SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def test_rapid_updates_render_once_per_interval(clock, capsys):
+    with cf.ProgressReporter("처리 중", total=100000, interval=0.1, enabled=True) as progress:
+        for i in range(1, 100001):
+            progress.update(i)
+            clock.now += 0.00001  # 업데이트 10만 번이 모두 1초 안에 일어납니다.
+    output = capsys.readouterr().out
+    # 1초 동안 0.1초 간격으로 10번, 끝날 때 1번 그립니다.
+    assert 10 <= output.count(REDRAW) <= 12
+    last_line = output.split(REDRAW)[-1]
+    assert "100000/100000 (100.0%)" in last_line and last_line.endswith("\n")
+
+
+def test_no_output_while_clock_stands_still(clock, capsys):
+    progress = cf.ProgressReporter("처리 중", interval=0.1, enabled=True)
+    for _ in range(1000):
+        progress.advance()
+    assert capsys.readouterr().out.count(REDRAW) == 1
+    clock.now += 0.1
+    progress.advance()
+    assert capsys.readouterr().out.count(REDRAW) == 1
+    progress.close()
+    assert "1001개" in capsys.readouterr().out
+
+
+def test_log_redraws_progress_line(clock, capsys):
+    with cf.ProgressReporter("일괄 처리 중", total=2, unit="파일", enabled=True) as progress:
+        progress.update(1)
+        progress.log("✅ 저장 완료")
+    lines = capsys.readouterr().out.split(REDRAW)
+    assert "✅ 저장 완료\n" in lines
+    assert lines[-1].startswith("일괄 처리 중: ") and lines[-1].endswith("\n")
+
+
+def test_disabled_when_stdout_is_not_a_terminal(monkeypatch, capsys):
+    monkeypatch.setattr(cf, "PROGRESS_ENABLED", None)
+    with cf.ProgressReporter("처리 중", total=10) as progress:
+        for i in range(1, 11):
+            progress.update(i)
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,84 @@
+"""
+ResultWriter가 청크마다 dtype이 달라도 같은 파일에 이어 쓸 수 있는지, 실패하면 이전 결과 파일을 그대로 두는지 확인합니다.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import company_filter as cf
+from conftest import quietly
+
+
+def _object_frame(values):
+    return pd.DataFrame({"사업장명": values, "사업자등록번호": ["123456"] * len(values)}, dtype=object)
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".csv", ".xlsx"])
+def test_empty_and_all_missing_first_chunk(tmp_path, extension):
+    if extension == ".parquet" and not cf.PYARROW_AVAILABLE:
+        pytest.skip("pyarrow가 필요합니다.")
+    output_path = str(tmp_path / ("result" + extension))
+    chunks = [_object_frame([]), _object_frame([np.nan, np.nan]), _object_frame(["가나", np.nan])]
+
+    with cf.ResultWriter(output_path) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    assert writer.rows_written == 4
+
+    if extension == ".parquet":
+        written = pd.read_parquet(output_path)
+    elif extension == ".csv":
+        written = pd.read_csv(output_path, dtype=str, encoding="utf-8-sig")
+    else:
+        written = pd.read_excel(output_path, dtype=str)
+    assert list(written.columns) == ["사업장명", "사업자등록번호"]
+    assert written["사업장명"].tolist()[2] == "가나"
+    assert written["사업장명"].isna().sum() == 3
+
+
+def test_parquet_keeps_numeric_columns(tmp_path):
+    if not cf.PYARROW_AVAILABLE:
+        pytest.skip("pyarrow가 필요합니다.")
+    output_path = str(tmp_path / "result.parquet")
+    chunk = _object_frame(["가나"]).assign(**{cf.MATCH_CONFIDENCE_COL: [0.95]})
+
+    cf.save_result(chunk, output_path)
+    written = pd.read_parquet(output_path)
+    assert written[cf.MATCH_CONFIDENCE_COL].tolist() == [0.95]
+    assert written["사업장명"].tolist() == ["가나"]
+
+
+@pytest.mark.parametrize("extension", [".csv", ".xlsx"])
+def test_failed_write_keeps_previous_output(tmp_path, extension):
+    output_path = str(tmp_path / ("result" + extension))
+    cf.save_result(_object_frame(["이전 결과"]), output_path)
+    with open(output_path, "rb") as f:
+        previous = f.read()
+
+    for chunks in ([], [_object_frame(["가나"])]):
+        with pytest.raises(RuntimeError):
+            with cf.ResultWriter(output_path) as writer:
+                for chunk in chunks:
+                    writer.write(chunk)
+                raise RuntimeError("읽기 실패")
+        with open(output_path, "rb") as f:
+            assert f.read() == previous
+    assert os.listdir(tmp_path) == [os.path.basename(output_path)]
+
+
+def test_batch_read_failure_keeps_previous_output(data_dirs):
+    company = pd.DataFrame({"사업자명": ["가나"], "사업자등록번호": ["123-45-67890"], "소재지": ["서울 중구"]})
+    excellent_keys = cf.build_excellent_key_table(company, with_address=True)
+    output_path = data_dirs["output"] / "filtered_pension_202401.csv"
+    output_path.write_bytes(b"previous")
+    # CP949로 읽을 수 없는 바이트가 들어 있는 입력
+    (data_dirs["pension_data"] / "pension_202401.csv").write_bytes(b"a,b,c\n\xff\xff,1,2\n")
+
+    cf._init_batch_worker(excellent_keys, cf.PENSION_DATA_DIR, cf.PENSION_CACHE_DIR, cf.OUTPUT_DIR, ".csv",
+                          csv_reader=cf.PENSION_CSV_READER)
+    with pytest.raises(UnicodeDecodeError):
+        quietly(cf._filter_pension_file, "pension_202401.csv")
+    assert output_path.read_bytes() == b"previous"
+    assert os.listdir(data_dirs["output"]) == ["filtered_pension_202401.csv"]
@@ -0,0 +1,109 @@
+"""
+샤드로 나누어 처리한 결과가 한 번에 처리한 결과와 같은지, 다시 분할할 때 다른 파일을 지우지 않는지 확인합니다.
+"""
+import os
+import random
+
+import pandas as pd
+import pytest
+
+import company_filter as cf
+from conftest import PENSION_COLUMNS, pension_row, quietly
+
+
+@pytest.fixture
+def shard_files(data_dirs):
+    rng = random.Random(7)
+    sidos = ["경기도", "경기", "서울특별시", "서울", "부산광역시", "충남"]
+
+    def address():
+        return f"{rng.choice(sidos)} {rng.choice(['수원시', '중구'])} {rng.choice(['왕림로', '중앙로'])} {rng.randint(1, 3)}"
+
+    companies = [(f"회사{rng.randint(1, 30)}", f"{rng.randint(100, 140)}-{rng.randint(10, 12)}-{rng.randint(10000, 99999)}")
+                 for _ in range(40)]
+    pd.DataFrame({"사업자명": [rng.choice(["(주)", "", "주식회사 "]) + name for name, _ in companies],
+                  "사업자등록번호": [bizno for _, bizno in companies],
+                  "소재지": [address() for _ in companies]}).to_excel(
+        os.path.join(data_dirs["company_data"], "companies.xlsx"), index=False)
+
+    rows = []
+    for _ in range(300):
+        if rng.random() < 0.6:
+            name, bizno = rng.choice(companies)
+            bizno = bizno.replace("-", "")[:6] if rng.random() < 0.7 else bizno.replace("-", "")
+        else:
+            name, bizno = f"회사{rng.randint(1, 300)}", str(rng.randint(100000, 140999))
+        rows.append(pension_row(rng.choice(["", "(주)"]) + name, bizno, address(), detail=rng.choice(["제조업", "도매"])))
+    pd.DataFrame(rows, columns=PENSION_COLUMNS).to_csv(
+        os.path.join(data_dirs["pension_data"], "pension_202401.csv"), index=False, encoding="CP949")
+    return "companies.xlsx", "pension_202401.csv"
+
+
+def _read_csv(path):
+    return pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+
+
+def _expected(data_dirs, shard_files, mode):
+    company_index = quietly(cf.load_company_index, shard_files[0])
+    df_pension = cf.load_pension_data(shard_files[1])
+    if mode == "filter":
+        result = cf.extract_excellent_companies_updated_fast(company_index["data"], df_pension,
+                                                             excellent_keys=company_index["excellent_keys"])
+    else:
+        result = cf.update_company_location_fast(company_index["data"].copy(), df_pension)
+    output_path = str(data_dirs["output"] / f"expected_{mode}.csv")
+    cf.save_result(result, output_path)
+    return _read_csv(output_path)
+
+
+@pytest.mark.parametrize("mode", cf.SHARD_MODES)
+def test_sharded_matches_single_run(data_dirs, shard_files, tmp_path, mode):
+    expected = _expected(data_dirs, shard_files, mode)
+    assert len(expected) > 5
+    shard_dir = str(tmp_path / "shards")
+    for shard_count in (1, 2, 5):
+        output_path = str(data_dirs["output"] / f"sharded_{mode}_{shard_count}.csv")
+        quietly(cf.run_sharded, shard_files[0], shard_files[1], output_path, mode, shard_count, shard_dir,
+                max_workers=1, chunksize=70)
+        assert _read_csv(output_path).equals(expected)
+
+
+def test_resplit_only_removes_files_from_the_previous_manifest(shard_files, tmp_path):
+    shard_dir = tmp_path / "shards"
+    quietly(cf.split_into_shards, shard_files[0], shard_files[1], 5, str(shard_dir))
+    (shard_dir / "result_notes.pkl").write_bytes(b"keep")
+    (shard_dir / "company_list.pkl").write_bytes(b"keep")
+
+    manifest = quietly(cf.split_into_shards, shard_files[0], shard_files[1], 2, str(shard_dir))
+    assert manifest["complete"] and manifest["files"] == cf.shard_file_names(2)
+    assert (shard_dir / "result_notes.pkl").read_bytes() == b"keep"
+    assert (shard_dir / "company_list.pkl").read_bytes() == b"keep"
+    assert not (shard_dir / "pension_004.pkl").exists()
+
+
+def test_split_refuses_non_empty_dir_without_manifest(shard_files, tmp_path):
+    shard_dir = tmp_path / "other"
+    shard_dir.mkdir()
+    (shard_dir / "pension_000.pkl").write_bytes(b"keep")
+    with pytest.raises(ValueError):
+        quietly(cf.split_into_shards, shard_files[0], shard_files[1], 2, str(shard_dir))
+    assert (shard_dir / "pension_000.pkl").read_bytes() == b"keep"
+
+
+def test_unfinished_split_is_not_processed(shard_files, tmp_path, monkeypatch):
+    shard_dir = tmp_path / "shards"
+    iter_pension_chunks = cf.iter_pension_chunks
+
+    def broken_chunks(*args, **kwargs):
+        raise OSError("읽기 실패")
+        yield
+
+    monkeypatch.setattr(cf, "iter_pension_chunks", broken_chunks)
+    with pytest.raises(OSError):
+        quietly(cf.split_into_shards, shard_files[0], shard_files[1], 2, str(shard_dir))
+    with pytest.raises(ValueError):
+        cf.read_shard_manifest(str(shard_dir))
+
+    # 끝나지 않은 분할의 파일도 정보 파일에 적혀 있으므로 다시 분할할 수 있습니다.
+    monkeypatch.setattr(cf, "iter_pension_chunks", iter_pension_chunks)
+    assert quietly(cf.split_into_shards, shard_files[0], shard_files[1], 2, str(shard_dir))["complete"]
@@ -0,0 +1,162 @@
+"""
+벡터화 매칭 엔진(*_fast)이 iterrows 기준 구현과 같은 결과를 내는지 확인합니다.
+"""
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import company_filter as cf
+from conftest import PENSION_COLUMNS, pension_row, quietly
+
+
+def _same_frame(expected, actual):
+    # 기준 구현은 행을 모아 새 데이터프레임을 만들므로 dtype은 비교하지 않고 값/인덱스/컬럼만 비교합니다.
+    assert list(actual.index) == list(expected.index)
+    assert list(actual.columns) == list(expected.columns)
+    assert actual.astype(object).equals(expected.astype(object))
+
+
+def _compare_filters(df_excellent, df_pension):
+    for reference, fast in [(cf.extract_excellent_companies, cf.extract_excellent_companies_fast),
+                            (cf.extract_excellent_companies_updated, cf.extract_excellent_companies_updated_fast)]:
+        expected = quietly(reference, df_excellent.copy(), df_pension.copy())
+        actual = quietly(fast, df_excellent.copy(), df_pension.copy())
+        _same_frame(expected, actual)
+
+
+def _compare_location(df_excellent, df_pension):
+    expected = quietly(cf.update_company_location, df_excellent.copy(), df_pension.copy())
+    actual = quietly(cf.update_company_location_fast, df_excellent.copy(), df_pension.copy())
+    assert actual.astype(object).equals(expected.astype(object))
+    return actual
+
+
+@pytest.fixture
+def edge_case_data():
+    df_excellent = pd.DataFrame({
+        "사업자명": ["가나", np.nan, "다라", "마바", "사", np.nan, "(주)아자", "아자"],
+        "사업자등록번호": ["123-45-67890", "123456", np.nan, "12345", "123", np.nan, "777-88-99999", "777889"],
+        "소재지": ["서울 강남구", "경기", np.nan, "부산", "대구", "x", "경기 수원시 왕림로", "경기도 수원시 중앙로"],
+    }, dtype=object)
+    df_pension = pd.DataFrame([
+        pension_row("(주)가나", "123456"),
+        pension_row(np.nan, "123456"),
+        pension_row("", "123456"),
+        pension_row("가나", "nan"),
+        pension_row(np.nan, np.nan),
+        pension_row("다라", "654321", zip_code=""),
+        pension_row("다라", "654321", detail=""),
+        pension_row("(주)가나", "123-456", address="경기 수원"),
+        pension_row("마바", "12-345"),
+        pension_row("마바", "12345"),
+        pension_row("사", "000123"),
+        # 같은 키가 여러 번 나오고 주소 유사도가 같은 경우 (동점이면 먼저 나온 행)
+        pension_row("아자", "777889", address="경기도 수원시 중앙로"),
+        pension_row("주식회사 아자", "777889", address="경기 수원시 중앙로"),
+        pension_row("아자(주)", "777889", address="경기도 수원시 왕림로"),
+    ], columns=PENSION_COLUMNS, dtype=object)
+    return df_excellent, df_pension
+
+
+def test_filters_match_reference_on_edge_cases(edge_case_data):
+    _compare_filters(*edge_case_data)
+
+
+def test_location_matches_reference_on_edge_cases(edge_case_data):
+    updated = _compare_location(*edge_case_data)
+    assert updated["사업장업종상세정보"].ne("").any()
+
+
+def test_dedupe_keeps_first_row_on_tied_scores():
+    df_excellent = pd.DataFrame({"사업자명": ["가나"], "사업자등록번호": ["123-45-67890"],
+                                 "소재지": ["서울특별시 중구 세종대로 1"]}, dtype=object)
+    df_pension = pd.DataFrame([
+        pension_row("가나", "123456", address="부산 해운대구"),
+        pension_row("(주)가나", "123456", address="서울 중구 세종대로 9"),
+        pension_row("가나(주)", "123456", address="서울특별시 중구 세종대로 7"),
+    ], columns=PENSION_COLUMNS, dtype=object)
+
+    expected = quietly(cf.extract_excellent_companies_updated, df_excellent.copy(), df_pension.copy())
+    actual = quietly(cf.extract_excellent_companies_updated_fast, df_excellent.copy(), df_pension.copy())
+    _same_frame(expected, actual)
+    assert list(actual.index) == [1]
+
+
+def test_result_follows_first_appearance_of_each_key():
+    df_excellent = pd.DataFrame({"사업자명": ["가", "나", "다"],
+                                 "사업자등록번호": ["111111-0000", "222222-0000", "333333-0000"],
+                                 "소재지": ["서울 중구", "부산 중구", "대구 중구"]}, dtype=object)
+    df_pension = pd.DataFrame([
+        pension_row("다", "333333", address="대구 중구"),
+        pension_row("가", "111111", address="강원"),
+        pension_row("나", "222222", address="부산 중구"),
+        pension_row("가", "111111", address="서울 중구"),
+    ], columns=PENSION_COLUMNS, dtype=object)
+
+    actual = quietly(cf.extract_excellent_companies_updated_fast, df_excellent.copy(), df_pension.copy())
+    _same_frame(quietly(cf.extract_excellent_companies_updated, df_excellent.copy(), df_pension.copy()), actual)
+    assert list(actual.index) == [0, 3, 2]
+
+
+def test_duplicate_company_keys_keep_last_row():
+    # 강소기업 키가 겹치면 기준 구현의 딕셔너리와 같이 마지막 행의 주소로 비교합니다.
+    df_excellent = pd.DataFrame({"사업자명": ["가나", "(주)가나"],
+                                 "사업자등록번호": ["123-45-00001", "12345600002"],
+                                 "소재지": ["부산 해운대구", "서울 중구"]}, dtype=object)
+    df_pension = pd.DataFrame([
+        pension_row("가나", "123456", address="부산 해운대구"),
+        pension_row("가나", "123456", address="서울 중구"),
+    ], columns=PENSION_COLUMNS, dtype=object)
+    _compare_filters(df_excellent, df_pension)
+    _compare_location(df_excellent, df_pension)
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_random_data_matches_reference(seed):
+    rng = random.Random(seed)
+    bases = ["삼성", "대한", "한빛", "우리", "미래", "세진", "태광", "Tech Co"]
+    forms = ["(주)", "주식회사 ", "㈜", "", "(유)", "유한회사 ", " (주)"]
+    sidos = ["경기도", "경기", "서울특별시", "서울", "서울시", "부산광역시", "충남", "제주특별자치도"]
+
+    def address():
+        return f"{rng.choice(sidos)} {rng.choice(['수원시', '광주시', '중구'])} {rng.choice(['왕림로', '중앙로'])} {rng.randint(1, 5)}"
+
+    companies = [(rng.choice(bases) + str(rng.randint(1, 40)),
+                  f"{rng.randint(100, 130)}-{rng.randint(10, 12)}-{rng.randint(10000, 99999)}") for _ in range(80)]
+    df_excellent = pd.DataFrame({
+        "사업자명": [rng.choice(forms) + name for name, _ in companies],
+        "사업자등록번호": [bizno for _, bizno in companies],
+        "소재지": [address() for _ in companies],
+    }, dtype=object)
+    rows = []
+    for _ in range(600):
+        if rng.random() < 0.5:
+            name, bizno = rng.choice(companies)
+            bizno = bizno.replace("-", "")[:6] if rng.random() < 0.8 else bizno[:7]
+        else:
+            name, bizno = rng.choice(bases) + str(rng.randint(1, 400)), str(rng.randint(100000, 130999))
+        rows.append(pension_row(rng.choice(forms) + name, bizno, address(), str(rng.randint(10000, 99999)),
+                                rng.choice(["제조업", "도매", ""])))
+    df_pension = pd.DataFrame(rows, columns=PENSION_COLUMNS, dtype=object)
+
+    _compare_filters(df_excellent, df_pension)
+    _compare_location(df_excellent, df_pension)
+
+
+def test_prebuilt_key_store_is_reused(edge_case_data, monkeypatch):
+    df_excellent, df_pension = edge_case_data
+    excellent_keys = cf.build_excellent_key_table(df_excellent, with_address=True)
+    key_store = cf.CompanyKeyStore.from_key_table(excellent_keys)
+    expected = cf.match_pension_keys(excellent_keys, df_pension)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("코드표를 다시 만들면 안 됩니다.")
+
+    monkeypatch.setattr(cf.CompanyKeyStore, "from_key_table", fail)
+    monkeypatch.setattr(cf.CompanyKeyStore, "encode", fail)
+    for chunk in (df_pension.iloc[:7], df_pension.iloc[7:]):
+        cf.match_pension_keys(excellent_keys, chunk, key_store=key_store)
+    actual = cf.match_pension_keys(excellent_keys, df_pension, key_store=key_store)
+    assert actual.astype(object).equals(expected.astype(object))